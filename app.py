@@ -1,10 +1,19 @@
 import streamlit as st
-import streamlit_lottie as st_lottie
-import requests
-import json
-from streamlit_option_menu import option_menu
-from supabase_connector import SupabaseConnector
-from streamlit_clerk_auth import authenticate
+from streamlit.errors import StreamlitAPIException
+from portal_stats import format_count
+from models import Profile
+from session_cache import drop_session_cache, get_session_cache
+from candidate_index import QuerySyntaxError
+from streamlit_clerk_auth import authenticate, sign_out
+from lottie_cache import LottieCache, SIDEBAR_LOTTIE_URL, HOME_LOTTIE_URL, LANDING_LOTTIE_URL
+from asset_loader import AssetPrefetcher
+from instrumentation import REGISTRY, start_metrics_server, start_trace, timed
+from fragments import CANDIDATE_CARD, EMPLOYER_JOB_CARD, JOB_CARD, STAT_COUNTER, FragmentCache, minify_css, render_logo, render_skill_chips, wrap
+from startup import WarmUp
+from blob_store import DEFAULT_STORAGE_DIR, open_blob_store
+from resume_pipeline import DEFAULT_MAX_BYTES, ResumePipeline
+from logo_pipeline import MAX_LOGO_BYTES, LogoPipeline
+import inspect
 import logging
 
 # Configure logging
@@ -18,7 +27,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Collect the timing breakdown of this run
+rerun_trace = start_trace()
+
+# Read an on/off secret; secrets from the environment arrive as strings, where bool("false") is True
+def secret_flag(name, default=False):
+    return str(st.secrets.get(name, default)).lower() in ("1", "true", "yes")
+
 # Custom CSS for styling
+@timed("app.load_css")
 def load_css():
     css = """
     <style>
@@ -97,6 +114,19 @@ def load_css():
         margin-bottom: 0.5rem;
     }
     
+    .card-logo {
+        float: right;
+        margin-left: 1rem;
+        border-radius: 8px;
+        object-fit: contain;
+    }
+    
+    .header-logo {
+        border-radius: 16px;
+        object-fit: contain;
+        margin-bottom: 1rem;
+    }
+    
     .job-details {
         display: flex;
         gap: 1rem;
@@ -178,6 +208,34 @@ def load_css():
         color: white;
     }
     
+    .stat-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    
+    /* Skill chips */
+    .skill-chips {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 10px;
+        margin: 0.5rem 0;
+    }
+    
+    .skill-chip {
+        background-color: rgba(0, 168, 232, 0.2);
+        padding: 5px 15px;
+        border-radius: 20px;
+    }
+    
+    .status-active {
+        color: #00A8E8;
+    }
+    
+    .status-closed {
+        color: #FF6347;
+    }
+    
     /* Animation for cards */
     @keyframes fadeIn {
         from { opacity: 0; transform: translateY(20px); }
@@ -207,74 +265,668 @@ def load_css():
     }
     </style>
     """
-    st.markdown(css, unsafe_allow_html=True)
+    # Streamlit drops elements a rerun doesn't emit again, so the styles
+    # are sent on every run; minifying (once per process) keeps that small
+    st.markdown(minify_css(css), unsafe_allow_html=True)
+
+# Shared Lottie cache, preloaded once per process
+@st.cache_resource
+def init_lottie_cache():
+    cache = LottieCache(offline=secret_flag("LOTTIE_OFFLINE"))
+    cache.preload()
+    return cache
 
 # Load Lottie animation
-def load_lottieurl(url):
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
-        return None
-
-# Connect to database
+@timed("assets.load_lottieurl")
+def load_lottieurl(url, timeout=None):
+    return init_lottie_cache().get(url, timeout=timeout)
+
+# Shared pool that fetches all assets of a page concurrently
+@st.cache_resource
+def init_asset_prefetcher():
+    return AssetPrefetcher(init_lottie_cache().get)
+
+# Render a prefetched animation, or a same-size placeholder if it missed the deadline
+@timed("assets.render_lottie")
+def render_lottie(assets, url, height):
+    lottie_json = assets.get(url)
+    if lottie_json:
+        # Imported on first use; the component is only needed once an animation arrived
+        from streamlit_lottie import st_lottie
+        st_lottie(lottie_json, height=height)
+    else:
+        st.markdown(f"<div style='height: {height}px;'></div>", unsafe_allow_html=True)
+
+# Rendered cards and counters, shared by every session
+@st.cache_resource
+def init_fragment_cache():
+    return FragmentCache(max_entries=int(st.secrets.get("FRAGMENT_CACHE_MAX_ENTRIES", 5000)))
+
+fragment_cache = init_fragment_cache()
+
+# Metrics endpoint and sampling, configured once per process
+@st.cache_resource
+def init_metrics():
+    REGISTRY.configure(float(st.secrets.get("METRICS_SAMPLE_RATE", 1.0)))
+    port = st.secrets.get("METRICS_PORT")
+    return start_metrics_server(int(port), st.secrets.get("METRICS_HOST", "127.0.0.1")) if port else None
+
+init_metrics()
+
+# Connect to database; the connector pulls in supabase, numpy and scipy, so it is
+# imported and created on the first authenticated run or by the warm-up below
 @st.cache_resource
 def init_database():
-    return SupabaseConnector()
+    from supabase_connector import SupabaseConnector
+    db = SupabaseConnector()
+    if not db.is_connected() or not secret_flag("SUPABASE_ASYNC", True):
+        return db
+    # Reads run on one shared event loop over a pooled connection; writes stay on the sync connector
+    from async_supabase_connector import AsyncConnectorFacade
+    return AsyncConnectorFacade(db, timeout=float(st.secrets.get("SUPABASE_ASYNC_TIMEOUT", 30)))
+
+# Background creation of the connector, started once the landing page is out
+@st.cache_resource
+def init_database_warm_up():
+    return WarmUp("database", init_database)
+
+# Sidebar panel with this run's timing breakdown and process-wide latencies
+def render_debug_panel(trace, user_cache):
+    with st.sidebar.expander("Performance"):
+        st.markdown(f"**This run:** {trace.elapsed_ms:.1f} ms")
+        st.table([
+            {"step": "· " * depth + name, "ms": round(ms, 1)}
+            for name, depth, ms in trace.spans
+        ])
+        operations = sorted(REGISTRY.histograms().items(), key=lambda item: -item[1].quantile(0.95))
+        st.markdown("**Slowest operations**")
+        st.table([
+            {
+                "operation": name,
+                "calls": int(histogram.count),
+                "p50 ms": round(histogram.quantile(0.5) * 1000, 1),
+                "p95 ms": round(histogram.quantile(0.95) * 1000, 1)
+            }
+            for name, histogram in operations[:15]
+        ])
+        st.markdown(
+            f"**Hit rates:** query cache {db.cache_stats()['hit_rate']:.0%}, "
+            f"session cache {user_cache.stats()['hit_rate']:.0%}, "
+            f"fragment cache {fragment_cache.stats()['hit_rate']:.0%}"
+        )
 
-# Initialize database connector
-db = init_database()
+# Show how a background save started on an earlier run turned out
+def show_save_status(key, label):
+    ticket = st.session_state.get(key)
+    if ticket is None:
+        return
+    demo = "" if db.is_connected() else " (Demo mode)"
+    if not ticket.done():
+        st.info(f"{label} saved. Syncing in the background...")
+        return
+    if ticket.succeeded:
+        st.success(f"{label} saved successfully!{demo}")
+    else:
+        st.error(f"{label} could not be saved: {ticket.error}")
+    del st.session_state[key]
+
+# Independently rerunning sections: a widget inside one reruns just that
+# function (st.fragment, Streamlit 1.37+; st.experimental_fragment before).
+# Without either, sections are plain functions inside the full rerun.
+section = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda function: function)
+# Whether st.rerun can be scoped to the running section
+SECTION_RERUNS = "scope" in inspect.signature(st.rerun).parameters
+# Whether sections can rerun on a timer, to poll background work
+SECTION_POLLING = "run_every" in inspect.signature(section).parameters
+
+def polled_section(interval):
+    """Section that also reruns every interval seconds where supported, else a plain section."""
+    return section(run_every=interval) if SECTION_POLLING else section
+
+def rerun_section():
+    """Rerun only the calling section where supported, else the whole app."""
+    if SECTION_RERUNS:
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # Called while the section ran as part of a full rerun
+            pass
+    st.rerun()
+
+# Stored uploads, shared by every session
+@st.cache_resource
+def init_blob_store():
+    db = init_database()
+    return open_blob_store(
+        st.secrets.get("STORAGE_BUCKET"),
+        db.client if db.is_connected() else None,
+        st.secrets.get("STORAGE_DIR", DEFAULT_STORAGE_DIR)
+    )
+
+# Resume storage and parsing off the rerun thread; parsed skills go to the profile through the write queue
+@st.cache_resource
+def init_resume_pipeline():
+    def save_parsed_resume(user_id, result):
+        changes = {"skills": result["skills"], "resume_key": result["resume_key"]}
+        if result["experience_level"]:
+            changes["experience_level"] = result["experience_level"]
+        return init_database().save_user_profile(user_id, changes)
+    return ResumePipeline(
+        init_blob_store(),
+        save_parsed_resume,
+        max_workers=int(st.secrets.get("RESUME_WORKERS", 2)),
+        max_bytes=int(st.secrets.get("RESUME_MAX_BYTES", DEFAULT_MAX_BYTES))
+    )
+
+# Company logo resizing off the rerun thread, and the card-size variants served to job cards
+@st.cache_resource
+def init_logo_pipeline():
+    return LogoPipeline(
+        init_blob_store(),
+        lambda owner_id, result: init_database().save_company_profile(owner_id, result),
+        max_workers=int(st.secrets.get("LOGO_WORKERS", 2)),
+        max_bytes=int(st.secrets.get("LOGO_MAX_BYTES", MAX_LOGO_BYTES))
+    )
+
+# Sample skills shown until the resume is parsed
+SAMPLE_SKILLS = ["Python", "JavaScript", "React", "Node.js", "SQL", "AWS", "Docker", "Git"]
+
+# Sidebar with the logo, navigation and logout; the selected page goes to st.session_state.page
+@section
+@timed("section.sidebar")
+def render_sidebar(assets):
+    # Logo and app name
+    st.markdown("<h1 style='text-align: center; color: #00A8E8;'>JobWave</h1>", unsafe_allow_html=True)
+    
+    # Load a Lottie animation for the sidebar
+    render_lottie(assets, SIDEBAR_LOTTIE_URL, height=200)
+    
+    # Navigation menu
+    pages = [
+        "Home", 
+        "Jobs", 
+        "Companies", 
+        "Applications" if st.session_state.user_role == "jobseeker" else "Dashboard", 
+        "Profile"
+    ]
+    # ?page=Profile opens a page directly, e.g. from a shared link or the session benchmark
+    requested_page = st.query_params.get("page")
+    full_run = st.session_state.pop("nav_full_run", False)
+    from streamlit_option_menu import option_menu
+    selected = option_menu(
+        menu_title=None,
+        options=pages,
+        icons=["house", "briefcase", "building", "list-check", "person"],
+        default_index=pages.index(requested_page) if requested_page in pages else 0,
+    )
+    if selected != st.session_state.get("page"):
+        st.session_state.page = selected
+        if not full_run:
+            # The menu changed in a sidebar-only rerun; redraw the page for it
+            st.rerun()
+    
+    st.markdown("---")
+    st.markdown(f"<div style='text-align: center;'>Logged in as <br/><b>{st.session_state.user_name}</b><br/><i>({st.session_state.user_role})</i></div>", unsafe_allow_html=True)
+    
+    # Logout button
+    if st.button("Logout"):
+        # End the stored session, reset session state and redirect to login
+        sign_out()
+        drop_session_cache(st.session_state)
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+        st.rerun()
+
+# Quick job search on the Home page
+@section
+@timed("section.home_search")
+def home_search():
+    st.markdown("<div class='search-container'>", unsafe_allow_html=True)
+    search_term = st.text_input("Search for jobs", placeholder="Job title, company, or keywords")
+    col1_1, col1_2, col1_3 = st.columns(3)
+    
+    with col1_1:
+        location = st.selectbox("Location", ["Any Location", "Remote", "USA", "Europe", "Asia", "Other"])
+    
+    with col1_2:
+        job_type = st.selectbox("Job Type", ["Any Type", "Full-time", "Part-time", "Contract", "Internship"])
+    
+    with col1_3:
+        experience = st.selectbox("Experience", ["Any Level", "Entry Level", "Mid Level", "Senior", "Executive"])
+    
+    if st.button("Search Jobs", use_container_width=True):
+        st.success("Redirecting to Jobs page with your search criteria")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# Dashboard tab with the employer's job listings and the new job form
+@section
+@timed("section.dashboard_posted_jobs")
+def dashboard_posted_jobs():
+    # Sample employer job listings (would be from database in production)
+    employer_jobs = [
+        {
+            "id": 1,
+            "title": "Senior Full Stack Developer",
+            "posted_date": "2023-02-01",
+            "applications": 45,
+            "status": "Active",
+            "views": 320
+        },
+        {
+            "id": 2,
+            "title": "UX/UI Designer",
+            "posted_date": "2023-02-10",
+            "applications": 28,
+            "status": "Active",
+            "views": 215
+        },
+        {
+            "id": 3,
+            "title": "Project Manager",
+            "posted_date": "2023-01-15",
+            "applications": 52,
+            "status": "Closed",
+            "views": 410
+        }
+    ]
+    
+    # Add new job button
+    if st.button("+ Post New Job", use_container_width=True):
+        st.session_state.show_job_form = True
+    
+    # Show job form if button clicked
+    if st.session_state.get("show_job_form", False):
+        with st.form("new_job_form"):
+            st.subheader("Create New Job Listing")
+            
+            job_title = st.text_input("Job Title", placeholder="e.g. Senior Developer")
+            job_description = st.text_area("Job Description", placeholder="Describe the job responsibilities and requirements")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                job_location = st.text_input("Location", placeholder="e.g. Remote, New York, etc.")
+                job_type = st.selectbox("Job Type", ["Full-time", "Part-time", "Contract", "Internship"])
+            
+            with col2:
+                salary_range = st.text_input("Salary Range", placeholder="e.g. $80K - $100K")
+                experience_level = st.selectbox("Experience Level", ["Entry Level", "Mid Level", "Senior", "Executive"])
+            
+            # Form submission
+            col1, col2 = st.columns(2)
+            with col1:
+                cancel = st.form_submit_button("Cancel")
+            with col2:
+                submit = st.form_submit_button("Create Job")
+            
+            if submit:
+                job_data = {
+                    "title": job_title,
+                    "description": job_description,
+                    "location": job_location,
+                    "job_type": job_type,
+                    "salary": salary_range,
+                    "experience_level": experience_level
+                }
+                if db.create_job(job_data):
+                    st.success("Job posted successfully!")
+                    st.session_state.show_job_form = False
+                    rerun_section()
+                else:
+                    st.error("Could not post the job. Please try again.")
+            
+            if cancel:
+                st.session_state.show_job_form = False
+                rerun_section()
+    
+    # Display job listings
+    for job in employer_jobs:
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.markdown(fragment_cache.render(
+                EMPLOYER_JOB_CARD, job["id"], tuple(job.items()),
+                lambda: {**job, "status_class": job["status"].lower()}
+            ), unsafe_allow_html=True)
+        
+        with col2:
+            st.button("View Details", key=f"view_job_{job['id']}")
+            st.button("Edit Job", key=f"edit_job_{job['id']}")
+
+# Dashboard tab with the talent pool search
+@section
+@timed("section.dashboard_candidates")
+def dashboard_candidates():
+    # Talent pool search
+    st.subheader("Search Talent Pool")
+    candidate_query = st.text_input(
+        "Skills, locations or seniority",
+        placeholder='e.g. Python AND AWS AND Remote, or "Machine Learning" OR Statistics',
+        key="candidate_query"
+    )
+    
+    if candidate_query:
+        try:
+            candidates = user_cache.get_or_load(
+                "candidates", candidate_query, lambda: db.search_candidates(candidate_query), ttl=30
+            )
+        except QuerySyntaxError as e:
+            st.warning(f"Could not understand the search: {str(e)}")
+            candidates = []
+        
+        if not candidates:
+            st.info("No candidates match this search yet.")
+        else:
+            # The whole result list in one element
+            st.markdown(fragment_cache.render_many(
+                CANDIDATE_CARD,
+                candidates,
+                record_id=lambda match: match[0].user_id,
+                values=lambda match: {
+                    "first_name": match[0].first_name,
+                    "last_name": match[0].last_name,
+                    "experience": match[0].experience_level or "Experience not specified",
+                    "place": ", ".join(p for p in (match[0].city, match[0].country) if p),
+                    "skills": render_skill_chips(match[0].skills),
+                    "score": f"{match[1]:.2f}"
+                }
+            ), unsafe_allow_html=True)
+
+# The user's profile (would be from database in production); memoized per session
+def load_profile():
+    if db.is_connected():
+        return user_cache.get_or_load(
+            "profile", "full", lambda: db.get_user_profile(st.session_state.user_id)
+        ) or Profile(user_id=st.session_state.user_id)
+    else:
+        # Mock profile data
+        return Profile(
+            user_id=st.session_state.user_id,
+            first_name=st.session_state.user_name.split(" ")[0],
+            last_name=st.session_state.user_name.split(" ")[-1] if len(st.session_state.user_name.split(" ")) > 1 else "",
+            email=st.session_state.user_email,
+            phone="+1 555-123-4567",
+            city="New York",
+            country="USA",
+            role=st.session_state.user_role
+        )
+
+# Profile tab with the personal information form
+@section
+@timed("section.profile_personal_info")
+def profile_personal_info():
+    profile = load_profile()
+    # Personal information form
+    with st.form("personal_info_form"):
+        st.subheader("Personal Information")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            first_name = st.text_input("First Name", value=profile.first_name)
+            phone = st.text_input("Phone Number", value=profile.phone)
+            city = st.text_input("City", value=profile.city)
+        
+        with col2:
+            last_name = st.text_input("Last Name", value=profile.last_name)
+            website = st.text_input("Website/Portfolio", value=profile.website)
+            country = st.selectbox("Country", ["United States", "Canada", "United Kingdom", "Germany", "Australia"])
+        
+        about_me = st.text_area("About Me", value=profile.about)
+        
+        if st.form_submit_button("Save Changes"):
+            st.session_state.profile_save = db.save_user_profile(st.session_state.user_id, {
+                "first_name": first_name,
+                "last_name": last_name,
+                "phone": phone,
+                "city": city,
+                "country": country,
+                "website": website,
+                "about": about_me
+            })
+            user_cache.mark_dirty("profile")
+    show_save_status("profile_save", "Profile")
+
+# Profile tab with the resume upload and skills
+@section
+@timed("section.profile_resume")
+def profile_resume():
+    # Resume section
+    st.subheader("Resume/CV")
+    
+    # Upload resume; each new file is stored and parsed in the background
+    uploaded_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"])
+    
+    if uploaded_file is not None and st.session_state.get("resume_upload_id") != uploaded_file.file_id:
+        st.session_state.resume_upload_id = uploaded_file.file_id
+        st.session_state.resume_job = init_resume_pipeline().submit(
+            st.session_state.user_id, uploaded_file, uploaded_file.name
+        )
+    
+    # Skills parsed from a new resume replace the entered ones once
+    job = st.session_state.get("resume_job")
+    if job is not None and job.status == "done" and st.session_state.get("resume_applied") is not job:
+        st.session_state.resume_applied = job
+        st.session_state.skills_input = ", ".join(job.skills)
+        user_cache.mark_dirty("profile")
+    
+    resume_status()
+    
+    # Skills section
+    st.subheader("Skills")
+    
+    # Display skills as chips/tags
+    # Seeded through session state, which parsed resumes also write to
+    st.session_state.setdefault("skills_input", ", ".join(SAMPLE_SKILLS))
+    skills_input = st.text_input("Add skills (comma separated)", key="skills_input")
+    skills = [skill.strip() for skill in skills_input.split(",") if skill.strip()]
+    
+    st.markdown(render_skill_chips(skills, "skill-chips"), unsafe_allow_html=True)
+
+# Progress of the resume being parsed, polled until it is saved
+@polled_section(1.0)
+def resume_status():
+    job = st.session_state.get("resume_job")
+    if job is None:
+        return
+    status = job.status
+    if status == "failed":
+        st.error(f"Resume could not be processed: {job.error}")
+    elif status == "done":
+        demo = "" if init_database().is_connected() else " (Demo mode)"
+        st.success(f"Resume saved. Found {len(job.skills)} skills.{demo}")
+        if st.session_state.get("resume_applied") is not job:
+            # Show the parsed skills in the Resume section
+            st.rerun()
+    else:
+        st.info(f"Resume {status}...")
+        if not SECTION_POLLING:
+            st.button("Refresh status", key="resume_refresh")
+
+# Profile tab with job preferences and the recommendations they produce
+@section
+@timed("section.profile_preferences")
+def profile_preferences():
+    profile = load_profile()
+    # Entered on the Resume tab, which reruns on its own
+    skills_input = st.session_state.get("skills_input", ", ".join(SAMPLE_SKILLS))
+    # Job preferences
+    st.subheader("Job Preferences")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        job_titles = st.multiselect(
+            "Job Titles",
+            ["Software Developer", "Frontend Developer", "Backend Developer", "Full Stack Developer", "DevOps Engineer", "Data Scientist"],
+            ["Full Stack Developer", "Frontend Developer"]
+        )
+        
+        job_types = st.multiselect(
+            "Job Types",
+            ["Full-time", "Part-time", "Contract", "Freelance", "Internship"],
+            ["Full-time", "Contract"]
+        )
+    
+    with col2:
+        locations = st.multiselect(
+            "Preferred Locations",
+            ["Remote", "United States", "Europe", "Asia", "Australia"],
+            ["Remote", "United States"]
+        )
+        
+        salary_expectation = st.select_slider(
+            "Salary Expectation (USD)",
+            options=["$40K - $60K", "$60K - $80K", "$80K - $100K", "$100K - $120K", "$120K - $150K", "$150K+"],
+            value="$100K - $120K"
+        )
+    
+    if st.button("Save Preferences"):
+        st.session_state.preferences_save = db.save_preferences(st.session_state.user_id, {
+            "skills": [skill.strip() for skill in skills_input.split(",") if skill.strip()],
+            "preferred_titles": job_titles,
+            "preferred_job_types": job_types,
+            "preferred_locations": locations,
+            "salary_expectation": salary_expectation
+        })
+        user_cache.mark_dirty("profile")
+    show_save_status("preferences_save", "Preferences")
+    
+    # Jobs matching the skills and preferences above
+    st.subheader("Recommended for You")
+    preferences = Profile(
+        user_id=profile.user_id,
+        skills=tuple(skill.strip() for skill in skills_input.split(",") if skill.strip()),
+        preferred_titles=tuple(job_titles),
+        preferred_job_types=tuple(job_types),
+        preferred_locations=tuple(locations),
+        salary_expectation=salary_expectation
+    )
+    recommended_jobs = user_cache.get_or_load(
+        "recommendations", preferences, lambda: db.recommend_jobs(preferences, limit=5)
+    )
+    if not recommended_jobs:
+        st.info("No matching jobs yet. Try widening your preferences.")
+    else:
+        # Cards embed the small logo variant. Their version includes the logo's key once its
+        # variant is ready, so a new logo, or one still being rendered, redraws the card.
+        logo_pipeline = init_logo_pipeline()
+        logos = db.get_company_logos(job.company for job in recommended_jobs)
+        thumbnails = {company: logo_pipeline.thumbnail(logo_key) for company, logo_key in logos.items()}
+        st.markdown(fragment_cache.render_many(
+            JOB_CARD,
+            recommended_jobs,
+            record_id=lambda job: job.id,
+            version=lambda job: (hash(job), logos[job.company] if thumbnails.get(job.company) else None),
+            values=lambda job: {
+                "logo": render_logo(thumbnails.get(job.company), job.company),
+                "title": job.title,
+                "company": job.company,
+                "location": job.location,
+                "job_type": job.job_type,
+                "salary": job.salary
+            }
+        ), unsafe_allow_html=True)
+
+# Profile tab with the company information form
+@section
+@timed("section.company_profile")
+def company_profile():
+    # Company profile form
+    with st.form("company_profile_form"):
+        st.subheader("Company Information")
+        
+        # Company logo upload; resized in the background once the form is saved
+        logo_file = st.file_uploader("Company Logo", type=["png", "jpg", "jpeg"])
+        
+        company_name = st.text_input("Company Name", value="TechNova Inc.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            industry = st.selectbox("Industry", ["Technology", "Healthcare", "Finance", "Education", "Retail", "Manufacturing", "Other"])
+            company_size = st.selectbox("Company Size", ["1-10 employees", "11-50 employees", "51-200 employees", "201-1000 employees", "1000+ employees"])
+        
+        with col2:
+            website = st.text_input("Company Website", value="https://technova.example.com")
+            founded_year = st.number_input("Year Founded", min_value=1900, max_value=2023, value=2010)
+        
+        company_description = st.text_area("Company Description", value="TechNova is a leading software development company specializing in innovative enterprise solutions.")
+        
+        if st.form_submit_button("Save Company Profile"):
+            st.session_state.company_save = db.save_company_profile(st.session_state.user_id, {
+                "name": company_name,
+                "industry": industry,
+                "company_size": company_size,
+                "website": website,
+                "founded_year": int(founded_year),
+                "description": company_description
+            })
+            if logo_file is not None and st.session_state.get("logo_upload_id") != logo_file.file_id:
+                st.session_state.logo_upload_id = logo_file.file_id
+                st.session_state.logo_job = init_logo_pipeline().submit(
+                    st.session_state.user_id, logo_file, logo_file.name
+                )
+    show_save_status("company_save", "Company profile")
+    logo_status()
+
+# Progress of the company logo being resized, polled until it is saved
+@polled_section(1.0)
+def logo_status():
+    job = st.session_state.get("logo_job")
+    if job is None:
+        return
+    status = job.status
+    if status == "failed":
+        st.error(f"Logo could not be processed: {job.error}")
+    elif status == "done":
+        demo = "" if init_database().is_connected() else " (Demo mode)"
+        header = init_logo_pipeline().thumbnail(job.key, "header")
+        st.markdown(render_logo(header, "Company", "header-logo", 160), unsafe_allow_html=True)
+        st.success(f"Logo saved.{demo}")
+    else:
+        st.info(f"Logo {status}...")
+        if not SECTION_POLLING:
+            st.button("Refresh status", key="logo_refresh")
 
 # Apply custom CSS
 load_css()
 
 # Authenticate user
-user = authenticate()
+with timed("auth.authenticate"):
+    user = authenticate()
+
+# Start all remote asset fetches for this page at once; the page is the one
+# shown last run, since switching pages in the sidebar reruns the whole app
+with timed("assets.prefetch"):
+    on_home = st.session_state.get("page", st.query_params.get("page", "Home")) == "Home"
+    page_assets = init_asset_prefetcher().prefetch(
+        ([SIDEBAR_LOTTIE_URL] + ([HOME_LOTTIE_URL] if on_home else [])) if user else [LANDING_LOTTIE_URL]
+    )
 
 if user:
-    # User is authenticated
+    # User is authenticated; connect on the first run that needs data
+    with timed("startup.init_database"):
+        db = init_database()
+    
     st.session_state.user_id = user.get("id")
     st.session_state.user_email = user.get("email_addresses", [{}])[0].get("email_address", "")
     st.session_state.user_name = user.get("first_name", "") + " " + user.get("last_name", "")
     st.session_state.user_role = user.get("public_metadata", {}).get("role", "jobseeker")
     
+    # Reads of this user's data, memoized across reruns of the session
+    user_cache = get_session_cache(
+        st.session_state,
+        st.session_state.user_id,
+        ttl=float(st.secrets.get("SESSION_CACHE_TTL", 120)),
+        max_entries=int(st.secrets.get("SESSION_CACHE_MAX_ENTRIES", 32))
+    )
+    
     # Create sidebar navigation
     with st.sidebar:
-        # Logo and app name
-        st.markdown("<h1 style='text-align: center; color: #00A8E8;'>JobWave</h1>", unsafe_allow_html=True)
-        
-        # Load a Lottie animation for the sidebar
-        lottie_sidebar = load_lottieurl("https://assets5.lottiefiles.com/packages/lf20_kkflmtur.json")
-        if lottie_sidebar:
-            st_lottie.st_lottie(lottie_sidebar, height=200)
-        
-        # Navigation menu
-        selected = option_menu(
-            menu_title=None,
-            options=[
-                "Home", 
-                "Jobs", 
-                "Companies", 
-                "Applications" if st.session_state.user_role == "jobseeker" else "Dashboard", 
-                "Profile"
-            ],
-            icons=["house", "briefcase", "building", "list-check", "person"],
-            default_index=0,
-        )
-        
-        st.markdown("---")
-        st.markdown(f"<div style='text-align: center;'>Logged in as <br/><b>{st.session_state.user_name}</b><br/><i>({st.session_state.user_role})</i></div>", unsafe_allow_html=True)
-        
-        # Logout button
-        if st.button("Logout"):
-            # Reset session state and redirect to login
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
-            st.rerun()
+        st.session_state.nav_full_run = True
+        render_sidebar(page_assets)
+    selected = st.session_state.page
     
     # Main content based on navigation selection
+    page_timer = timed(f"page.{selected.lower()}").start()
     if selected == "Home":
         # Hero section with animation
         col1, col2 = st.columns([1, 1])
@@ -284,289 +936,71 @@ if user:
             st.markdown("<p class='subtitle'>Discover opportunities that match your skills and ambitions</p>", unsafe_allow_html=True)
             
             # Quick search
-            st.markdown("<div class='search-container'>", unsafe_allow_html=True)
-            search_term = st.text_input("Search for jobs", placeholder="Job title, company, or keywords")
-            col1_1, col1_2, col1_3 = st.columns(3)
-            
-            with col1_1:
-                location = st.selectbox("Location", ["Any Location", "Remote", "USA", "Europe", "Asia", "Other"])
-            
-            with col1_2:
-                job_type = st.selectbox("Job Type", ["Any Type", "Full-time", "Part-time", "Contract", "Internship"])
-            
-            with col1_3:
-                experience = st.selectbox("Experience", ["Any Level", "Entry Level", "Mid Level", "Senior", "Executive"])
-            
-            if st.button("Search Jobs", use_container_width=True):
-                st.success("Redirecting to Jobs page with your search criteria")
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+            home_search()
             
         with col2:
             # Lottie animation
-            lottie_url = "https://assets3.lottiefiles.com/packages/lf20_nehbumrv.json"
-            lottie_json = load_lottieurl(lottie_url)
-            if lottie_json:
-                st_lottie.st_lottie(lottie_json, height=400)
+            render_lottie(page_assets, HOME_LOTTIE_URL, height=400)
         
         # Stats counters
         st.markdown("<h2 style='text-align: center; margin: 3rem 0 2rem 0;'>JobWave in Numbers</h2>", unsafe_allow_html=True)
         
-        col1, col2, col3, col4 = st.columns(4)
+        # Precomputed counters; reading them never queries the database
+        stats = db.get_portal_stats()
+        counters = [
+            (format_count(stats.active_jobs), "Active Jobs"),
+            (format_count(stats.job_seekers), "Job Seekers"),
+            (format_count(stats.companies), "Companies"),
+            (f"{stats.success_rate:.0%}", "Success Rate"),
+        ]
         
-        with col1:
-            st.markdown("""
-            <div class='stat-counter'>
-                <div class='counter-value'>5000+</div>
-                <div class='counter-label'>Active Jobs</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col2:
-            st.markdown("""
-            <div class='stat-counter'>
-                <div class='counter-value'>2M+</div>
-                <div class='counter-label'>Job Seekers</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col3:
-            st.markdown("""
-            <div class='stat-counter'>
-                <div class='counter-value'>10K+</div>
-                <div class='counter-label'>Companies</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col4:
-            st.markdown("""
-            <div class='stat-counter'>
-                <div class='counter-value'>85%</div>
-                <div class='counter-label'>Success Rate</div>
-            </div>
-            """, unsafe_allow_html=True)
+        # All four counters in one element
+        st.markdown(wrap("".join(
+            STAT_COUNTER.render({"value": value if stats.as_of else "\u2014", "label": label})
+            for value, label in counters
+        ), "stat-grid"), unsafe_allow_html=True)
+        
+        if stats.as_of:
+            st.caption(f"Updated {stats.as_of.strftime('%b %d, %Y %H:%M')} UTC")
         
         # Tabs for different dashboard sections
         tab1, tab2, tab3 = st.tabs(["Posted Jobs", "Applications", "Candidates"])
         
         with tab1:
-            # Sample employer job listings (would be from database in production)
-            employer_jobs = [
-                {
-                    "id": 1,
-                    "title": "Senior Full Stack Developer",
-                    "posted_date": "2023-02-01",
-                    "applications": 45,
-                    "status": "Active",
-                    "views": 320
-                },
-                {
-                    "id": 2,
-                    "title": "UX/UI Designer",
-                    "posted_date": "2023-02-10",
-                    "applications": 28,
-                    "status": "Active",
-                    "views": 215
-                },
-                {
-                    "id": 3,
-                    "title": "Project Manager",
-                    "posted_date": "2023-01-15",
-                    "applications": 52,
-                    "status": "Closed",
-                    "views": 410
-                }
-            ]
-            
-            # Add new job button
-            if st.button("+ Post New Job", use_container_width=True):
-                st.session_state.show_job_form = True
-            
-            # Show job form if button clicked
-            if st.session_state.get("show_job_form", False):
-                with st.form("new_job_form"):
-                    st.subheader("Create New Job Listing")
-                    
-                    job_title = st.text_input("Job Title", placeholder="e.g. Senior Developer")
-                    job_description = st.text_area("Job Description", placeholder="Describe the job responsibilities and requirements")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        job_location = st.text_input("Location", placeholder="e.g. Remote, New York, etc.")
-                        job_type = st.selectbox("Job Type", ["Full-time", "Part-time", "Contract", "Internship"])
-                    
-                    with col2:
-                        salary_range = st.text_input("Salary Range", placeholder="e.g. $80K - $100K")
-                        experience_level = st.selectbox("Experience Level", ["Entry Level", "Mid Level", "Senior", "Executive"])
-                    
-                    # Form submission
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        cancel = st.form_submit_button("Cancel")
-                    with col2:
-                        submit = st.form_submit_button("Create Job")
-                    
-                    if submit:
-                        st.success("Job posted successfully! (Demo mode)")
-                        st.session_state.show_job_form = False
-                        st.rerun()
-                    
-                    if cancel:
-                        st.session_state.show_job_form = False
-                        st.rerun()
-            
-            # Display job listings
-            for job in employer_jobs:
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class='card'>
-                        <h3>{job["title"]}</h3>
-                        <div>Posted on: {job["posted_date"]} | Status: <span style='color: {"#00A8E8" if job["status"] == "Active" else "#FF6347"};'>{job["status"]}</span></div>
-                        <div style='margin-top: 0.5rem;'>{job["applications"]} applications | {job["views"]} views</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown("<div style='height: 100%; display: flex; flex-direction: column; justify-content: center;'>", unsafe_allow_html=True)
-                    st.button("View Details", key=f"view_job_{job['id']}")
-                    st.button("Edit Job", key=f"edit_job_{job['id']}")
-                    st.markdown("</div>", unsafe_allow_html=True)
+            dashboard_posted_jobs()
+        
+        with tab3:
+            dashboard_candidates()
     
     elif selected == "Profile":
         st.markdown("<h1 class='main-title'>My Profile</h1>", unsafe_allow_html=True)
         
-        # Get user profile (would be from database in production)
-        if db.is_connected():
-            profile = db.get_user_profile(st.session_state.user_id)
-        else:
-            # Mock profile data
-            profile = {
-                "first_name": st.session_state.user_name.split(" ")[0],
-                "last_name": st.session_state.user_name.split(" ")[-1] if len(st.session_state.user_name.split(" ")) > 1 else "",
-                "email": st.session_state.user_email,
-                "phone": "+1 555-123-4567",
-                "city": "New York",
-                "country": "USA",
-                "role": st.session_state.user_role
-            }
-        
         # Tabs for different profile sections
         if st.session_state.user_role == "jobseeker":
             tab1, tab2, tab3 = st.tabs(["Personal Info", "Resume", "Job Preferences"])
             
             with tab1:
-                # Personal information form
-                with st.form("personal_info_form"):
-                    st.subheader("Personal Information")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        first_name = st.text_input("First Name", value=profile.get("first_name", ""))
-                        phone = st.text_input("Phone Number", value=profile.get("phone", ""))
-                        city = st.text_input("City", value=profile.get("city", ""))
-                    
-                    with col2:
-                        last_name = st.text_input("Last Name", value=profile.get("last_name", ""))
-                        website = st.text_input("Website/Portfolio", value=profile.get("website", ""))
-                        country = st.selectbox("Country", ["United States", "Canada", "United Kingdom", "Germany", "Australia"])
-                    
-                    about_me = st.text_area("About Me", value=profile.get("about", ""))
-                    
-                    if st.form_submit_button("Save Changes"):
-                        st.success("Profile updated successfully! (Demo mode)")
+                profile_personal_info()
             
             with tab2:
-                # Resume section
-                st.subheader("Resume/CV")
-                
-                # Upload resume
-                uploaded_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"])
-                
-                if uploaded_file is not None:
-                    st.success("Resume uploaded successfully! (Demo mode)")
-                
-                # Skills section
-                st.subheader("Skills")
-                
-                # Sample skills
-                skills = ["Python", "JavaScript", "React", "Node.js", "SQL", "AWS", "Docker", "Git"]
-                
-                # Display skills as chips/tags
-                skills_input = st.text_input("Add skills (comma separated)", value=", ".join(skills))
-                
-                st.markdown("<div style='display: flex; flex-wrap: wrap; gap: 10px; margin-top: 10px;'>", unsafe_allow_html=True)
-                for skill in skills:
-                    st.markdown(f"""
-                    <div style='background-color: rgba(0, 168, 232, 0.2); padding: 5px 15px; border-radius: 20px; display: flex; align-items: center;'>
-                        <span>{skill}</span>
-                        <span style='margin-left: 5px; cursor: pointer;'>✕</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
+                profile_resume()
             
             with tab3:
-                # Job preferences
-                st.subheader("Job Preferences")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    job_titles = st.multiselect(
-                        "Job Titles",
-                        ["Software Developer", "Frontend Developer", "Backend Developer", "Full Stack Developer", "DevOps Engineer", "Data Scientist"],
-                        ["Full Stack Developer", "Frontend Developer"]
-                    )
-                    
-                    job_types = st.multiselect(
-                        "Job Types",
-                        ["Full-time", "Part-time", "Contract", "Freelance", "Internship"],
-                        ["Full-time", "Contract"]
-                    )
-                
-                with col2:
-                    locations = st.multiselect(
-                        "Preferred Locations",
-                        ["Remote", "United States", "Europe", "Asia", "Australia"],
-                        ["Remote", "United States"]
-                    )
-                    
-                    salary_expectation = st.select_slider(
-                        "Salary Expectation (USD)",
-                        options=["$40K - $60K", "$60K - $80K", "$80K - $100K", "$100K - $120K", "$120K - $150K", "$150K+"],
-                        value="$100K - $120K"
-                    )
-                
-                st.button("Save Preferences")
+                profile_preferences()
         else:
             # Employer profile
             tab1, tab2 = st.tabs(["Company Profile", "Job Postings"])
             
             with tab1:
-                # Company profile form
-                with st.form("company_profile_form"):
-                    st.subheader("Company Information")
-                    
-                    # Company logo upload
-                    st.file_uploader("Company Logo", type=["png", "jpg", "jpeg"])
-                    
-                    company_name = st.text_input("Company Name", value="TechNova Inc.")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        industry = st.selectbox("Industry", ["Technology", "Healthcare", "Finance", "Education", "Retail", "Manufacturing", "Other"])
-                        company_size = st.selectbox("Company Size", ["1-10 employees", "11-50 employees", "51-200 employees", "201-1000 employees", "1000+ employees"])
-                    
-                    with col2:
-                        website = st.text_input("Company Website", value="https://technova.example.com")
-                        founded_year = st.number_input("Year Founded", min_value=1900, max_value=2023, value=2010)
-                    
-                    company_description = st.text_area("Company Description", value="TechNova is a leading software development company specializing in innovative enterprise solutions.")
-                    
-                    if st.form_submit_button("Save Company Profile"):
-                        st.success("Company profile updated successfully! (Demo mode)")
+                company_profile()
+    page_timer.stop()
+    
+    # Timing breakdown for admins
+    if secret_flag("DEBUG_PANEL") or st.session_state.user_id in st.secrets.get("ADMIN_USER_IDS", []):
+        render_debug_panel(rerun_trace, user_cache)
 else:
     # User is not authenticated
+    drop_session_cache(st.session_state)
     st.markdown("<h1 class='main-title'>Welcome to JobWave</h1>", unsafe_allow_html=True)
     
     # Create two columns for login and hero image
@@ -601,10 +1035,11 @@ else:
     
     with col2:
         # Lottie animation for the landing page
-        lottie_url = "https://assets10.lottiefiles.com/packages/lf20_sSF6EG.json"
-        lottie_json = load_lottieurl(lottie_url)
-        if lottie_json:
-            st_lottie.st_lottie(lottie_json, height=400)
+        render_lottie(page_assets, LANDING_LOTTIE_URL, height=400)
+    
+    # Connect while the visitor signs in, so their first page doesn't wait
+    if secret_flag("WARM_UP_DATABASE", True):
+        init_database_warm_up().start()
 
 if __name__ == "__main__":
     # This will run when the script is executed directly
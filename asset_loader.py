@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class PageAssets:
+    """Handle to the assets prefetched for one script run."""
+
+    def __init__(self, futures: Dict[str, Future], deadline: float):
+        self._futures = futures
+        self._deadline = deadline
+
+    def get(self, url: str) -> Optional[Any]:
+        """
+        Wait for an asset until the page deadline.
+
+        Args:
+            url: The asset URL passed to prefetch()
+
+        Returns:
+            The loaded asset, or None if it failed or missed the deadline
+        """
+        future = self._futures.get(url)
+        if future is None:
+            return None
+
+        remaining = max(0.0, self._deadline - time.monotonic())
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            logging.warning(f"Asset {url} missed the page deadline")
+            return None
+        except Exception as e:
+            logging.error(f"Error loading asset {url}: {str(e)}")
+            return None
+
+
+class AssetPrefetcher:
+    """
+    Shared thread pool that loads all remote assets of a page concurrently.
+
+    Identical URLs requested by concurrent sessions share one in-flight fetch,
+    so page render time is bounded by the slowest asset or the total deadline.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, float], Any],
+        max_workers: int = 8,
+        request_timeout: float = 3.0,
+        total_timeout: float = 4.0,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            loader: Callable taking (url, timeout) and returning the asset
+            max_workers: Size of the shared thread pool
+            request_timeout: Network timeout for a single asset
+            total_timeout: Maximum time a page waits for all of its assets
+        """
+        self.loader = loader
+        self.request_timeout = request_timeout
+        self.total_timeout = total_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset-prefetch")
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, urls: Iterable[str], total_timeout: Optional[float] = None) -> PageAssets:
+        """
+        Start loading all URLs at once.
+
+        Args:
+            urls: Asset URLs needed by the page
+            total_timeout: Optional page deadline overriding the default
+
+        Returns:
+            A PageAssets handle to collect the results
+        """
+        deadline = time.monotonic() + (total_timeout if total_timeout is not None else self.total_timeout)
+        futures = {url: self._submit(url) for url in urls}
+        return PageAssets(futures, deadline)
+
+    def _submit(self, url: str) -> Future:
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.loader, url, self.request_timeout)
+            self._in_flight[url] = future
+
+        # Registered outside the lock: the callback runs inline if already done
+        future.add_done_callback(lambda f: self._release(url, f))
+        return future
+
+    def _release(self, url: str, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(url) is future:
+                del self._in_flight[url]
+
+    def shutdown(self) -> None:
+        """Stop the worker threads without waiting for pending fetches."""
+        self._executor.shutdown(wait=False)
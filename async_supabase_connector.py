@@ -0,0 +1,549 @@
+import asyncio
+import importlib.util
+import inspect
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+
+from instrumentation import instrument_http_client, timed
+from models import Application, Company, Job, Profile
+from projections import (
+    APPLICATION_ROW_FIELDS, COMPANY_CARD_FIELDS, JOB_CARD_FIELDS, JOB_DETAIL_FIELDS, PROFILE_FIELDS, with_columns
+)
+from query_cache import normalize_filters
+from supabase_connector import ID_BATCH_SIZE, SupabaseConnector, apply_job_filters, load_factory
+
+
+class EventLoopThread:
+    """
+    An asyncio event loop running forever on a daemon thread.
+
+    Lets blocking code (the Streamlit script thread) run coroutines on one
+    loop shared by every session, so they share one connection pool.
+    """
+
+    _shared: Optional["EventLoopThread"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, name: str = "supabase-event-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls) -> "EventLoopThread":
+        """Get the process-wide loop, starting it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Seconds to wait before giving up and cancelling it
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            TimeoutError: If the coroutine didn't finish in time
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+
+class AsyncSupabaseConnector:
+    """
+    Async variant of SupabaseConnector for the job portal.
+
+    Reads are coroutines on the async PostgREST client over one pooled
+    HTTP/2 connection. The query cache, job cache and search indexes are
+    the sync connector's, so identical queries in flight at the same time
+    share a single request whichever connector started it. Writes, index
+    maintenance and statistics are left to the sync connector, whose
+    methods are available on this one too.
+    """
+
+    def __init__(self, connector: SupabaseConnector, client: Optional[Any] = None):
+        """
+        Initialize the async PostgREST client.
+
+        Args:
+            connector: The sync connector whose settings, caches and indexes are shared
+            client: A ready async client to use instead of connecting with the
+                SUPABASE_URL and SUPABASE_KEY secrets, e.g. a local stand-in
+        """
+        self.connector = connector
+        self.settings = connector.settings
+
+        try:
+            supabase_url = self.settings.get("SUPABASE_URL", "")
+            supabase_key = self.settings.get("SUPABASE_KEY", "")
+            # "module:function" of an alternative async client constructor, e.g. a local stand-in
+            factory = self.settings.get("SUPABASE_ASYNC_CLIENT_FACTORY")
+
+            if client is not None:
+                self.client = client
+            elif not connector.is_connected() or not supabase_url or not supabase_key:
+                self.client = None
+            elif factory:
+                self.client = load_factory(factory)(supabase_url, supabase_key)
+            elif self.settings.get("SUPABASE_CLIENT_FACTORY"):
+                # A sync stand-in without an async one; reads stay on the sync connector
+                self.client = None
+            else:
+                self.client = self._create_client(supabase_url, supabase_key)
+
+        except Exception as e:
+            logging.error(f"Error initializing async Supabase client: {str(e)}")
+            self.client = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything without an async variant is the sync connector's
+        if name == "connector":
+            raise AttributeError(name)
+        return getattr(self.connector, name)
+
+    def _create_client(self, supabase_url: str, supabase_key: str) -> AsyncPostgrestClient:
+        """Create the PostgREST client over a pooled connection, using HTTP/2 when h2 is installed."""
+        http2 = str(self.settings.get("SUPABASE_HTTP2", True)).lower() in ("1", "true", "yes")
+        if http2 and importlib.util.find_spec("h2") is None:
+            logging.warning("h2 is not installed; falling back to HTTP/1.1 for Supabase requests")
+            http2 = False
+
+        base_url = f"{supabase_url}/rest/v1"
+        headers = {"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}"}
+        session = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=int(self.settings.get("SUPABASE_MAX_CONNECTIONS", 20)),
+                max_keepalive_connections=int(self.settings.get("SUPABASE_MAX_KEEPALIVE", 10))
+            ),
+            http2=http2,
+            follow_redirects=True
+        )
+        instrument_http_client(session)
+        return AsyncPostgrestClient(base_url, headers=headers, http_client=session)
+
+    def is_async(self) -> bool:
+        """Check if reads run on the async client rather than through the sync connector."""
+        return self.client is not None
+
+    async def aclose(self) -> None:
+        """Close the pooled connection."""
+        if self.client is not None and hasattr(self.client, "aclose"):
+            await self.client.aclose()
+
+    async def _run_sync(self, name: str, *args, **kwargs) -> Any:
+        """Run a sync connector read in a worker thread, for demo mode and sync-only stand-ins."""
+        return await asyncio.to_thread(getattr(self.connector, name), *args, **kwargs)
+
+    async def _single_flight(self, table: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached result, or share one in-flight query among concurrent callers.
+
+        Joins loads started by the sync connector as well, through the shared
+        query cache.
+
+        Args:
+            table: The table the result is read from
+            key: Hashable query key
+            load: Coroutine function that runs the query
+
+        Returns:
+            The query result
+        """
+        hit, value = self.connector.query_cache.lookup(table, key)
+        if hit:
+            return value
+
+        flight, generation = self.connector.query_cache.begin_load(table, key)
+        if generation is None:
+            # A caller giving up must not cancel the load for the others
+            return await asyncio.shield(asyncio.wrap_future(flight))
+
+        async def run():
+            try:
+                result = await load()
+            except BaseException as e:
+                self.connector.query_cache.end_load(table, key, flight, generation, error=e)
+                raise
+            self.connector.query_cache.end_load(table, key, flight, generation, result)
+            return result
+
+        return await asyncio.shield(asyncio.ensure_future(run()))
+
+    # User operations
+    async def get_user_profile(self, user_id: str, fields: str = PROFILE_FIELDS) -> Optional[Profile]:
+        """
+        Get a user's profile from the database.
+
+        Args:
+            user_id: The user's ID
+            fields: Columns to fetch
+
+        Returns:
+            The user profile or None if not found
+        """
+        if not self.is_async():
+            return await self._run_sync("get_user_profile", user_id, fields)
+
+        try:
+            # No row yet is not an error: the profile may still be in the write-behind queue
+            query = self.client.table("profiles").select(fields).eq("user_id", user_id).limit(1)
+            response = await query.execute()
+            row = response.data[0] if response.data else None
+            # Saves still in the write-behind queue win over what the database has
+            pending = self.connector.write_queue.pending_values("profiles", user_id)
+            if row is None and not pending:
+                return None
+            profile = Profile.from_row({**(row or {"user_id": user_id}), **(pending or {})})
+            if fields == PROFILE_FIELDS:
+                # Full reads keep the talent pool index current between snapshots
+                self.connector._index_candidate(profile)
+            return profile
+        except Exception as e:
+            logging.error(f"Error fetching user profile: {str(e)}")
+            return None
+
+    # Job operations
+    async def get_jobs(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        fields: str = JOB_CARD_FIELDS
+    ) -> List[Job]:
+        """
+        Get jobs with optional filtering.
+
+        Args:
+            filters: Optional dictionary of filters
+            limit: Maximum number of jobs to return
+            fields: Columns to fetch, card columns by default
+
+        Returns:
+            List of jobs, newest first
+        """
+        jobs, _ = await self.get_jobs_page(filters, page_size=limit, fields=fields)
+        return jobs
+
+    async def get_job(self, job_id: str, fields: str = JOB_DETAIL_FIELDS) -> Optional[Job]:
+        """
+        Get a single job for its detail view.
+
+        Args:
+            job_id: The job's ID
+            fields: Columns to fetch, the full detail row by default
+
+        Returns:
+            The job or None if not found
+        """
+        if not self.is_async():
+            return await self._run_sync("get_job", job_id, fields)
+
+        async def load():
+            response = await self.client.table("jobs").select(fields).eq("id", job_id).limit(1).execute()
+            return Job.from_row(response.data[0]) if response.data else None
+
+        try:
+            return await self._single_flight("jobs", ("detail", str(job_id), fields), load)
+        except Exception as e:
+            logging.error(f"Error fetching job: {str(e)}")
+            return None
+
+    async def get_jobs_by_ids(self, job_ids: List[str]) -> Dict[str, Job]:
+        """
+        Resolve job ids to card records through the shared job cache.
+
+        Only ids missing from the cache are fetched, in batched in_() queries
+        that run concurrently.
+
+        Args:
+            job_ids: The job IDs to resolve
+
+        Returns:
+            Jobs by ID; IDs that don't exist are left out
+        """
+        if not self.is_async():
+            return await self._run_sync("get_jobs_by_ids", job_ids)
+
+        jobs, missing = self.connector.job_cache.get_many(job_ids)
+
+        async def load(batch):
+            response = await self.client.table("jobs").select(JOB_CARD_FIELDS).in_("id", batch).execute()
+            return {job.id: job for job in (Job.from_row(row) for row in response.data or [])}
+
+        results = await asyncio.gather(
+            *(load(missing[start:start + ID_BATCH_SIZE]) for start in range(0, len(missing), ID_BATCH_SIZE)),
+            return_exceptions=True
+        )
+        for fetched in results:
+            if isinstance(fetched, Exception):
+                logging.error(f"Error fetching jobs by id: {str(fetched)}")
+                continue
+            self.connector.job_cache.put_many(fetched)
+            jobs.update(fetched)
+        return jobs
+
+    async def get_jobs_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        fields: str = JOB_CARD_FIELDS
+    ) -> Tuple[List[Job], Optional[str]]:
+        """
+        Get one page of jobs using keyset pagination on (posted_at, id).
+
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of jobs per page
+            cursor: Cursor returned with the previous page, or None for the first page
+            fields: Columns to fetch, card columns by default
+
+        Returns:
+            The jobs on the page and the cursor of the next page (None on the last page)
+        """
+        if not self.is_async():
+            return await self._run_sync("get_jobs_page", filters, page_size, cursor, fields)
+
+        try:
+            key = (normalize_filters(filters), page_size, cursor, fields)
+            return await self._single_flight(
+                "jobs", key, lambda: self._query_page("jobs", filters, page_size, cursor, fields)
+            )
+        except Exception as e:
+            logging.error(f"Error fetching jobs: {str(e)}")
+            return [], None
+
+    # Search operations
+    async def search_jobs(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        fields: str = JOB_CARD_FIELDS
+    ) -> List[Job]:
+        """
+        Full-text search over job title, company and description.
+
+        Args:
+            text: Search text; the last word also matches as a prefix
+            filters: Optional dictionary of additional filters
+            limit: Maximum number of jobs to return
+            fields: Columns to fetch, card columns by default
+
+        Returns:
+            List of jobs, best match first
+        """
+        if not self.is_async():
+            return await self._run_sync("search_jobs", text, filters, limit, fields)
+
+        job_ids = self.connector._search_job_ids(text)
+        if job_ids is None:
+            # Index not built yet; fall back to the database scan
+            return await self.get_jobs({**(filters or {}), "search": text}, limit, fields)
+        if not job_ids:
+            return []
+
+        rank = {job_id: i for i, job_id in enumerate(job_ids)}
+
+        async def load():
+            query = self.client.table("jobs").select(with_columns(fields, ("id",)))
+            query = apply_job_filters(query, {**(filters or {}), "search": text}, job_ids)
+            jobs = [Job.from_row(row) for row in (await query.execute()).data or []]
+            jobs.sort(key=lambda job: rank.get(job.id, len(rank)))
+            return jobs[:limit]
+
+        try:
+            key = ("search", text.strip().casefold(), normalize_filters(filters), limit, fields)
+            return await self._single_flight("jobs", key, load)
+        except Exception as e:
+            logging.error(f"Error searching jobs: {str(e)}")
+            return []
+
+    # Application operations
+    async def get_applications_by_user(self, user_id: str, fields: str = APPLICATION_ROW_FIELDS) -> List[Application]:
+        """
+        Get applications made by a user.
+
+        Args:
+            user_id: The user's ID
+            fields: Application columns to fetch; jobs are resolved separately
+
+        Returns:
+            List of applications
+        """
+        if not self.is_async():
+            return await self._run_sync("get_applications_by_user", user_id, fields)
+
+        try:
+            response = await self.client.table("applications").select(fields).eq("user_id", user_id).execute()
+            rows = response.data or []
+
+            # Resolve jobs in one batch from the shared cache instead of embedding a copy per row
+            jobs = await self.get_jobs_by_ids([row["job_id"] for row in rows if row.get("job_id") is not None])
+            return [Application.from_row(row, job=jobs.get(str(row.get("job_id")))) for row in rows]
+        except Exception as e:
+            logging.error(f"Error fetching applications: {str(e)}")
+            return []
+
+    # Company operations
+    async def get_companies(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        fields: str = COMPANY_CARD_FIELDS
+    ) -> List[Company]:
+        """
+        Get companies with optional filtering.
+
+        Args:
+            filters: Optional dictionary of filters
+            limit: Maximum number of companies to return
+            fields: Columns to fetch, card columns by default
+
+        Returns:
+            List of companies, ordered by name
+        """
+        companies, _ = await self.get_companies_page(filters, page_size=limit, fields=fields)
+        return companies
+
+    async def get_company_logos(self, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the logo keys of companies by name, for the logos on job cards.
+
+        Args:
+            names: Company names, e.g. the companies of the jobs on a page
+
+        Returns:
+            Logo key by company name; companies without a logo are left out
+        """
+        names = tuple(sorted({name for name in names if name}))
+        if not names:
+            return {}
+        if not self.is_async():
+            return await self._run_sync("get_company_logos", names)
+
+        async def load():
+            response = await self.client.table("companies").select("name,logo_key").in_("name", list(names)).execute()
+            return {row["name"]: row["logo_key"] for row in response.data or [] if row.get("logo_key")}
+
+        try:
+            return await self._single_flight("companies", ("logos", names), load)
+        except Exception as e:
+            logging.error(f"Error fetching company logos: {str(e)}")
+            return {}
+
+    async def get_companies_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        fields: str = COMPANY_CARD_FIELDS
+    ) -> Tuple[List[Company], Optional[str]]:
+        """
+        Get one page of companies using keyset pagination on (name, id).
+
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of companies per page
+            cursor: Cursor returned with the previous page, or None for the first page
+            fields: Columns to fetch, card columns by default
+
+        Returns:
+            The companies on the page and the cursor of the next page (None on the last page)
+        """
+        if not self.is_async():
+            return await self._run_sync("get_companies_page", filters, page_size, cursor, fields)
+
+        try:
+            key = (normalize_filters(filters), page_size, cursor, fields)
+            return await self._single_flight(
+                "companies", key, lambda: self._query_page("companies", filters, page_size, cursor, fields)
+            )
+        except Exception as e:
+            logging.error(f"Error fetching companies: {str(e)}")
+            return [], None
+
+    # Pagination helpers
+    async def _query_page(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]],
+        page_size: int,
+        cursor: Optional[str],
+        fields: str
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Run one keyset page query against Supabase, raising on errors."""
+        query = self.connector._page_query(self.client, table, filters, page_size, cursor, fields)
+        if query is None:
+            return [], None
+        response = await query.execute()
+        return self.connector._page_result(table, response.data if response.data else [], page_size, fields)
+
+
+class AsyncConnectorFacade:
+    """
+    Blocking facade over AsyncSupabaseConnector for the Streamlit script thread.
+
+    Every read of the async connector is exposed as a plain method that runs
+    on the shared event loop, so all sessions share one connection pool and
+    one set of in-flight queries. Everything else, including reads when
+    there is no async client, goes to the sync connector unchanged.
+    """
+
+    def __init__(
+        self,
+        connector: SupabaseConnector,
+        timeout: float = 30.0,
+        loop: Optional[EventLoopThread] = None,
+        client: Optional[Any] = None
+    ):
+        """
+        Initialize the facade.
+
+        Args:
+            connector: The sync connector to share settings, caches and indexes with
+            timeout: Seconds a blocking call waits for its result
+            loop: Event loop thread to run on, the shared one by default
+            client: A ready async client for the async connector, e.g. a local stand-in
+        """
+        self._loop = loop or EventLoopThread.shared()
+        self._connector = connector
+        self.async_connector = self._loop.run(self._create_async_connector(connector, client))
+        self.timeout = timeout
+
+    @staticmethod
+    async def _create_async_connector(connector: SupabaseConnector, client: Optional[Any]) -> AsyncSupabaseConnector:
+        # Create the pooled client on the loop that will use it
+        return AsyncSupabaseConnector(connector, client)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("_connector", "async_connector"):
+            raise AttributeError(name)
+        attr = getattr(self.async_connector, name)
+        if not self.async_connector.is_async() or not inspect.iscoroutinefunction(attr):
+            return getattr(self._connector, name)
+
+        def call(*args, **kwargs):
+            with timed(f"connector.{name}"):
+                return self._loop.run(attr(*args, **kwargs), self.timeout)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
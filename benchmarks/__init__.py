@@ -0,0 +1 @@
+"""Benchmarks and local stand-ins for measuring the job portal's data paths."""
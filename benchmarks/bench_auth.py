@@ -0,0 +1,108 @@
+"""
+Measure what checking a Clerk session costs with local JWT verification.
+
+Signs session tokens with a throwaway RSA key whose JWKS is served from
+memory, then times the first verification of each token (a signature
+check), repeated checks of the same token (the claims cache, the cost on
+every rerun) and a key rotation. The demo sign-in this replaces slept for
+two seconds.
+
+Usage:
+    python -m benchmarks.bench_auth --users 200 --repeats 20
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from clerk_jwt import JWKSCache, SessionVerifier
+
+ISSUER = "https://clerk.jobwave.example"
+ORIGIN = "https://jobwave.example"
+
+
+def _signing_key(kid: str):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update(kid=kid, use="sig", alg="RS256")
+    return key, jwk
+
+
+def _token(key, kid: str, number: int) -> str:
+    now = int(time.time())
+    claims = {
+        "sub": f"user_{number}",
+        "sid": f"sess_{number}",
+        "iat": now,
+        "exp": now + 60,
+        "iss": ISSUER,
+        "azp": ORIGIN,
+        "metadata": {"role": "employer" if number % 5 == 0 else "jobseeker"},
+    }
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+
+def _median_us(timings: List[float]) -> float:
+    return round(statistics.median(timings) * 1e6, 1)
+
+
+def run(users: int, repeats: int) -> Dict[str, Any]:
+    key, jwk = _signing_key("key-1")
+    document = {"keys": [jwk]}
+    fetches = []
+
+    def fetch(url: str) -> Dict[str, Any]:
+        fetches.append(url)
+        return document
+
+    verifier = SessionVerifier(
+        JWKSCache("memory://jwks", fetch=fetch, min_refresh_interval=0.0),
+        issuer=ISSUER,
+        authorized_parties=[ORIGIN],
+    )
+    tokens = [_token(key, "key-1", number) for number in range(users)]
+
+    first, cached = [], []
+    for token in tokens:
+        start = time.perf_counter()
+        verifier.verify(token)
+        first.append(time.perf_counter() - start)
+    for _ in range(repeats):
+        for token in tokens:
+            start = time.perf_counter()
+            verifier.verify(token)
+            cached.append(time.perf_counter() - start)
+
+    rotated_key, rotated_jwk = _signing_key("key-2")
+    document["keys"] = [jwk, rotated_jwk]
+    start = time.perf_counter()
+    verifier.verify(_token(rotated_key, "key-2", users))
+    rotation = time.perf_counter() - start
+
+    return {
+        "benchmark": "auth",
+        "users": users,
+        "repeats": repeats,
+        "demo_sign_in_ms": 2000.0,
+        "first_verify_median_us": _median_us(first),
+        "cached_verify_median_us": _median_us(cached),
+        "key_rotation_verify_us": round(rotation * 1e6, 1),
+        "jwks_fetches": len(fetches),
+        "verifier": verifier.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.users, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
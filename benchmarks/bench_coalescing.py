@@ -0,0 +1,117 @@
+"""
+Measure how concurrent sessions asking for the same listing share one request.
+
+Many sessions open the same popular page at the same moment, on a cold
+cache. Each round starts that many threads at a barrier, and every thread
+asks the connector for the first page of the same job listing. Coalesced,
+the calls go through the connector, whose query cache lets one load
+run and the other callers wait for its result. Uncoalesced, every thread
+runs the page query itself, as each session did before. Through the
+facade, the calls run as coroutines of the async connector on the
+shared event loop, over the async stand-in. Reports the requests each
+round sent to the stand-in and how long the slowest caller waited.
+
+Usage:
+    python -m benchmarks.bench_coalescing --sessions 1 8 32 --rounds 10 --latency 0.05
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from async_supabase_connector import AsyncConnectorFacade
+from benchmarks.sqlite_postgrest import SCALES, AsyncSqlitePostgrestClient, SqlitePostgrestClient, seeded_database
+from projections import JOB_CARD_FIELDS
+from supabase_connector import SupabaseConnector
+
+LISTING = {"location": "Remote", "job_type": "Full-time"}
+
+
+def _round(db: SupabaseConnector, client: SqlitePostgrestClient, sessions: int, call: Callable[[], Any]) -> Dict[str, float]:
+    db.invalidate_cache()
+    client.reset_stats()
+    barrier = threading.Barrier(sessions)
+    waits: List[float] = []
+
+    def session() -> None:
+        barrier.wait()
+        start = time.perf_counter()
+        call()
+        waits.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"requests": client.requests, "slowest": max(waits)}
+
+
+def _summary(rounds: List[Dict[str, float]]) -> Dict[str, float]:
+    return {
+        "requests_per_round": statistics.mean(result["requests"] for result in rounds),
+        "slowest_caller_median_ms": round(statistics.median(result["slowest"] for result in rounds) * 1000, 1),
+    }
+
+
+def run(scale: str, sessions: List[int], rounds: int, latency: float) -> Dict[str, Any]:
+    database = seeded_database(scale)
+    client = SqlitePostgrestClient(database, latency=latency)
+    async_client = AsyncSqlitePostgrestClient(database, latency=latency)
+    with tempfile.TemporaryDirectory() as directory:
+        db = SupabaseConnector(client=client, settings={
+            "WRITE_JOURNAL_PATH": os.path.join(directory, "write_journal.jsonl"),
+            "PORTAL_STATS_RECONCILE_SECONDS": 3600,
+        })
+        # The listing runs without the search index, so each load is the page query alone
+        db.search_refresh_interval = float("inf")
+        # Let the connector's startup requests finish outside the measurement
+        while db.get_portal_stats().as_of is None:
+            time.sleep(0.01)
+        facade = AsyncConnectorFacade(db, client=async_client)
+        _round(db, client, 1, lambda: db.get_jobs_page(LISTING, 20))
+
+        results = {}
+        for count in sessions:
+            coalesced = [_round(db, client, count, lambda: db.get_jobs_page(LISTING, 20)) for _ in range(rounds)]
+            # The uncached page query, as every session ran it before
+            separate = [
+                _round(db, client, count, lambda: db._query_page("jobs", LISTING, 20, None, JOB_CARD_FIELDS))
+                for _ in range(rounds)
+            ]
+            through_facade = [
+                _round(db, async_client, count, lambda: facade.get_jobs_page(LISTING, 20)) for _ in range(rounds)
+            ]
+            results[str(count)] = {
+                "coalesced": _summary(coalesced),
+                "uncoalesced": _summary(separate),
+                "facade": _summary(through_facade),
+            }
+        stats = db.cache_stats()
+        db.write_queue.close()
+    return {
+        "benchmark": "coalescing",
+        "scale": scale,
+        "latency_seconds": latency,
+        "rounds": rounds,
+        "results": results,
+        "query_cache": {name: stats[name] for name in ("hits", "misses", "coalesced")},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round-trip time in seconds")
+    args = parser.parse_args()
+    print(json.dumps(run(args.scale, args.sessions, args.rounds, args.latency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Micro-benchmarks of every SupabaseConnector read and write path.
+
+Runs each connector method, and each job and company filter combination,
+against the SQLite PostgREST stand-in seeded at the given scale. Reads are
+measured cold (caches dropped before every call) and warm; each case also
+reports the round trips and response bytes of one cold call, which is
+where most regressions show up first.
+
+Usage:
+    python -m benchmarks.bench_connector --scale 100k --repeats 20 --latency 0.02
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.sqlite_postgrest import SCALES, SqlitePostgrestClient, seeded_database
+from supabase_connector import SupabaseConnector
+
+JOB_FILTERS = {
+    "none": {},
+    "search": {"search": "Engineer"},
+    "region": {"location": "Europe"},
+    "city": {"location": "Berlin, Germany"},
+    "job_type": {"job_type": "Contract"},
+    "experience": {"experience": "Senior"},
+    "salary": {"salary": "$100K - $150K"},
+    "region_type_salary": {"location": "USA", "job_type": "Full-time", "salary": "$100K - $150K"},
+    "all": {
+        "search": "Developer", "location": "Remote", "job_type": "Full-time",
+        "experience": "Mid Level", "salary": "$50K - $100K",
+    },
+}
+COMPANY_FILTERS = {
+    "none": {},
+    "search": {"search": "Cloud"},
+    "industry": {"industry": "Technology"},
+    "industry_size": {"industry": "Finance", "size": "51-200 employees"},
+}
+CANDIDATE_QUERIES = ["Python", "Python AND AWS", "React OR Vue", "Python AND NOT Java AND Remote"]
+
+
+def _percentiles(timings: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[math.ceil(len(ordered) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def _measure(db: SupabaseConnector, client: SqlitePostgrestClient, call: Callable[[], Any], repeats: int, warm: bool) -> Dict[str, Any]:
+    def reset() -> None:
+        db.invalidate_cache()
+        db.job_cache.discard()
+
+    # One cold call for the wire cost
+    reset()
+    client.reset_stats()
+    call()
+    result = {"requests": client.requests, "response_bytes": client.bytes_sent}
+
+    timings = []
+    for _ in range(repeats):
+        reset()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    result["cold"] = _percentiles(timings)
+
+    if warm:
+        call()
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+        result["warm"] = _percentiles(timings)
+    return result
+
+
+def _cases(db: SupabaseConnector) -> List[Tuple[str, Callable[[], Any], bool]]:
+    """(name, call, whether a warm measurement makes sense) for every case."""
+    _, job_cursor = db.get_jobs_page({}, 20)
+    _, company_cursor = db.get_companies_page({}, 20)
+    profile = db.get_user_profile("user_1")
+    job_ids = [str(i) for i in range(1, 101)]
+
+    cases: List[Tuple[str, Callable[[], Any], bool]] = []
+    for name, filters in JOB_FILTERS.items():
+        cases.append((f"get_jobs[{name}]", lambda f=filters: db.get_jobs(f, limit=50), True))
+        cases.append((f"get_jobs_page[{name}]", lambda f=filters: db.get_jobs_page(f, 20), True))
+    for name, filters in COMPANY_FILTERS.items():
+        cases.append((f"get_companies[{name}]", lambda f=filters: db.get_companies(f, limit=50), True))
+        cases.append((f"get_companies_page[{name}]", lambda f=filters: db.get_companies_page(f, 20), True))
+    for query in CANDIDATE_QUERIES:
+        cases.append((f"search_candidates[{query}]", lambda q=query: db.search_candidates(q), False))
+    cases += [
+        ("get_jobs_page[page_2]", lambda: db.get_jobs_page({}, 20, job_cursor), True),
+        ("get_companies_page[page_2]", lambda: db.get_companies_page({}, 20, company_cursor), True),
+        ("iter_jobs[first_1000]", lambda: sum(1 for _, _ in zip(range(1000), db.iter_jobs(page_size=100))), False),
+        ("iter_companies[first_1000]", lambda: sum(1 for _, _ in zip(range(1000), db.iter_companies(page_size=100))), False),
+        ("get_job", lambda: db.get_job("42"), True),
+        ("get_jobs_by_ids[100]", lambda: db.get_jobs_by_ids(job_ids), True),
+        ("search_jobs[data engineer]", lambda: db.search_jobs("data engineer"), True),
+        ("search_jobs[remote contract]", lambda: db.search_jobs("developer", {"location": "Remote", "job_type": "Contract"}), True),
+        ("recommend_jobs", lambda: db.recommend_jobs(profile), False),
+        ("get_user_profile", lambda: db.get_user_profile("user_1"), False),
+        ("get_applications_by_user", lambda: db.get_applications_by_user("user_1"), True),
+        ("get_portal_stats", lambda: db.get_portal_stats(), False),
+        ("create_application", lambda: db.create_application(
+            {"job_id": 1, "user_id": "user_1", "status": "Application Review", "applied_date": "2024-06-01"}
+        ), False),
+        ("create_job", lambda: db.create_job(
+            {
+                "title": "Benchmark Engineer", "company": "TechData 1", "location": "Remote",
+                "job_type": "Full-time", "salary": "$100K - $120K",
+            }
+        ), False),
+        # Enqueue cost only; the flush runs on the write-behind thread
+        ("save_user_profile", lambda: db.save_user_profile("user_2", {"city": "Oslo"}), False),
+    ]
+    return cases
+
+
+def run(scale: str, repeats: int, latency: float, only: List[str]) -> Dict[str, Any]:
+    source = seeded_database(scale)
+    with tempfile.TemporaryDirectory() as directory:
+        # Write cases change the data, so they run against a copy
+        path = os.path.join(directory, "bench.sqlite3")
+        shutil.copyfile(source, path)
+        client = SqlitePostgrestClient(path, latency=latency)
+        db = SupabaseConnector(client=client, settings={
+            "WRITE_JOURNAL_PATH": os.path.join(directory, "write_journal.jsonl"),
+            "PORTAL_STATS_RECONCILE_SECONDS": 3600,
+        })
+
+        index_seconds = {}
+        for name, refresh in (
+            ("search_index", db.refresh_search_index),
+            ("recommender", db.refresh_recommender),
+            ("candidate_index", db.refresh_candidate_index),
+        ):
+            start = time.perf_counter()
+            refresh(wait=True)
+            index_seconds[name] = round(time.perf_counter() - start, 2)
+        db.portal_stats.reconcile(wait=True)
+
+        results = {}
+        for name, call, warm in _cases(db):
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            results[name] = _measure(db, client, call, repeats, warm)
+        db.write_queue.drain(timeout=10)
+        db.write_queue.close()
+    return {
+        "benchmark": "connector",
+        "scale": scale,
+        "rows": SCALES[scale],
+        "latency_seconds": latency,
+        "repeats": repeats,
+        "index_build_seconds": index_seconds,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--only", nargs="*", default=[], help="Run only cases whose names start with these prefixes")
+    args = parser.parse_args()
+    print(json.dumps(run(args.scale, args.repeats, args.latency, args.only), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Compare the HTML payload and element count of a rerun before and after batched fragments.
+
+Renders the Home counters, the candidate search results, the profile skill
+chips and the recommendation cards the way app.py used to (one indented
+f-string per st.markdown call) and through the fragments module, and times
+rendering with a cold and a warm fragment cache.
+
+Usage:
+    python -m benchmarks.bench_fragments --candidates 20 --jobs 5 --repeats 200
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.synthetic import generate_jobs, generate_profiles
+from fragments import CANDIDATE_CARD, JOB_CARD, STAT_COUNTER, FragmentCache, render_skill_chips, wrap
+from models import Job, Profile
+
+COUNTERS = [("12.4K", "Active Jobs"), ("8.1K", "Job Seekers"), ("2K", "Companies"), ("68%", "Success Rate")]
+SKILLS = ["Python", "JavaScript", "React", "Node.js", "SQL", "AWS", "Docker", "Git"]
+
+
+def _legacy(candidates: List[Tuple[Profile, float]], jobs: List[Job]) -> List[str]:
+    """One string per st.markdown call, as the pages rendered before."""
+    calls = []
+    for value, label in COUNTERS:
+        calls.append(f"""
+                <div class='stat-counter'>
+                    <div class='counter-value'>{value}</div>
+                    <div class='counter-label'>{label}</div>
+                </div>
+                """)
+    for candidate, score in candidates:
+        skills = " ".join(f"<span class='detail-item'>{skill}</span>" for skill in candidate.skills)
+        calls.append(f"""
+                    <div class='card'>
+                        <h3>{candidate.first_name} {candidate.last_name}</h3>
+                        <div>{candidate.experience_level or "Experience not specified"} | {", ".join(p for p in (candidate.city, candidate.country) if p)}</div>
+                        <div class='job-details' style='margin-top: 0.5rem; flex-wrap: wrap;'>{skills}</div>
+                        <div>Match score: {score:.2f}</div>
+                    </div>
+                    """)
+    calls.append("<div style='display: flex; flex-wrap: wrap; gap: 10px; margin-top: 10px;'>")
+    for skill in SKILLS:
+        calls.append(f"""
+                    <div style='background-color: rgba(0, 168, 232, 0.2); padding: 5px 15px; border-radius: 20px; display: flex; align-items: center;'>
+                        <span>{skill}</span>
+                        <span style='margin-left: 5px; cursor: pointer;'>✕</span>
+                    </div>
+                    """)
+    calls.append("</div>")
+    for job in jobs:
+        calls.append(f"""
+                    <div class='job-card'>
+                        <div class='job-title'>{job.title}</div>
+                        <div class='company-name'>{job.company}</div>
+                        <div class='job-details'>
+                            <span class='detail-item'>{job.location}</span>
+                            <span class='detail-item'>{job.job_type}</span>
+                            <span class='detail-item'>{job.salary}</span>
+                        </div>
+                    </div>
+                    """)
+    return calls
+
+
+def _batched(cache: FragmentCache, candidates: List[Tuple[Profile, float]], jobs: List[Job]) -> List[str]:
+    """One string per st.markdown call, as the pages render now."""
+    return [
+        wrap("".join(STAT_COUNTER.render({"value": value, "label": label}) for value, label in COUNTERS), "stat-grid"),
+        cache.render_many(
+            CANDIDATE_CARD,
+            candidates,
+            record_id=lambda match: match[0].user_id,
+            values=lambda match: {
+                "first_name": match[0].first_name,
+                "last_name": match[0].last_name,
+                "experience": match[0].experience_level or "Experience not specified",
+                "place": ", ".join(p for p in (match[0].city, match[0].country) if p),
+                "skills": render_skill_chips(match[0].skills),
+                "score": f"{match[1]:.2f}",
+            },
+        ),
+        render_skill_chips(SKILLS, "skill-chips"),
+        cache.render_many(
+            JOB_CARD,
+            jobs,
+            record_id=lambda job: job.id,
+            values=lambda job: {
+                "logo": "", "title": job.title, "company": job.company, "location": job.location,
+                "job_type": job.job_type, "salary": job.salary,
+            },
+        ),
+    ]
+
+
+def _time(render: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+    return {"median_us": round(statistics.median(timings) * 1e6, 1)}
+
+
+def _payload(calls: List[str]) -> Dict[str, int]:
+    return {"elements": len(calls), "bytes": sum(len(call.encode("utf-8")) for call in calls)}
+
+
+def run(candidates: int, jobs: int, repeats: int) -> Dict[str, Any]:
+    matches = [(Profile.from_row(row), 1.0 / (i + 1)) for i, row in enumerate(generate_profiles(candidates))]
+    job_records = [Job.from_row(row) for row in generate_jobs(jobs)]
+
+    legacy = _payload(_legacy(matches, job_records))
+    batched = _payload(_batched(FragmentCache(), matches, job_records))
+    warm_cache = FragmentCache()
+    _batched(warm_cache, matches, job_records)
+    return {
+        "benchmark": "fragments",
+        "candidates": candidates,
+        "jobs": jobs,
+        "legacy": {**legacy, **_time(lambda: _legacy(matches, job_records), repeats)},
+        "batched_cold": {**batched, **_time(lambda: _batched(FragmentCache(), matches, job_records), repeats)},
+        "batched_warm": {**batched, **_time(lambda: _batched(warm_cache, matches, job_records), repeats)},
+        "bytes_saved_pct": round(100 * (1 - batched["bytes"] / legacy["bytes"]), 1),
+        "elements_saved": legacy["elements"] - batched["elements"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.candidates, args.jobs, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
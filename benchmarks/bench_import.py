@@ -0,0 +1,89 @@
+"""
+Measure bulk import throughput and memory against the fake PostgREST client.
+
+Writes a synthetic JSON Lines feed, then imports it at several concurrency
+levels with simulated round-trip latency and a share of transient failures.
+
+Usage:
+    python -m benchmarks.bench_import --rows 20000 --latency 0.2 --concurrency 1 4 8
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import tracemalloc
+from typing import Any, Dict, List
+
+from benchmarks.fake_postgrest import FakePostgrestClient
+from benchmarks.synthetic import generate_jobs
+from job_import import CONFLICT_KEY, JobImporter, read_rows
+
+
+class TransientError(Exception):
+    """Simulated 503 from the API gateway."""
+
+    code = "503"
+
+
+def _write_feed(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for job in generate_jobs(rows):
+            feed_row = {key: value for key, value in job.items() if key not in ("id", "region", "country_code")}
+            handle.write(json.dumps(feed_row) + "\n")
+
+
+def run(rows: int, latency: float, levels: List[int], batch_size: int, failure_rate: float) -> Dict[str, Any]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "feed.jsonl")
+        _write_feed(path, rows)
+        rng = random.Random(0)
+        for concurrency in levels:
+            client = FakePostgrestClient({"jobs": []}, latency=latency)
+
+            def upsert(batch):
+                if rng.random() < failure_rate:
+                    raise TransientError("Service unavailable")
+                client.table("jobs").upsert(batch, on_conflict=CONFLICT_KEY).execute()
+
+            importer = JobImporter(upsert, batch_size=batch_size, concurrency=concurrency, base_delay=0.05)
+            summary = importer.run(read_rows(path)).as_dict()
+            summary.pop("errors")
+            summary["rows_in_table"] = len(client.tables["jobs"])
+            results[str(concurrency)] = summary
+
+        # Peak memory of the pipeline alone, with batches serialized and dropped
+        memory = {}
+        for size in (rows // 4, rows):
+            _write_feed(path, size)
+            importer = JobImporter(lambda batch: json.dumps(batch), batch_size=batch_size, concurrency=max(levels))
+            tracemalloc.start()
+            importer.run(read_rows(path))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory[str(size)] = peak
+    return {
+        "benchmark": "import",
+        "rows": rows,
+        "latency_seconds": latency,
+        "batch_size": batch_size,
+        "failure_rate": failure_rate,
+        "results": results,
+        "peak_traced_bytes": memory,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.latency, args.concurrency, args.batch_size, args.failure_rate), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Measure what company logos add to a listing page, full-size uploads versus card variants.
+
+Generates synthetic logo uploads: flat-colour PNG artwork and JPEG photos
+of the kind employers export from design tools and phones. A listing
+page shows a card per job, with companies repeating across jobs. Before,
+each card embeds the company's upload as sent. After, each card embeds
+the card variant made by LogoPipeline. Reports bytes per page for both,
+the time the rerun thread spends submitting an upload, the time to
+process one in the background, and how thumbnail lookups hit the LRU
+when the page is rendered again.
+
+Usage:
+    python -m benchmarks.bench_logos --companies 20 --page-size 20 --renders 50
+"""
+import argparse
+import base64
+import io
+import json
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from blob_store import LocalBlobStore
+from fragments import JOB_CARD, render_logo
+from logo_pipeline import LOGO_VARIANTS, LogoPipeline, variant_format, variant_key
+from write_behind import WriteTicket
+
+
+def synthetic_logo(number: int, size: int) -> Tuple[bytes, str]:
+    """A logo upload: PNG artwork for even numbers, a JPEG photo for odd ones."""
+    rng = random.Random(number)
+    if number % 2 == 0:
+        image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for _ in range(6):
+            x, y = rng.randrange(size), rng.randrange(size)
+            radius = rng.randrange(size // 8, size // 3)
+            colour = tuple(rng.randrange(256) for _ in range(3)) + (255,)
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=colour)
+        # Antialiased edges, as exported artwork has
+        image = image.filter(ImageFilter.SMOOTH_MORE)
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+        return buffer.getvalue(), f"logo-{number}.png"
+
+    image = Image.effect_noise((size, size), 40).convert("RGB")
+    overlay = Image.linear_gradient("L").resize((size, size)).convert("RGB")
+    image = Image.blend(image, overlay, 0.6)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue(), f"logo-{number}.jpg"
+
+
+def _data_uri(data: bytes, filename: str) -> str:
+    mime = "image/png" if filename.endswith(".png") else "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def _page_bytes(companies: List[str], logos: Dict[str, str], page_size: int) -> int:
+    """Size of a page of job cards, with companies taking turns."""
+    html = "".join(
+        JOB_CARD.render({
+            "logo": render_logo(logos[companies[i % len(companies)]], companies[i % len(companies)]),
+            "title": f"Job {i}",
+            "company": companies[i % len(companies)],
+            "location": "Remote",
+            "job_type": "Full-time",
+            "salary": "$100K - $120K",
+        })
+        for i in range(page_size)
+    )
+    return len(html.encode("utf-8"))
+
+
+def run(companies: int, page_size: int, size: int, renders: int) -> Dict[str, Any]:
+    uploads = [synthetic_logo(i, size) for i in range(companies)]
+    names = [f"Company {i}" for i in range(companies)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalBlobStore(directory)
+        pipeline = LogoPipeline(store, lambda owner_id, result: WriteTicket.completed(), max_thumbnails=companies)
+
+        submits, processing, jobs = [], [], []
+        for i, (data, filename) in enumerate(uploads):
+            start = time.perf_counter()
+            job = pipeline.submit(f"owner_{i}", io.BytesIO(data), filename)
+            submits.append(time.perf_counter() - start)
+            job.wait()
+            processing.append(time.perf_counter() - start)
+            jobs.append(job)
+
+        # Later renders find the card variants in the LRU
+        started = time.perf_counter()
+        for _ in range(renders):
+            thumbnails = {name: pipeline.thumbnail(job.key) for name, job in zip(names, jobs)}
+        lookup = (time.perf_counter() - started) / max(renders * companies, 1)
+        variant_bytes = {
+            variant: statistics.mean(len(store.read(variant_key(job.key, variant))) for job in jobs)
+            for variant in LOGO_VARIANTS
+        }
+        stats = pipeline.stats()
+        pipeline.shutdown()
+
+    originals = {name: _data_uri(data, filename) for name, (data, filename) in zip(names, uploads)}
+    before = _page_bytes(names, originals, page_size)
+    after = _page_bytes(names, thumbnails, page_size)
+    return {
+        "benchmark": "logos",
+        "companies": companies,
+        "page_size": page_size,
+        "upload_px": size,
+        "variant_format": variant_format()[0],
+        "upload_kb_mean": round(statistics.mean(len(data) for data, _ in uploads) / 1024, 1),
+        "variant_kb_mean": {variant: round(value / 1024, 2) for variant, value in variant_bytes.items()},
+        "page_kb_before": round(before / 1024, 1),
+        "page_kb_after": round(after / 1024, 1),
+        "page_reduction": round(before / after, 1),
+        "rerun_submit_median_ms": round(statistics.median(submits) * 1000, 3),
+        "processing_median_ms": round(statistics.median(processing) * 1000, 1),
+        "thumbnail_lookup_us": round(lookup * 1e6, 2),
+        "failed": sum(job.status == "failed" for job in jobs),
+        "pipeline": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=20, help="Job cards per listing page")
+    parser.add_argument("--size", type=int, default=1200, help="Side of the uploaded logos in pixels")
+    parser.add_argument("--renders", type=int, default=50, help="Page renders timed for thumbnail lookups")
+    args = parser.parse_args()
+    print(json.dumps(run(args.companies, args.page_size, args.size, args.renders), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare payload bytes and latency of select("*") against projected selects.
+
+Usage:
+    python -m benchmarks.bench_projection --rows 10000 --page-size 50
+"""
+import argparse
+import json
+import math
+import statistics
+import time
+from typing import Any, Dict
+
+from benchmarks.fake_postgrest import FakePostgrestClient
+from benchmarks.synthetic import generate_applications, generate_jobs, generate_profiles
+from projections import APPLICATION_ROW_FIELDS, JOB_CARD_FIELDS, JOB_DETAIL_FIELDS
+
+
+def _measure(client: FakePostgrestClient, build_query, repeats: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build_query().execute()
+        timings.append(time.perf_counter() - start)
+    return {
+        "payload_bytes": client.last_payload_bytes,
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(sorted(timings)[math.ceil(len(timings) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def run(rows: int, page_size: int, repeats: int, latency: float, bandwidth: float) -> Dict[str, Any]:
+    jobs = generate_jobs(rows)
+    profiles = generate_profiles(max(rows // 100, 1))
+    applications = generate_applications(rows, jobs=rows, profiles=len(profiles))
+    client = FakePostgrestClient(
+        {"jobs": jobs, "profiles": profiles, "applications": applications},
+        latency=latency,
+        bandwidth=bandwidth or None,
+    )
+    user_id = applications[0]["user_id"]
+
+    cases = {
+        "jobs_list_select_star": lambda: client.table("jobs").select("*").order("posted_at", desc=True).limit(page_size),
+        "jobs_list_card_fields": lambda: client.table("jobs").select(JOB_CARD_FIELDS).order("posted_at", desc=True).limit(page_size),
+        "job_detail_select_star": lambda: client.table("jobs").select("*").eq("id", 1).limit(1),
+        "job_detail_fields": lambda: client.table("jobs").select(JOB_DETAIL_FIELDS).eq("id", 1).limit(1),
+        "applications_select_star_embed": lambda: client.table("applications").select("*, jobs(*)").eq("user_id", user_id),
+        "applications_row_fields": lambda: client.table("applications").select(APPLICATION_ROW_FIELDS).eq("user_id", user_id),
+    }
+    results = {name: _measure(client, build, repeats) for name, build in cases.items()}
+
+    for view, star, projected in (
+        ("jobs_list", "jobs_list_select_star", "jobs_list_card_fields"),
+        ("applications", "applications_select_star_embed", "applications_row_fields"),
+    ):
+        results[f"{view}_bytes_saved_pct"] = round(
+            100 * (1 - results[projected]["payload_bytes"] / max(results[star]["payload_bytes"], 1)), 1
+        )
+
+    return {
+        "benchmark": "projection",
+        "rows": rows,
+        "page_size": page_size,
+        "repeats": repeats,
+        "latency_s": latency,
+        "bandwidth_bps": bandwidth,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated round trip in seconds")
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="simulated bytes per second (0 = unlimited)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.page_size, args.repeats, args.latency, args.bandwidth), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure fitting and scoring time of the job recommender.
+
+Usage:
+    python -m benchmarks.bench_recommendations --jobs 100000 --candidates 1000
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict
+
+from benchmarks.synthetic import generate_jobs, generate_profiles
+from recommendations import JobRecommender
+
+
+SALARY_EXPECTATIONS = ["$40K - $60K", "$60K - $80K", "$80K - $100K", "$100K - $120K", "$120K - $150K", "$150K+"]
+
+
+def run(jobs: int, candidates: int, k: int, repeats: int) -> Dict[str, Any]:
+    rows = generate_jobs(jobs)
+    profiles = generate_profiles(candidates)
+    for i, profile in enumerate(profiles):
+        profile["salary_expectation"] = SALARY_EXPECTATIONS[i % len(SALARY_EXPECTATIONS)]
+
+    started = time.perf_counter()
+    recommender = JobRecommender().fit(rows)
+    fit_seconds = time.perf_counter() - started
+
+    single = []
+    for i in range(repeats):
+        profile = profiles[i % len(profiles)]
+        started = time.perf_counter()
+        recommender.recommend(profile, k)
+        single.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    recommender.recommend_batch(profiles, k)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "benchmark": "recommendations",
+        "jobs": jobs,
+        "candidates": candidates,
+        "k": k,
+        "fit_seconds": round(fit_seconds, 2),
+        "matrix_nnz": int(recommender._matrix.nnz),
+        "single_ms": {
+            "median": round(statistics.median(single), 2),
+            "p95": round(sorted(single)[int(0.95 * (len(single) - 1))], 2),
+        },
+        "batch_seconds": round(batch_seconds, 2),
+        "batch_candidates_per_second": round(candidates / batch_seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jobs, args.candidates, args.k, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
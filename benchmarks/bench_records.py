@@ -0,0 +1,60 @@
+"""
+Measure per-row memory of job dicts, Job records and a columnar JobBatch.
+
+Usage:
+    python -m benchmarks.bench_records --rows 10000 100000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic import generate_jobs
+from models import Job, JobBatch
+from projections import JOB_CARD_FIELDS, project_rows
+
+
+def _allocated(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def run(sizes: List[int]) -> Dict[str, Any]:
+    results = {}
+    for rows in sizes:
+        # Card rows as they come off the wire (fresh strings, like json.loads)
+        payload = json.dumps(project_rows(generate_jobs(rows), JOB_CARD_FIELDS))
+        measurements = {
+            "dict_rows": _allocated(lambda: json.loads(payload)),
+            "job_records": _allocated(lambda: [Job.from_row(row) for row in json.loads(payload)]),
+            "job_batch": _allocated(lambda: JobBatch.from_jobs(json.loads(payload))),
+        }
+        baseline = measurements["dict_rows"]
+        results[str(rows)] = {
+            name: {
+                "total_bytes": size,
+                "bytes_per_row": round(size / rows, 1),
+                "saving_pct": round(100 * (1 - size / baseline), 1),
+            }
+            for name, size in measurements.items()
+        }
+    return {"benchmark": "records", "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), indent=2))
+
+
+if __name__ == "__main__":
+    main()
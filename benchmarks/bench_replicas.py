@@ -0,0 +1,127 @@
+"""
+Show that sessions survive a move between replicas and that throughput grows with replicas.
+
+Each replica is a separate process with its own session store handle,
+as separate Streamlit servers behind a load balancer would have. Users
+sign in through the parent process and every request lands on a random
+replica, which has to restore the user from the shared store before it
+renders a page of job cards after a simulated backend round trip. One in
+ten requests is a new sign-in. Throughput is measured for each replica
+count; with a shared store it should grow about linearly until the
+host's cores are saturated, and no restore should fail. With
+--store memory:// every replica has its own memory, which shows the
+failures the shared store avoids.
+
+Usage:
+    python -m benchmarks.bench_replicas --replicas 1 2 4 8 --duration 5 --latency 0.02
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import generate_jobs
+from fragments import JOB_CARD
+from session_store import open_session_store
+from streamlit_clerk_auth import stable_user_id
+
+
+def _user(number: int) -> Dict[str, Any]:
+    email = f"user{number}@example.com"
+    return {
+        "id": stable_user_id(email),
+        "email_addresses": [{"email_address": email}],
+        "first_name": f"First{number}",
+        "last_name": f"Last{number}",
+        "public_metadata": {"role": "employer" if number % 5 == 0 else "jobseeker"},
+    }
+
+
+def _replica(url: str, session_ids: List[str], jobs: List[Dict[str, Any]], latency: float, start_at: float, duration: float, seed: int, results) -> None:
+    store = open_session_store(url)
+    rng = random.Random(seed)
+    requests = restored = failed = sign_ins = 0
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + duration
+    while time.time() < deadline:
+        if rng.random() < 0.1:
+            store.create_session(_user(rng.randrange(1_000_000)))
+            sign_ins += 1
+        else:
+            user = store.load_session(rng.choice(session_ids))
+            if user is None:
+                failed += 1
+            else:
+                restored += 1
+        # The page's reads, then its render
+        time.sleep(latency)
+        "".join(JOB_CARD.render(job) for job in jobs)
+        requests += 1
+    results.put({"requests": requests, "restored": restored, "failed": failed, "sign_ins": sign_ins})
+
+
+def _run_replicas(url: str, replicas: int, session_ids: List[str], jobs, latency: float, duration: float) -> Dict[str, Any]:
+    results = multiprocessing.Queue()
+    # Start every replica at the same moment, after process startup
+    start_at = time.time() + 1.0
+    processes = [
+        multiprocessing.Process(target=_replica, args=(url, session_ids, jobs, latency, start_at, duration, i, results))
+        for i in range(replicas)
+    ]
+    for process in processes:
+        process.start()
+    # Bounded, so a replica that died doesn't leave the benchmark waiting forever
+    outcomes = [results.get(timeout=start_at - time.time() + duration + 60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    totals = {key: sum(outcome[key] for outcome in outcomes) for key in outcomes[0]}
+    totals["requests_per_second"] = round(totals["requests"] / duration, 1)
+    return totals
+
+
+def run(store: str, replicas: List[int], users: int, duration: float, latency: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        url = store or f"sqlite:///{os.path.join(directory, 'sessions.sqlite3')}"
+        seeding = open_session_store(url)
+        session_ids = [seeding.create_session(_user(number)) for number in range(users)]
+        jobs = [
+            {"logo": "", "title": row["title"], "company": row["company"], "location": row["location"],
+             "job_type": row["job_type"], "salary": row["salary"]}
+            for row in generate_jobs(20)
+        ]
+        results = {count: _run_replicas(url, count, session_ids, jobs, latency, duration) for count in replicas}
+
+    base = results[replicas[0]]["requests_per_second"] / replicas[0]
+    for count, result in results.items():
+        result["scaling_efficiency"] = round(result["requests_per_second"] / (base * count), 2) if base else None
+    return {
+        "benchmark": "replicas",
+        "store": url.split(":", 1)[0],
+        "cpu_count": os.cpu_count(),
+        "users": users,
+        "duration_seconds": duration,
+        "latency_seconds": latency,
+        "replicas": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", default="", help="Session store URL; a temporary SQLite file by default")
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated backend time per page in seconds")
+    args = parser.parse_args()
+    print(json.dumps(run(args.store, args.replicas, args.users, args.duration, args.latency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure what an interaction costs as a full rerun versus a section-only rerun.
+
+For each interaction (toggling the new job form, typing a search, editing
+skills, saving preferences) a headless AppTest session performs it
+repeatedly. The wall time of the AppTest run is the full top-to-bottom
+rerun every interaction used to cost; the section's own timer
+(section.* in the metrics registry) is the work left when the section
+reruns on its own through st.fragment. AppTest always reruns the whole
+script, so the second number is measured inside the first.
+
+Usage:
+    python -m benchmarks.bench_reruns --scale 10k --repeats 10 --latency 0.02
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_sessions import app_secrets, signed_in_app
+from benchmarks.sqlite_postgrest import SCALES, seeded_database
+from instrumentation import REGISTRY
+
+
+def _labelled(widgets, label: str):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+# (name, role, page, section timer, action given the app and the repetition number)
+INTERACTIONS: List[Tuple[str, str, str, str, Callable[[AppTest, int], Any]]] = [
+    ("toggle_post_job_form", "employer", "Home", "section.dashboard_posted_jobs",
+     lambda app, i: _labelled(app.button, "+ Post New Job").click()),
+    ("type_home_search", "jobseeker", "Home", "section.home_search",
+     lambda app, i: _labelled(app.text_input, "Search for jobs").input(f"developer {i}")),
+    ("search_candidates", "employer", "Home", "section.dashboard_candidates",
+     lambda app, i: app.text_input(key="candidate_query").input("Python AND AWS" if i % 2 else "React OR Go")),
+    ("edit_skills", "jobseeker", "Profile", "section.profile_resume",
+     lambda app, i: app.text_input(key="skills_input").input("Python, SQL" if i % 2 else "Go, Rust, AWS")),
+    ("save_preferences", "jobseeker", "Profile", "section.profile_preferences",
+     lambda app, i: _labelled(app.button, "Save Preferences").click()),
+]
+
+
+def _section_totals(name: str) -> Tuple[float, float]:
+    histogram = REGISTRY.histograms().get(name)
+    return (histogram.sum, histogram.count) if histogram is not None else (0.0, 0.0)
+
+
+def _measure(secrets: Dict[str, Any], role: str, page: str, section: str, action, repeats: int, timeout: float) -> Dict[str, Any]:
+    app = signed_in_app(2, role, secrets, timeout)
+    app.query_params["page"] = page
+    app.run()
+
+    full, partial, errors = [], [], []
+    for i in range(repeats):
+        action(app, i)
+        before = _section_totals(section)
+        start = time.perf_counter()
+        app.run()
+        full.append(time.perf_counter() - start)
+        after = _section_totals(section)
+        if after[1] > before[1]:
+            partial.append((after[0] - before[0]) / (after[1] - before[1]))
+        errors.extend(exception.message for exception in app.exception)
+
+    full_ms = statistics.median(full) * 1000
+    section_ms = statistics.median(partial) * 1000 if partial else None
+    return {
+        "full_rerun_median_ms": round(full_ms, 1),
+        "section_rerun_median_ms": round(section_ms, 1) if section_ms is not None else None,
+        "speedup": round(full_ms / section_ms, 1) if section_ms else None,
+        "errors": errors[:5],
+    }
+
+
+def run(scale: str, repeats: int, latency: float, timeout: float) -> Dict[str, Any]:
+    source = seeded_database(scale)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        shutil.copyfile(source, path)
+        secrets = {**app_secrets(path, directory, latency), "METRICS_SAMPLE_RATE": 1.0}
+        results = {
+            name: _measure(secrets, role, page, section, action, repeats, timeout)
+            for name, role, page, section, action in INTERACTIONS
+        }
+    return {
+        "benchmark": "reruns",
+        "scale": scale,
+        "rows": SCALES[scale],
+        "latency_seconds": latency,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds a single rerun may take")
+    args = parser.parse_args()
+    print(json.dumps(run(args.scale, args.repeats, args.latency, args.timeout), indent=2))
+
+
+if __name__ == "__main__":
+    main()
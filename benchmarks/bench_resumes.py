@@ -0,0 +1,115 @@
+"""
+Measure what a resume upload costs the rerun thread, inline versus through the pipeline.
+
+Builds synthetic DOCX resumes of a few hundred paragraphs, then handles
+them in two ways. Inline, each rerun stores, extracts and parses the
+file the way an upload handler on the script thread would. Through
+ResumePipeline, the rerun only submits the upload, and storage and
+parsing happen on the upload threads and worker processes. Reports
+per-upload rerun time for both, the pipeline's end-to-end time, and
+how many uploads the content digest deduplicated.
+
+Usage:
+    python -m benchmarks.bench_resumes --uploads 40 --paragraphs 400 --workers 2
+"""
+import argparse
+import io
+import json
+import random
+import statistics
+import tempfile
+import time
+import zipfile
+from typing import Any, Dict, List
+
+from blob_store import LocalBlobStore, iter_chunks
+from resume_pipeline import RESUME_NAMESPACE, SKILL_VOCABULARY, ResumePipeline, extract_resume
+from write_behind import WriteTicket
+
+WORDS = ["delivered", "designed", "team", "platform", "customers", "latency", "migrated", "services", "owned", "roadmap"]
+
+
+def synthetic_docx(number: int, paragraphs: int) -> bytes:
+    """A DOCX resume with random prose and a sprinkling of skills."""
+    rng = random.Random(number)
+    body = []
+    for _ in range(paragraphs):
+        words = rng.choices(WORDS, k=20) + rng.sample(SKILL_VOCABULARY, 2)
+        rng.shuffle(words)
+        body.append(f"<w:p><w:r><w:t>{' '.join(words)}, {rng.randint(1, 15)} years</w:t></w:r></w:p>")
+    document = (
+        '<?xml version="1.0"?><w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{''.join(body)}</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def _inline(store: LocalBlobStore, files: List[bytes]) -> List[float]:
+    timings = []
+    for data in files:
+        start = time.perf_counter()
+        blob = store.put_stream(RESUME_NAMESPACE, iter_chunks(io.BytesIO(data)), ".docx")
+        extract_resume(store.local_path(blob.key))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(uploads: int, paragraphs: int, workers: int, duplicates: float) -> Dict[str, Any]:
+    unique = max(int(uploads * (1 - duplicates)), 1)
+    documents = [synthetic_docx(i, paragraphs) for i in range(unique)]
+    files = [documents[i % unique] for i in range(uploads)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        inline = _inline(LocalBlobStore(f"{directory}/inline"), files)
+
+        pipeline = ResumePipeline(
+            LocalBlobStore(f"{directory}/pipeline"),
+            lambda user_id, result: WriteTicket.completed(),
+            max_workers=workers,
+            max_bytes=64 << 20
+        )
+        # Start the worker processes outside the measurement
+        pipeline.submit("warm-up", io.BytesIO(synthetic_docx(-1, 1)), "warm-up.docx").wait()
+
+        submits, jobs = [], []
+        started = time.perf_counter()
+        for i, data in enumerate(files):
+            start = time.perf_counter()
+            jobs.append(pipeline.submit(f"user_{i}", io.BytesIO(data), f"resume-{i}.docx"))
+            submits.append(time.perf_counter() - start)
+        for job in jobs:
+            job.wait()
+        elapsed = time.perf_counter() - started
+        stats = pipeline.stats()
+        pipeline.shutdown()
+
+    return {
+        "benchmark": "resumes",
+        "uploads": uploads,
+        "unique_files": unique,
+        "file_kb": round(statistics.mean(len(data) for data in documents) / 1024, 1),
+        "workers": workers,
+        "inline_rerun_median_ms": round(statistics.median(inline) * 1000, 2),
+        "pipeline_rerun_median_ms": round(statistics.median(submits) * 1000, 3),
+        "inline_total_seconds": round(sum(inline), 2),
+        "pipeline_total_seconds": round(elapsed, 2),
+        "failed": sum(job.status == "failed" for job in jobs),
+        "pipeline": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--paragraphs", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--duplicates", type=float, default=0.25, help="Share of uploads repeating an earlier file")
+    args = parser.parse_args()
+    print(json.dumps(run(args.uploads, args.paragraphs, args.workers, args.duplicates), indent=2))
+
+
+if __name__ == "__main__":
+    main()
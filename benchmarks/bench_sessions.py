@@ -0,0 +1,184 @@
+"""
+Drive concurrent headless user sessions through the app with Streamlit's AppTest.
+
+Each simulated user signs in (the auth form is skipped by seeding session
+state), then repeatedly opens Home, the role's Applications or Dashboard
+page and Profile through the ?page= deep link. Sessions run on threads in
+one process, sharing the cached connector the way sessions of one server
+do, against the SQLite PostgREST stand-in. Reports rerun latency per page,
+throughput, failures and the connector's per-operation latencies as JSON.
+
+Usage:
+    python -m benchmarks.bench_sessions --scale 100k --sessions 20 --iterations 5 --latency 0.02
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import streamlit as st
+from streamlit.runtime.secrets import Secrets
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.sqlite_postgrest import SCALES, seeded_database
+from instrumentation import REGISTRY
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+PAGES = {
+    "jobseeker": ["Home", "Applications", "Profile"],
+    "employer": ["Home", "Dashboard", "Profile"],
+}
+
+
+def _user(number: int, role: str) -> Dict[str, Any]:
+    """A signed-in user as streamlit_clerk_auth keeps it in session state."""
+    return {
+        "id": f"user_{number}",
+        "email_addresses": [{"email_address": f"user{number}@example.com"}],
+        "first_name": f"First{number}",
+        "last_name": f"Last{number}",
+        "public_metadata": {"role": role},
+    }
+
+
+def app_secrets(database: str, directory: str, latency: float) -> Dict[str, Any]:
+    """Secrets pointing the app at a stand-in database, with state files under directory."""
+    # create_client reads the simulated latency from the environment
+    os.environ["BENCH_LATENCY"] = str(latency)
+    return {
+        "SUPABASE_URL": f"sqlite:///{database}",
+        "SUPABASE_KEY": "local",
+        "SUPABASE_CLIENT_FACTORY": "benchmarks.sqlite_postgrest:create_client",
+        "SUPABASE_ASYNC_CLIENT_FACTORY": "benchmarks.sqlite_postgrest:create_async_client",
+        "WRITE_JOURNAL_PATH": os.path.join(directory, "write_journal.jsonl"),
+        "LOTTIE_OFFLINE": True,
+    }
+
+
+def signed_in_app(number: int, role: str, secrets: Dict[str, Any], timeout: float) -> AppTest:
+    """A headless session of the app, already signed in as user_<number>."""
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    app.secrets.update(secrets)
+    app.session_state["authenticated"] = True
+    app.session_state["user"] = _user(number, role)
+    return app
+
+
+def _session(number: int, role: str, secrets: Dict[str, Any], iterations: int, think: float, timeout: float) -> Dict[str, Any]:
+    app = signed_in_app(number, role, secrets, timeout)
+
+    timings: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    for _ in range(iterations):
+        for page in PAGES[role]:
+            app.query_params["page"] = page
+            start = time.perf_counter()
+            try:
+                app.run()
+            except Exception as e:
+                errors.append(f"{page}: {e}")
+                continue
+            timings.setdefault(page, []).append(time.perf_counter() - start)
+            if app.exception:
+                errors.extend(f"{page}: {exception.message}" for exception in app.exception)
+            if think:
+                time.sleep(think)
+    return {"timings": timings, "errors": errors}
+
+
+def _summary(timings: List[float]) -> Dict[str, Any]:
+    ordered = sorted(timings)
+    return {
+        "reruns": len(ordered),
+        "median_ms": round(statistics.median(ordered) * 1000, 1),
+        "p95_ms": round(ordered[math.ceil(len(ordered) * 0.95) - 1] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+def run(scale: str, sessions: int, iterations: int, latency: float, think: float, employers: float, timeout: float) -> Dict[str, Any]:
+    source = seeded_database(scale)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        shutil.copyfile(source, path)
+        secrets = app_secrets(path, directory, latency)
+
+        roles = ["employer" if i < sessions * employers else "jobseeker" for i in range(sessions)]
+        # Warm the process-wide resources once, as a running server would have
+        _session(1, "jobseeker", secrets, 1, 0.0, timeout)
+
+        # AppTest swaps the process-wide st.secrets for each run and puts back the
+        # one it found, so a session finishing first could leave the others none
+        saved_secrets = st.secrets
+        st.secrets = Secrets()
+        st.secrets._secrets = secrets
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="session") as pool:
+                futures = [
+                    pool.submit(_session, i + 1, role, secrets, iterations, think, timeout)
+                    for i, role in enumerate(roles)
+                ]
+                outcomes = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+        finally:
+            st.secrets = saved_secrets
+
+    pages: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    for outcome in outcomes:
+        for page, timings in outcome["timings"].items():
+            pages.setdefault(page, []).extend(timings)
+        errors.extend(outcome["errors"])
+    reruns = sum(len(timings) for timings in pages.values())
+    operations = {
+        name: {
+            "calls": round(histogram.count),
+            "p50_ms": round(histogram.quantile(0.5) * 1000, 2),
+            "p95_ms": round(histogram.quantile(0.95) * 1000, 2),
+        }
+        for name, histogram in sorted(REGISTRY.histograms().items())
+        if name.startswith("connector.")
+    }
+    return {
+        "benchmark": "sessions",
+        "scale": scale,
+        "rows": SCALES[scale],
+        "sessions": sessions,
+        "iterations": iterations,
+        "latency_seconds": latency,
+        "think_seconds": think,
+        "threads": threading.active_count(),
+        "elapsed_seconds": round(elapsed, 2),
+        "reruns_per_second": round(reruns / elapsed, 1) if elapsed else 0.0,
+        "pages": {page: _summary(timings) for page, timings in sorted(pages.items())},
+        "errors": errors[:20],
+        "error_count": len(errors),
+        "connector_operations": operations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--think", type=float, default=0.0, help="Seconds a user waits between page views")
+    parser.add_argument("--employers", type=float, default=0.2, help="Share of sessions signed in as employers")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds a single rerun may take")
+    args = parser.parse_args()
+    result = run(args.scale, args.sessions, args.iterations, args.latency, args.think, args.employers, args.timeout)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Profile the app's cold start: import cost per module and time to first paint.
+
+Import costs come from python -X importtime in a fresh interpreter. The
+app's module-level imports are read from app.py, and each one is charged
+only for the modules it loads first, so the numbers add up to the
+import bill of a cold start. The modules the app defers to first use are
+listed separately with what they would add.
+
+Time to first paint is measured in another fresh interpreter. It runs
+the app headless with AppTest for an anonymous visitor, then for a
+signed-in user in mock mode, and reports which heavy modules each run
+loaded.
+
+Budgets make the script usable as a CI check. It exits with status 1 if
+the first paint or the eager import total exceeds them.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --max-first-paint-ms 1500 --max-import-ms 1000
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# Imported by app.py on first use only
+DEFERRED_MODULES = ["supabase_connector", "streamlit_lottie", "streamlit_option_menu", "clerk_jwt"]
+
+# Modules an anonymous first paint should not need
+HEAVY_MODULES = ["supabase", "numpy", "scipy", "jwt", "cryptography", "streamlit_lottie", "streamlit_option_menu"]
+
+
+def app_imports(path: str = APP_PATH) -> List[str]:
+    """The modules app.py imports at module level, in order."""
+    with open(path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def _python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *options, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def _importtime(stderr: str) -> List[Tuple[str, int]]:
+    """Parse -X importtime output into (indented name, cumulative microseconds)."""
+    # Lines are "import time: self [us] | cumulative | imported package"; nesting is shown by indentation
+    loaded = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        loaded.append((name[1:], int(cumulative)))
+    return loaded
+
+
+def import_costs(modules: List[str]) -> Dict[str, Any]:
+    """
+    Import modules in order in a fresh interpreter and charge each for what it loaded first.
+
+    Args:
+        modules: Module names, in import order
+
+    Returns:
+        Milliseconds per module, their total and the heaviest top-level packages
+    """
+    code = "\n".join(f"import {module}" for module in modules)
+    stderr = _python(code, "-X", "importtime").stderr
+    # Modules the interpreter loads before running any code aren't charged
+    startup = {name for name, _ in _importtime(_python("pass", "-X", "importtime").stderr)}
+    loaded = [(name, cumulative) for name, cumulative in _importtime(stderr) if name.strip() not in startup]
+
+    # Each statement's cost is the top-level entries logged since the previous target
+    costs, pending = {}, 0
+    for name, cumulative in loaded:
+        if name.startswith(" "):
+            continue
+        pending += cumulative
+        if name in modules:
+            costs[name] = round(pending / 1000, 1)
+            pending = 0
+    heaviest = sorted(((name, cumulative) for name, cumulative in loaded if not name.startswith(" ")), key=lambda item: -item[1])
+    return {
+        "modules_ms": {module: costs.get(module, 0.0) for module in modules},
+        "total_ms": round(sum(costs.values()), 1),
+        "heaviest_packages_ms": {name: round(cumulative / 1000, 1) for name, cumulative in heaviest[:10]},
+    }
+
+
+def deferred_costs(eager: List[str]) -> Dict[str, float]:
+    """What each deferred module adds once the eager imports are loaded."""
+    costs = {}
+    for module in DEFERRED_MODULES:
+        result = import_costs(eager + [module])
+        costs[module] = result["modules_ms"][module]
+    return costs
+
+
+# Runs in a fresh interpreter; prints one JSON line
+_FIRST_PAINT = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+
+secrets = {"LOTTIE_OFFLINE": True, "WARM_UP_DATABASE": False}
+heavy = %(heavy)r
+
+app = AppTest.from_file(%(app)r, default_timeout=120)
+app.secrets.update(secrets)
+start = time.perf_counter()
+app.run()
+anonymous = time.perf_counter() - start
+anonymous_modules = [m for m in heavy if m in sys.modules]
+
+app = AppTest.from_file(%(app)r, default_timeout=120)
+app.secrets.update(secrets)
+app.session_state["authenticated"] = True
+app.session_state["user"] = {
+    "id": "user_1", "email_addresses": [{"email_address": "user1@example.com"}],
+    "first_name": "First", "last_name": "Last", "public_metadata": {"role": "jobseeker"},
+}
+start = time.perf_counter()
+app.run()
+signed_in = time.perf_counter() - start
+
+print(json.dumps({
+    "import_streamlit_ms": round((imported - started) * 1000, 1),
+    "anonymous_first_paint_ms": round(anonymous * 1000, 1),
+    "anonymous_heavy_modules": anonymous_modules,
+    "signed_in_first_run_ms": round(signed_in * 1000, 1),
+    "signed_in_heavy_modules": [m for m in heavy if m in sys.modules],
+    "exceptions": [e.message for e in app.exception],
+}))
+"""
+
+
+def first_paint() -> Dict[str, Any]:
+    """Time the first anonymous and signed-in runs of the app in a fresh interpreter."""
+    start = time.perf_counter()
+    result = _python(_FIRST_PAINT % {"app": APP_PATH, "heavy": HEAVY_MODULES})
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["process_total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+def run() -> Dict[str, Any]:
+    eager = app_imports()
+    imports = import_costs(eager)
+    return {
+        "benchmark": "startup",
+        "python": sys.version.split()[0],
+        "eager_imports": imports,
+        "deferred_imports_ms": deferred_costs(eager),
+        "first_paint": first_paint(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-first-paint-ms", type=float, help="Fail if the anonymous first paint takes longer")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if the eager imports take longer")
+    args = parser.parse_args()
+
+    result = run()
+    print(json.dumps(result, indent=2))
+
+    failures = []
+    if args.max_first_paint_ms is not None and result["first_paint"]["anonymous_first_paint_ms"] > args.max_first_paint_ms:
+        failures.append(f"first paint {result['first_paint']['anonymous_first_paint_ms']} ms > {args.max_first_paint_ms} ms")
+    if args.max_import_ms is not None and result["eager_imports"]["total_ms"] > args.max_import_ms:
+        failures.append(f"eager imports {result['eager_imports']['total_ms']} ms > {args.max_import_ms} ms")
+    if failures:
+        print("Startup budget exceeded: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+In-memory PostgREST stand-in for benchmarks.
+
+Implements the subset of the supabase-py query builder used by
+SupabaseConnector. Every response is serialized to JSON and parsed back, so
+payload size and decode cost are part of the measurement.
+"""
+import json
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from projections import split_fields
+
+
+class FakeResponse:
+    """Mimics postgrest's APIResponse."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _split_top_level(text: str) -> List[str]:
+    items, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\" and quoted and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and char == "," and depth == 0:
+            items.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    if current:
+        items.append("".join(current))
+    return items
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _coerce(row_value: Any, operand: Any) -> Any:
+    if isinstance(operand, str) and isinstance(row_value, (int, float)) and not isinstance(row_value, bool):
+        try:
+            return float(operand)
+        except ValueError:
+            return operand
+    if isinstance(row_value, str) and not isinstance(operand, str):
+        return str(operand)
+    return operand
+
+
+def _like(pattern: str, flags: int) -> "re.Pattern":
+    return re.compile("^" + ".*".join(re.escape(part) for part in pattern.split("%")) + "$", flags | re.DOTALL)
+
+
+def _predicate(column: str, op: str, operand: Any) -> Callable[[Dict[str, Any]], bool]:
+    if op in ("like", "ilike"):
+        regex = _like(str(operand), re.IGNORECASE if op == "ilike" else 0)
+        return lambda row: row.get(column) is not None and bool(regex.match(str(row[column])))
+    if op == "in":
+        values = set(operand)
+        return lambda row: row.get(column) in values or str(row.get(column)) in {str(v) for v in values}
+    if op == "is":
+        return lambda row: row.get(column) is None if str(operand) == "null" else row.get(column) == operand
+
+    compare = {
+        "eq": lambda a, b: a == b,
+        "neq": lambda a, b: a != b,
+        "lt": lambda a, b: a < b,
+        "lte": lambda a, b: a <= b,
+        "gt": lambda a, b: a > b,
+        "gte": lambda a, b: a >= b,
+    }[op]
+
+    def check(row):
+        value = row.get(column)
+        if value is None:
+            return False
+        return compare(value, _coerce(value, operand))
+    return check
+
+
+def _parse_logic(expression: str, conjunction: str) -> Callable[[Dict[str, Any]], bool]:
+    """Parse the body of a PostgREST or=(...)/and=(...) filter."""
+    parts = []
+    for item in _split_top_level(expression):
+        if item.startswith(("and(", "or(")):
+            name, inner = item.split("(", 1)
+            parts.append(_parse_logic(inner[:-1], name))
+            continue
+        column, op, value = item.split(".", 2)
+        if op == "in":
+            operand = [_unquote(v) for v in _split_top_level(value[1:-1])]
+        else:
+            operand = _unquote(value)
+        parts.append(_predicate(column, op, operand))
+
+    if conjunction == "or":
+        return lambda row: any(p(row) for p in parts)
+    return lambda row: all(p(row) for p in parts)
+
+
+class FakeQuery:
+    """Chainable query builder over one in-memory table."""
+
+    def __init__(self, client: "FakePostgrestClient", table: str):
+        self.client = client
+        self.table_name = table
+        self.fields = "*"
+        self.count_mode = None
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.ordering: List[tuple] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+        self.single_row = False
+        self.mutation: Optional[tuple] = None
+
+    # Reads
+    def select(self, fields: str = "*", count: Optional[str] = None) -> "FakeQuery":
+        self.fields = fields.replace(" ", "")
+        self.count_mode = count
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "FakeQuery":
+        self.filters.append(_predicate(column, op, value))
+        return self
+
+    def eq(self, column, value) -> "FakeQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value) -> "FakeQuery":
+        return self._filter(column, "neq", value)
+
+    def lt(self, column, value) -> "FakeQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value) -> "FakeQuery":
+        return self._filter(column, "lte", value)
+
+    def gt(self, column, value) -> "FakeQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value) -> "FakeQuery":
+        return self._filter(column, "gte", value)
+
+    def like(self, column, pattern) -> "FakeQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern) -> "FakeQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def in_(self, column, values) -> "FakeQuery":
+        return self._filter(column, "in", list(values))
+
+    def or_(self, expression: str) -> "FakeQuery":
+        self.filters.append(_parse_logic(expression, "or"))
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **kwargs) -> "FakeQuery":
+        # Postgres puts NULLs first in descending order and last in ascending order by default
+        self.ordering.append((column, desc, desc if nullsfirst is None else nullsfirst))
+        return self
+
+    def limit(self, count: int) -> "FakeQuery":
+        self.limit_count = count
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def single(self) -> "FakeQuery":
+        self.single_row = True
+        return self
+
+    # Writes
+    def insert(self, rows: Any) -> "FakeQuery":
+        self.mutation = ("insert", rows if isinstance(rows, list) else [rows], None)
+        return self
+
+    def upsert(self, rows: Any, on_conflict: str = "id", **kwargs) -> "FakeQuery":
+        self.mutation = ("upsert", rows if isinstance(rows, list) else [rows], on_conflict)
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "FakeQuery":
+        self.mutation = ("update", values, None)
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self.mutation = ("delete", None, None)
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.client._execute(self)
+
+
+class FakePostgrestClient:
+    """
+    Stand-in for a supabase Client backed by in-memory tables.
+
+    Args:
+        tables: Mapping of table name to list of rows
+        latency: Simulated round-trip time in seconds added to every request
+        bandwidth: Simulated bytes per second, or None for unlimited
+    """
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], latency: float = 0.0, bandwidth: Optional[float] = None):
+        self.tables = tables
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.bytes_sent = 0
+        self.last_payload_bytes = 0
+        self._pk_indexes: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.bytes_sent = 0
+        self.last_payload_bytes = 0
+
+    def _execute(self, query: FakeQuery) -> FakeResponse:
+        rows = self.tables.setdefault(query.table_name, [])
+        if query.mutation is not None:
+            data = self._mutate(rows, query)
+            count = None
+        else:
+            matched = [row for row in rows if all(f(row) for f in query.filters)]
+            for column, desc, nullsfirst in reversed(query.ordering):
+                present = sorted((row for row in matched if row.get(column) is not None), key=lambda row: row[column], reverse=desc)
+                missing = [row for row in matched if row.get(column) is None]
+                matched = missing + present if nullsfirst else present + missing
+            count = len(matched) if query.count_mode else None
+            end = None if query.limit_count is None else query.offset + query.limit_count
+            data = [self._project(query.table_name, row, query.fields) for row in matched[query.offset:end]]
+            if query.single_row:
+                data = data[0] if data else None
+        return self._send(data, count)
+
+    def _mutate(self, rows: List[Dict[str, Any]], query: FakeQuery) -> List[Dict[str, Any]]:
+        kind, payload, on_conflict = query.mutation
+        if kind == "insert":
+            rows.extend(dict(row) for row in payload)
+            return payload
+        if kind == "upsert":
+            keys = on_conflict.split(",")
+            index = {tuple(row.get(k) for k in keys): row for row in rows}
+            for new in payload:
+                existing = index.get(tuple(new.get(k) for k in keys))
+                if existing is not None:
+                    existing.update(new)
+                else:
+                    rows.append(dict(new))
+            return payload
+        matched = [row for row in rows if all(f(row) for f in query.filters)]
+        if kind == "update":
+            for row in matched:
+                row.update(payload)
+            return matched
+        self.tables[query.table_name] = [row for row in rows if row not in matched]
+        return matched
+
+    def _project(self, table: str, row: Dict[str, Any], fields: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for item in split_fields(fields):
+            if "(" in item:
+                embed, inner = item[:-1].split("(", 1)
+                foreign_key = embed.rstrip("s") + "_id"
+                target = self._lookup(embed, row.get(foreign_key))
+                result[embed] = self._project(embed, target, inner) if target else None
+            elif item == "*":
+                result.update(row)
+            elif item in row:
+                result[item] = row[item]
+        return result
+
+    def _lookup(self, table: str, key: Any) -> Optional[Dict[str, Any]]:
+        index = self._pk_indexes.get(table)
+        rows = self.tables.get(table, [])
+        if index is None or len(index) != len(rows):
+            index = self._pk_indexes[table] = {row.get("id"): row for row in rows}
+        return index.get(key)
+
+    def _send(self, data: Any, count: Optional[int]) -> FakeResponse:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.requests += 1
+        self.bytes_sent += len(payload)
+        self.last_payload_bytes = len(payload)
+        delay = self.latency + (len(payload) / self.bandwidth if self.bandwidth else 0.0)
+        if delay:
+            time.sleep(delay)
+        return FakeResponse(json.loads(payload), count)
@@ -0,0 +1,688 @@
+"""
+SQLite-backed PostgREST stand-in for load tests.
+
+Implements the same subset of the supabase-py query builder as
+fake_postgrest, but filters, sorts and pages in SQL over indexed tables, so
+databases of a million jobs behave like the real thing: keyset pages walk
+the (posted_at, id) index, counts are COUNT(*) and writes go through ON
+CONFLICT upserts. Every response is serialized to JSON and parsed back,
+so payload size and decode cost are part of the measurement.
+
+Seed a database once and point the app at it through secrets:
+
+    python -m benchmarks.sqlite_postgrest --scale 100k
+
+    SUPABASE_URL = "sqlite:///.cache/bench/100k-seed0.sqlite3"
+    SUPABASE_KEY = "local"
+    SUPABASE_CLIENT_FACTORY = "benchmarks.sqlite_postgrest:create_client"
+    SUPABASE_ASYNC_CLIENT_FACTORY = "benchmarks.sqlite_postgrest:create_async_client"
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from benchmarks.fake_postgrest import FakeResponse, _split_top_level, _unquote
+from benchmarks.synthetic import iter_applications, iter_companies, iter_jobs, iter_profiles
+from projections import split_fields
+
+# Column name -> SQL type; JSON columns hold lists and are stored as text
+SCHEMA: Dict[str, Dict[str, str]] = {
+    "jobs": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "external_key": "TEXT UNIQUE",
+        "title": "TEXT",
+        "company": "TEXT",
+        "location": "TEXT",
+        "region": "TEXT",
+        "country_code": "TEXT",
+        "job_type": "TEXT",
+        "experience_level": "TEXT",
+        "salary": "TEXT",
+        "salary_min": "INTEGER",
+        "salary_max": "INTEGER",
+        "salary_currency": "TEXT",
+        "posted_at": "TEXT",
+        "updated_at": "TEXT",
+        "skills": "JSON",
+        "description": "TEXT",
+    },
+    "companies": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "owner_id": "TEXT UNIQUE",
+        "name": "TEXT",
+        "industry": "TEXT",
+        "location": "TEXT",
+        "company_size": "TEXT",
+        "rating": "TEXT",
+        "open_jobs": "INTEGER",
+        "website": "TEXT",
+        "founded_year": "INTEGER",
+        "description": "TEXT",
+        "logo_key": "TEXT",
+    },
+    "profiles": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "user_id": "TEXT UNIQUE",
+        "first_name": "TEXT",
+        "last_name": "TEXT",
+        "email": "TEXT",
+        "phone": "TEXT",
+        "city": "TEXT",
+        "country": "TEXT",
+        "about": "TEXT",
+        "website": "TEXT",
+        "role": "TEXT",
+        "skills": "JSON",
+        "experience_level": "TEXT",
+        "preferred_titles": "JSON",
+        "preferred_job_types": "JSON",
+        "preferred_locations": "JSON",
+        "salary_expectation": "TEXT",
+        "resume_key": "TEXT",
+    },
+    "applications": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "job_id": "INTEGER",
+        "user_id": "TEXT",
+        "job_title": "TEXT",
+        "company": "TEXT",
+        "status": "TEXT",
+        "applied_date": "TEXT",
+        "next_step": "TEXT",
+    },
+}
+
+# The indexes the production database has for the same queries
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS jobs_posted_at_id ON jobs (posted_at, id)",
+    "CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)",
+    "CREATE INDEX IF NOT EXISTS jobs_region ON jobs (region)",
+    "CREATE INDEX IF NOT EXISTS jobs_job_type ON jobs (job_type)",
+    "CREATE INDEX IF NOT EXISTS companies_name_id ON companies (name, id)",
+    "CREATE INDEX IF NOT EXISTS profiles_role ON profiles (role)",
+    "CREATE INDEX IF NOT EXISTS applications_user_id ON applications (user_id)",
+]
+
+# Rows per table at each named scale; jobs are the scaled dimension
+SCALES = {
+    "10k": {"jobs": 10_000, "companies": 500, "profiles": 2_000, "applications": 10_000},
+    "100k": {"jobs": 100_000, "companies": 2_000, "profiles": 20_000, "applications": 100_000},
+    "1m": {"jobs": 1_000_000, "companies": 20_000, "profiles": 200_000, "applications": 1_000_000},
+}
+
+DEFAULT_DIRECTORY = os.path.join(".cache", "bench")
+
+_COMPARISONS = {"eq": "=", "neq": "<>", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+
+class SqliteAPIError(Exception):
+    """Mimics postgrest's APIError, carrying a Postgres error code."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+class SqliteQuery:
+    """Chainable query builder compiled to one SQL statement on execute."""
+
+    def __init__(self, client: "SqlitePostgrestClient", table: str):
+        self.client = client
+        self.table_name = client._table(table)
+        self.fields = "*"
+        self.count_mode: Optional[str] = None
+        self.where: List[str] = []
+        self.params: List[Any] = []
+        self.ordering: List[str] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+        self.single_row = False
+        self.mutation: Optional[tuple] = None
+
+    # Reads
+    def select(self, fields: str = "*", count: Optional[str] = None) -> "SqliteQuery":
+        self.fields = fields.replace(" ", "")
+        self.count_mode = count
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "SqliteQuery":
+        clause, params = self._condition(column, op, value)
+        self.where.append(clause)
+        self.params.extend(params)
+        return self
+
+    def _condition(self, column: str, op: str, value: Any) -> Tuple[str, List[Any]]:
+        column = self.client._column(self.table_name, column)
+        if op in _COMPARISONS:
+            return f'"{column}" {_COMPARISONS[op]} ?', [value]
+        if op == "ilike":
+            # LIKE is case-insensitive for ASCII, as ilike is
+            return f'"{column}" LIKE ?', [value]
+        if op == "like":
+            return f'"{column}" GLOB ?', [str(value).replace("*", "[*]").replace("?", "[?]").replace("%", "*").replace("_", "?")]
+        if op == "in":
+            values = list(value)
+            if not values:
+                return "0", []
+            return f'"{column}" IN ({",".join("?" * len(values))})', values
+        if op == "is":
+            if value is None or str(value) == "null":
+                return f'"{column}" IS NULL', []
+            return f'"{column}" IS ?', [1 if str(value).lower() == "true" else 0]
+        raise SqliteAPIError(f"Unsupported operator: {op}", "PGRST100")
+
+    def _logic(self, expression: str, conjunction: str) -> Tuple[str, List[Any]]:
+        """Compile the body of a PostgREST or=(...)/and=(...) filter."""
+        clauses, params = [], []
+        for item in _split_top_level(expression):
+            if item.startswith(("and(", "or(")):
+                name, inner = item.split("(", 1)
+                clause, values = self._logic(inner[:-1], name)
+            else:
+                column, op, value = item.split(".", 2)
+                operand: Any = [_unquote(v) for v in _split_top_level(value[1:-1])] if op == "in" else _unquote(value)
+                clause, values = self._condition(column, op, operand)
+            clauses.append(clause)
+            params.extend(values)
+        return "(" + f" {conjunction.upper()} ".join(clauses) + ")", params
+
+    def eq(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "neq", value)
+
+    def lt(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "lte", value)
+
+    def gt(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "gte", value)
+
+    def like(self, column, pattern) -> "SqliteQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern) -> "SqliteQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def in_(self, column, values) -> "SqliteQuery":
+        return self._filter(column, "in", values)
+
+    def is_(self, column, value) -> "SqliteQuery":
+        return self._filter(column, "is", value)
+
+    def match(self, query: Dict[str, Any]) -> "SqliteQuery":
+        for column, value in query.items():
+            self._filter(column, "eq", value)
+        return self
+
+    def or_(self, expression: str) -> "SqliteQuery":
+        clause, params = self._logic(expression, "or")
+        self.where.append(clause)
+        self.params.extend(params)
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **kwargs) -> "SqliteQuery":
+        column = self.client._column(self.table_name, column)
+        clause = f'"{column}" {"DESC" if desc else "ASC"}'
+        # SQLite can't walk an index for an explicit NULLS clause, so null
+        # placement follows SQLite (nulls smallest) unless asked for, and a
+        # requested placement SQLite already gives is left implicit
+        if nullsfirst is not None and nullsfirst != (not desc):
+            clause += " NULLS FIRST" if nullsfirst else " NULLS LAST"
+        self.ordering.append(clause)
+        return self
+
+    def limit(self, count: int) -> "SqliteQuery":
+        self.limit_count = count
+        return self
+
+    def range(self, start: int, end: int) -> "SqliteQuery":
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def single(self) -> "SqliteQuery":
+        self.single_row = True
+        return self
+
+    # Writes
+    def insert(self, rows: Any) -> "SqliteQuery":
+        self.mutation = ("insert", rows if isinstance(rows, list) else [rows], None)
+        return self
+
+    def upsert(self, rows: Any, on_conflict: str = "", **kwargs) -> "SqliteQuery":
+        self.mutation = ("upsert", rows if isinstance(rows, list) else [rows], on_conflict)
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "SqliteQuery":
+        self.mutation = ("update", values, None)
+        return self
+
+    def delete(self) -> "SqliteQuery":
+        self.mutation = ("delete", None, None)
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.client._execute(self)
+
+
+class SqlitePostgrestClient:
+    """
+    Stand-in for a supabase Client backed by a SQLite database file.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    concurrent sessions read while the write-behind queue writes.
+
+    Args:
+        path: Database file, created with the schema if missing
+        latency: Simulated round-trip time in seconds added to every request
+        bandwidth: Simulated bytes per second, or None for unlimited
+    """
+
+    def __init__(self, path: str, latency: float = 0.0, bandwidth: Optional[float] = None):
+        self.path = path
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.bytes_sent = 0
+        self.last_payload_bytes = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        create_schema(self._connection())
+
+    def table(self, name: str) -> SqliteQuery:
+        return SqliteQuery(self, name)
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.requests = 0
+            self.bytes_sent = 0
+            self.last_payload_bytes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=10000")
+            self._local.connection = connection
+        return connection
+
+    def _table(self, name: str) -> str:
+        if name not in SCHEMA:
+            raise SqliteAPIError(f'relation "public.{name}" does not exist', "42P01")
+        return name
+
+    def _column(self, table: str, column: str) -> str:
+        if column not in SCHEMA[table]:
+            raise SqliteAPIError(f"column {table}.{column} does not exist", "42703")
+        return column
+
+    def _execute(self, query: SqliteQuery) -> FakeResponse:
+        try:
+            if query.mutation is not None:
+                data, count = self._mutate(query), None
+            else:
+                data, count = self._select(query)
+        except sqlite3.IntegrityError as e:
+            code = "23502" if "NOT NULL" in str(e) else "23505"
+            raise SqliteAPIError(str(e), code) from e
+        except sqlite3.OperationalError as e:
+            raise SqliteAPIError(str(e), "55P03" if "locked" in str(e) else "42601") from e
+        return self._send(data, count)
+
+    def _select(self, query: SqliteQuery) -> Tuple[Any, Optional[int]]:
+        table = query.table_name
+        columns, embeds = self._projection(table, query.fields)
+        where = f" WHERE {' AND '.join(query.where)}" if query.where else ""
+        connection = self._connection()
+
+        count = None
+        if query.count_mode:
+            count = connection.execute(f'SELECT COUNT(*) FROM "{table}"{where}', query.params).fetchone()[0]
+
+        sql = f'SELECT {", ".join(f"{chr(34)}{c}{chr(34)}" for c in columns)} FROM "{table}"{where}'
+        if query.ordering:
+            sql += " ORDER BY " + ", ".join(query.ordering)
+        if query.limit_count is not None or query.offset:
+            sql += f" LIMIT {-1 if query.limit_count is None else int(query.limit_count)} OFFSET {int(query.offset)}"
+        rows = [self._decode(table, row) for row in connection.execute(sql, query.params)]
+
+        for embed, inner, foreign_key, keep_key in embeds:
+            targets = self._lookup(embed, inner, {row[foreign_key] for row in rows if row.get(foreign_key) is not None})
+            for row in rows:
+                row[embed] = targets.get(row.get(foreign_key))
+                if not keep_key:
+                    row.pop(foreign_key, None)
+
+        if query.single_row:
+            if len(rows) != 1:
+                raise SqliteAPIError("JSON object requested, multiple (or no) rows returned", "PGRST116")
+            return rows[0], count
+        return rows, count
+
+    def _projection(self, table: str, fields: str) -> Tuple[List[str], List[Tuple[str, str, str, bool]]]:
+        """Resolve a select string into columns and embedded resources (name, fields, foreign key, key requested)."""
+        columns: List[str] = []
+        embeds = []
+        for item in split_fields(fields):
+            if "(" in item:
+                embed, inner = item[:-1].split("(", 1)
+                embeds.append((self._table(embed), inner, embed.rstrip("s") + "_id"))
+            elif item == "*":
+                columns.extend(column for column in SCHEMA[table] if column not in columns)
+            elif item not in columns:
+                columns.append(self._column(table, item))
+        resolved = []
+        for embed, inner, foreign_key in embeds:
+            keep_key = foreign_key in columns
+            if not keep_key:
+                columns.append(self._column(table, foreign_key))
+            resolved.append((embed, inner, foreign_key, keep_key))
+        return columns, resolved
+
+    def _lookup(self, table: str, fields: str, keys: set) -> Dict[Any, Dict[str, Any]]:
+        if not keys:
+            return {}
+        query = self.table(table).select(fields if "id" in split_fields(fields) or fields == "*" else f"{fields},id")
+        query.in_("id", sorted(keys))
+        rows, _ = self._select(query)
+        targets = {row["id"]: row for row in rows}
+        if "id" not in split_fields(fields) and fields != "*":
+            for row in rows:
+                row.pop("id", None)
+        return targets
+
+    def _decode(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        schema = SCHEMA[table]
+        result = dict(row)
+        for column, value in result.items():
+            if value is not None and schema[column] == "JSON":
+                result[column] = json.loads(value)
+        return result
+
+    def _encode(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        schema = SCHEMA[table]
+        encoded = {}
+        for column, value in row.items():
+            self._column(table, column)
+            encoded[column] = json.dumps(value) if value is not None and schema[column] == "JSON" else value
+        if "updated_at" in schema and "updated_at" not in encoded:
+            encoded["updated_at"] = _now()
+        return encoded
+
+    def _mutate(self, query: SqliteQuery) -> List[Dict[str, Any]]:
+        kind, payload, on_conflict = query.mutation
+        table = query.table_name
+        connection = self._connection()
+        returned: List[Dict[str, Any]] = []
+
+        if kind in ("insert", "upsert"):
+            keys = [self._column(table, key) for key in on_conflict.split(",")] if on_conflict else []
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for row in payload:
+                    row = self._encode(table, row)
+                    columns = list(row)
+                    sql = (
+                        f'INSERT INTO "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in columns)}) '
+                        f'VALUES ({", ".join("?" * len(columns))})'
+                    )
+                    if kind == "upsert":
+                        target = keys or [next(iter(SCHEMA[table]))]
+                        updates = [c for c in columns if c not in target]
+                        sql += f' ON CONFLICT ({", ".join(target)}) '
+                        sql += ("DO UPDATE SET " + ", ".join(f'"{c}" = excluded."{c}"' for c in updates)) if updates else "DO NOTHING"
+                    sql += " RETURNING *"
+                    returned.extend(self._decode(table, r) for r in connection.execute(sql, [row[c] for c in columns]))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            return returned
+
+        where = f" WHERE {' AND '.join(query.where)}" if query.where else ""
+        if kind == "update":
+            values = self._encode(table, payload)
+            assignments = ", ".join(f'"{c}" = ?' for c in values)
+            cursor = connection.execute(
+                f'UPDATE "{table}" SET {assignments}{where} RETURNING *', list(values.values()) + query.params
+            )
+        else:
+            cursor = connection.execute(f'DELETE FROM "{table}"{where} RETURNING *', query.params)
+        return [self._decode(table, row) for row in cursor]
+
+    def _send(self, data: Any, count: Optional[int]) -> FakeResponse:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        with self._stats_lock:
+            self.requests += 1
+            self.bytes_sent += len(payload)
+            self.last_payload_bytes = len(payload)
+        delay = self.latency + (len(payload) / self.bandwidth if self.bandwidth else 0.0)
+        if delay:
+            time.sleep(delay)
+        return FakeResponse(json.loads(payload), count)
+
+
+class AsyncSqliteQuery(SqliteQuery):
+    """SqliteQuery whose execute is awaited, like the async PostgREST request builders."""
+
+    async def execute(self) -> FakeResponse:
+        # The query and the simulated round trip run in a worker thread, leaving the event loop free
+        return await asyncio.to_thread(self.client._execute, self)
+
+
+class AsyncSqlitePostgrestClient(SqlitePostgrestClient):
+    """Stand-in for the async PostgREST client over the same database file."""
+
+    def table(self, name: str) -> AsyncSqliteQuery:
+        return AsyncSqliteQuery(self, name)
+
+
+def create_schema(connection: sqlite3.Connection, indexes: bool = True) -> None:
+    """
+    Create the tables, and optionally the indexes, if they don't exist yet.
+
+    Args:
+        connection: Connection to the database file
+        indexes: Also create INDEXES; a bulk load is faster building them afterwards
+    """
+    for table, columns in SCHEMA.items():
+        definition = ", ".join(f'"{name}" {"TEXT" if kind == "JSON" else kind}' for name, kind in columns.items())
+        connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({definition})')
+    if indexes:
+        for statement in INDEXES:
+            connection.execute(statement)
+
+
+def create_client(url: str, key: str, latency: float = 0.0) -> SqlitePostgrestClient:
+    """
+    Client factory for the SUPABASE_CLIENT_FACTORY setting.
+
+    The BENCH_LATENCY environment variable, in seconds, overrides the
+    simulated round-trip time, since the app passes only the URL and key.
+
+    Args:
+        url: "sqlite:///path/to/db.sqlite3" or a plain file path
+        key: Ignored; accepted to match supabase.create_client
+        latency: Simulated round-trip time in seconds
+
+    Returns:
+        A client over the database file
+    """
+    path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url
+    return SqlitePostgrestClient(path, latency=float(os.environ.get("BENCH_LATENCY", latency)))
+
+
+def create_async_client(url: str, key: str, latency: float = 0.0) -> AsyncSqlitePostgrestClient:
+    """
+    Client factory for the SUPABASE_ASYNC_CLIENT_FACTORY setting; see create_client.
+
+    Args:
+        url: "sqlite:///path/to/db.sqlite3" or a plain file path
+        key: Ignored; accepted to match create_client
+        latency: Simulated round-trip time in seconds
+
+    Returns:
+        An async client over the database file
+    """
+    path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url
+    return AsyncSqlitePostgrestClient(path, latency=float(os.environ.get("BENCH_LATENCY", latency)))
+
+
+def _insert_many(connection: sqlite3.Connection, table: str, rows: Iterable[Dict[str, Any]], chunk: int = 5000) -> int:
+    schema = SCHEMA[table]
+    columns = list(schema)
+    sql = f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+
+    def values(row: Dict[str, Any]) -> List[Any]:
+        return [
+            json.dumps(row[c]) if schema[c] == "JSON" and row.get(c) is not None else row.get(c)
+            for c in columns
+        ]
+
+    written = 0
+    batch: List[List[Any]] = []
+    for row in rows:
+        batch.append(values(row))
+        if len(batch) >= chunk:
+            connection.executemany(sql, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        connection.executemany(sql, batch)
+        written += len(batch)
+    return written
+
+
+def _with_updated_at(jobs: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for job in jobs:
+        job["updated_at"] = job["posted_at"]
+        yield job
+
+
+def seed(path: str, scale: str = "10k", seed_value: int = 0) -> Dict[str, int]:
+    """
+    Create and fill a database at one of the named scales.
+
+    Rows are streamed from the synthetic generators in chunks, so seeding
+    the 1m scale needs little memory; indexes are built after the load.
+
+    Args:
+        path: Database file to create; an existing file is replaced
+        scale: One of SCALES
+        seed_value: Random seed of the generators
+
+    Returns:
+        Rows written per table
+    """
+    sizes = SCALES[scale]
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    create_schema(connection, indexes=False)
+
+    connection.execute("BEGIN")
+    written = {
+        "companies": _insert_many(connection, "companies", iter_companies(sizes["companies"], seed_value)),
+        "jobs": _insert_many(
+            connection, "jobs", _with_updated_at(iter_jobs(sizes["jobs"], sizes["companies"], seed_value))
+        ),
+        "profiles": _insert_many(connection, "profiles", iter_profiles(sizes["profiles"], seed_value)),
+        "applications": _insert_many(
+            connection,
+            "applications",
+            iter_applications(sizes["applications"], sizes["jobs"], sizes["profiles"], seed_value),
+        ),
+    }
+    connection.execute("COMMIT")
+    create_schema(connection)
+    connection.execute("ANALYZE")
+    connection.close()
+    return written
+
+
+def seeded_database(scale: str = "10k", seed_value: int = 0, directory: str = DEFAULT_DIRECTORY) -> str:
+    """
+    Path of a database at the given scale, seeding it on first use.
+
+    Seeding the larger scales takes minutes, so the file is kept between runs.
+    Benchmarks that write should work on a copy.
+    """
+    path = os.path.join(directory, f"{scale}-seed{seed_value}.sqlite3")
+    if not os.path.exists(path):
+        seed(path + ".tmp", scale, seed_value)
+        os.replace(path + ".tmp", path)
+    else:
+        add_missing_columns(path)
+    return path
+
+
+def add_missing_columns(path: str) -> List[str]:
+    """
+    Add columns SCHEMA gained since a kept database was seeded; they start out NULL.
+
+    Returns:
+        The added columns as "table.column"
+    """
+    connection = sqlite3.connect(path)
+    added = []
+    for table, columns in SCHEMA.items():
+        existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+        for column, kind in columns.items():
+            if column not in existing:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+                added.append(f"{table}.{column}")
+    connection.commit()
+    connection.close()
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--path", help="Database file; defaults to the one the benchmarks reuse")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    path = args.path or os.path.join(DEFAULT_DIRECTORY, f"{args.scale}-seed{args.seed}.sqlite3")
+    written = seed(path, args.scale, args.seed)
+    print(json.dumps({
+        "path": path,
+        "scale": args.scale,
+        "rows": written,
+        "seconds": round(time.perf_counter() - started, 1),
+        "bytes": os.path.getsize(path),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
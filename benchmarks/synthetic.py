@@ -0,0 +1,142 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+
+from normalization import normalize_job
+
+TITLES = [
+    "Software Developer", "Frontend Developer", "Backend Developer", "Full Stack Developer",
+    "DevOps Engineer", "Data Scientist", "Data Engineer", "Product Manager", "UX/UI Designer",
+    "Machine Learning Engineer", "QA Engineer", "Site Reliability Engineer", "Mobile Developer",
+]
+SENIORITY = ["Junior", "", "Senior", "Lead", "Principal"]
+COMPANY_WORDS = ["Tech", "Data", "Cloud", "Nova", "Sphere", "Flow", "Mind", "Core", "Wave", "Logic"]
+LOCATIONS = [
+    "Remote", "New York, USA", "San Francisco, USA", "Chicago, USA", "Seattle, USA", "London, UK",
+    "Berlin, Germany", "Paris, France", "Amsterdam, Netherlands", "Bangalore, India",
+    "Singapore", "Tokyo, Japan", "Toronto, Canada", "Sydney, Australia",
+]
+JOB_TYPES = ["Full-time", "Part-time", "Contract", "Internship"]
+EXPERIENCE = ["Entry Level", "Mid Level", "Senior", "Executive"]
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Education", "Retail", "Manufacturing", "Other"]
+COMPANY_SIZES = ["1-10 employees", "11-50 employees", "51-200 employees", "201-1000 employees", "1000+ employees"]
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "AWS", "GCP", "Azure", "Docker",
+    "Kubernetes", "Git", "Go", "Rust", "Java", "Figma", "Statistics", "Machine Learning", "Terraform",
+]
+STATUSES = ["Application Review", "Interview Scheduled", "Offer", "Hired", "Rejected"]
+WORDS = (
+    "build scale design ship maintain own improve mentor collaborate analyze deliver platform "
+    "services customers product team data pipelines infrastructure reliability performance quality "
+    "roadmap stakeholders experience strong communication skills required preferred benefits"
+).split()
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _company_name(i: int) -> str:
+    return f"{COMPANY_WORDS[i % 10]}{COMPANY_WORDS[(i // 10) % 10]} {i}"
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def iter_companies(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Stream n synthetic company rows, for scales that shouldn't be held in memory."""
+    rng = random.Random(seed)
+    for i in range(1, n + 1):
+        yield {
+            "id": i,
+            "name": _company_name(i),
+            "industry": rng.choice(INDUSTRIES),
+            "location": rng.choice(LOCATIONS),
+            "company_size": rng.choice(COMPANY_SIZES),
+            "rating": f"{rng.uniform(3.0, 5.0):.1f}/5",
+            "open_jobs": rng.randint(0, 50),
+            "website": f"https://company{i}.example.com",
+            "founded_year": rng.randint(1950, 2023),
+            "description": _paragraph(rng, rng.randint(30, 80)),
+        }
+
+
+def generate_companies(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate n synthetic company rows."""
+    return list(iter_companies(n, seed))
+
+
+def iter_jobs(n: int, companies: int = 1000, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Stream n synthetic job rows spread over a number of companies."""
+    rng = random.Random(seed)
+    for i in range(1, n + 1):
+        salary_min = rng.randrange(40, 200, 5) * 1000
+        salary_max = salary_min + rng.randrange(10, 60, 5) * 1000
+        seniority = rng.choice(SENIORITY)
+        # Rows as ingestion writes them, with normalized salary and location columns
+        yield normalize_job({
+            "id": i,
+            "external_key": f"feed-{i}",
+            "title": f"{seniority} {rng.choice(TITLES)}".strip(),
+            "company": _company_name(rng.randint(1, max(companies, 1))),
+            "location": rng.choice(LOCATIONS),
+            "job_type": rng.choice(JOB_TYPES),
+            "experience_level": rng.choice(EXPERIENCE),
+            "salary": f"${salary_min // 1000}K - ${salary_max // 1000}K",
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "posted_at": (EPOCH + timedelta(minutes=rng.randint(0, 60 * 24 * 365))).isoformat(),
+            "skills": rng.sample(SKILLS, rng.randint(2, 6)),
+            "description": _paragraph(rng, rng.randint(120, 300)),
+        })
+
+
+def generate_jobs(n: int, companies: int = 1000, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate n synthetic job rows spread over a number of companies."""
+    return list(iter_jobs(n, companies, seed))
+
+
+def iter_profiles(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Stream n synthetic job seeker profiles."""
+    rng = random.Random(seed)
+    for i in range(1, n + 1):
+        yield {
+            "user_id": f"user_{i}",
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "email": f"user{i}@example.com",
+            "phone": "+1 555-000-0000",
+            "city": rng.choice(LOCATIONS).split(",")[0],
+            "country": "USA",
+            "about": _paragraph(rng, rng.randint(20, 60)),
+            "website": "",
+            "role": "jobseeker",
+            "skills": rng.sample(SKILLS, rng.randint(3, 8)),
+            "experience_level": rng.choice(EXPERIENCE),
+            "preferred_locations": rng.sample(["Remote", "USA", "Europe", "Asia"], 2),
+            "preferred_job_types": rng.sample(JOB_TYPES, 2),
+            "preferred_titles": rng.sample(TITLES, 2),
+        }
+
+
+def generate_profiles(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate n synthetic job seeker profiles."""
+    return list(iter_profiles(n, seed))
+
+
+def iter_applications(n: int, jobs: int, profiles: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Stream n synthetic applications referencing existing job and profile ids."""
+    rng = random.Random(seed)
+    for i in range(1, n + 1):
+        yield {
+            "id": i,
+            "job_id": rng.randint(1, max(jobs, 1)),
+            "user_id": f"user_{rng.randint(1, max(profiles, 1))}",
+            "status": rng.choice(STATUSES),
+            "applied_date": (EPOCH + timedelta(days=rng.randint(0, 365))).date().isoformat(),
+            "next_step": "Waiting for feedback",
+        }
+
+
+def generate_applications(n: int, jobs: int, profiles: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate n synthetic applications referencing existing job and profile ids."""
+    return list(iter_applications(n, jobs, profiles, seed))
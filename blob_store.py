@@ -0,0 +1,242 @@
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORAGE_DIR = os.path.join(_BASE_DIR, "storage")
+
+# Uploads are read and written in pieces of this size
+CHUNK_SIZE = 1 << 20
+
+
+class BlobTooLarge(Exception):
+    """Raised when a streamed upload exceeds the allowed size."""
+    pass
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Where a blob was stored and whether this put created it."""
+
+    key: str
+    sha256: str
+    size: int
+    created: bool
+
+
+def iter_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read a file object piece by piece, from its start.
+
+    Args:
+        file: A readable binary file, e.g. a Streamlit UploadedFile
+        chunk_size: Bytes per piece
+
+    Returns:
+        Iterator over the pieces
+    """
+    if hasattr(file, "seek"):
+        file.seek(0)
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class LocalBlobStore:
+    """
+    Content-addressed files in a local directory.
+
+    A blob's key is the SHA-256 of its content plus a suffix, laid out as
+    <namespace>/<first two hex digits>/<digest><suffix>. Putting content that
+    is already stored keeps the existing file, so identical uploads are
+    stored once. Content is streamed to a temporary file while it is
+    hashed and moved into place atomically, so readers never see a
+    partial blob and memory use doesn't grow with the upload.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORAGE_DIR):
+        """
+        Initialize the store, creating its directory if needed.
+
+        Args:
+            root: Directory holding the blobs
+        """
+        self.root = root
+        self._incoming = os.path.join(root, ".incoming")
+        os.makedirs(self._incoming, exist_ok=True)
+
+    def key_for(self, namespace: str, sha256: str, suffix: str = "") -> str:
+        """Build the key of content with a given digest."""
+        return f"{namespace}/{sha256[:2]}/{sha256}{suffix}"
+
+    def path(self, key: str) -> str:
+        """Local path of a stored blob."""
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key: str) -> bool:
+        """Tell whether a blob is stored."""
+        return os.path.exists(self.path(key))
+
+    def put_stream(
+        self,
+        namespace: str,
+        chunks: Iterable[bytes],
+        suffix: str = "",
+        max_bytes: Optional[int] = None
+    ) -> StoredBlob:
+        """
+        Store streamed content under its digest.
+
+        Args:
+            namespace: Kind of content, e.g. "resumes"
+            chunks: The content, piece by piece
+            suffix: File extension kept on the key, e.g. ".pdf"
+            max_bytes: Reject content larger than this
+
+        Returns:
+            The stored blob
+
+        Raises:
+            BlobTooLarge: If the content exceeds max_bytes; nothing is stored
+        """
+        digest = hashlib.sha256()
+        size = 0
+        descriptor, temporary = tempfile.mkstemp(dir=self._incoming)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(f"Upload exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    file.write(chunk)
+            sha256 = digest.hexdigest()
+            key = self.key_for(namespace, sha256, suffix)
+            path = self.path(key)
+            if os.path.exists(path):
+                return StoredBlob(key, sha256, size, created=False)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temporary, path)
+            return StoredBlob(key, sha256, size, created=True)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def put_bytes(self, namespace: str, data: bytes, suffix: str = "") -> StoredBlob:
+        """Store content already in memory under its digest."""
+        return self.put_stream(namespace, [data], suffix)
+
+    def put_derived(self, key: str, data: bytes) -> StoredBlob:
+        """
+        Store content generated from another blob under a key built from that blob's.
+
+        Used for renditions such as thumbnails: their key follows from the
+        source's digest, so they can be found without being hashed first.
+        Like content keys, a derived key that is already stored is kept.
+
+        Args:
+            key: The derived key, e.g. "logos/ab/<digest>.card.webp"
+            data: The generated content
+
+        Returns:
+            The stored blob
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.path(key)
+        if os.path.exists(path):
+            return StoredBlob(key, sha256, len(data), created=False)
+        descriptor, temporary = tempfile.mkstemp(dir=self._incoming)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temporary, path)
+            return StoredBlob(key, sha256, len(data), created=True)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def read(self, key: str) -> bytes:
+        """Read a stored blob."""
+        with open(self.path(key), "rb") as file:
+            return file.read()
+
+    def local_path(self, key: str) -> str:
+        """A local file with the blob's content, for workers that read from disk."""
+        return self.path(key)
+
+
+class BucketBlobStore(LocalBlobStore):
+    """
+    Content-addressed blobs in a Supabase Storage bucket, with a local copy.
+
+    Content is streamed and hashed into the local directory first, which
+    doubles as the read cache, and then uploaded from that file under the
+    same key. An upload of a key the bucket already has counts as a
+    duplicate, not an error.
+    """
+
+    def __init__(self, client: Any, bucket: str, root: str = DEFAULT_STORAGE_DIR):
+        """
+        Initialize the store.
+
+        Args:
+            client: A supabase client
+            bucket: Name of the storage bucket
+            root: Directory for the local copies
+        """
+        super().__init__(root)
+        self.bucket = client.storage.from_(bucket)
+
+    def put_stream(
+        self,
+        namespace: str,
+        chunks: Iterable[bytes],
+        suffix: str = "",
+        max_bytes: Optional[int] = None
+    ) -> StoredBlob:
+        return self._upload(super().put_stream(namespace, chunks, suffix, max_bytes))
+
+    def put_derived(self, key: str, data: bytes) -> StoredBlob:
+        return self._upload(super().put_derived(key, data))
+
+    def _upload(self, blob: StoredBlob) -> StoredBlob:
+        try:
+            self.bucket.upload(blob.key, self.path(blob.key), {"upsert": "false"})
+        except Exception as e:
+            if "duplicate" not in str(e).lower() and "409" not in str(e):
+                raise
+            blob = StoredBlob(blob.key, blob.sha256, blob.size, created=False)
+        return blob
+
+    def local_path(self, key: str) -> str:
+        path = self.path(key)
+        if not os.path.exists(path):
+            # Stored by another replica; fetch it into the local cache
+            LocalBlobStore.put_derived(self, key, self.bucket.download(key))
+        return path
+
+
+def open_blob_store(bucket: Optional[str] = None, client: Any = None, root: str = DEFAULT_STORAGE_DIR) -> LocalBlobStore:
+    """
+    Open the bucket store when a bucket and a client are given, else the local store.
+
+    Args:
+        bucket: Supabase Storage bucket name, or None for local disk only
+        client: A supabase client
+        root: Local directory for blobs or their copies
+
+    Returns:
+        The blob store
+    """
+    if bucket and client is not None:
+        try:
+            return BucketBlobStore(client, bucket, root)
+        except Exception as e:
+            logging.error(f"Error opening storage bucket {bucket}: {str(e)}")
+    return LocalBlobStore(root)
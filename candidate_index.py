@@ -0,0 +1,344 @@
+import math
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from normalization import REGIONS, normalize_location
+
+# Query words that select a seniority instead of a skill
+SENIORITY_TERMS = {
+    "entry": "entry level", "junior": "entry level", "entry level": "entry level",
+    "mid": "mid level", "mid level": "mid level", "intermediate": "mid level",
+    "senior": "senior", "executive": "executive", "lead": "executive",
+}
+_REGION_TERMS = {region.lower(): region.lower() for region in REGIONS}
+
+# Query terms beyond this many still filter but no longer affect the ranking
+MAX_RANKED_TERMS = 10
+
+# Bit positions set in each byte value, for walking bitmaps byte by byte
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a candidate search query can't be parsed."""
+
+
+def normalize_term(text: str) -> str:
+    """Case-fold and collapse whitespace in a skill or place name."""
+    return " ".join(text.lower().split())
+
+
+def _bitmap(positions: List[int], size: int) -> int:
+    """Build a bitmap with the given bit positions set."""
+    data = bytearray((size + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+
+def _iter_bits(bitmap: int) -> Iterator[int]:
+    """Yield the positions of the set bits of a bitmap, in ascending order."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            base = index * 8
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+class CandidateIndex:
+    """
+    Inverted index of job seeker profiles for the employer talent search.
+
+    Every profile gets a dense integer slot, and each skill, region, place
+    and seniority term maps to a posting bitmap (a Python int with one bit
+    per slot). Boolean queries such as "Python AND AWS AND Remote" are
+    answered with bitwise AND/OR on whole bitmaps. Profiles can be added,
+    updated and removed one at a time as they are read or written.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, int] = {}
+        self._slots: Dict[str, int] = {}
+        self._profiles: List[Any] = []
+        self._doc_terms: List[Tuple[str, ...]] = []
+        self._free: List[int] = []
+        self._live = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, user_id: Any) -> bool:
+        return str(user_id) in self._slots
+
+    def build(self, profiles: Any) -> None:
+        """
+        Replace the index contents with a snapshot of profiles.
+
+        Postings are collected as slot lists and turned into bitmaps once at
+        the end, instead of OR-ing one bit at a time into growing ints.
+        """
+        slots: Dict[str, int] = {}
+        records: List[Any] = []
+        doc_terms: List[Tuple[str, ...]] = []
+        positions: Dict[str, List[int]] = {}
+        for profile in profiles:
+            user_id = str(profile.user_id)
+            slot = slots.get(user_id)
+            if slot is None:
+                slot = slots[user_id] = len(records)
+                records.append(profile)
+                doc_terms.append(())
+            records[slot] = profile
+            doc_terms[slot] = self.profile_terms(profile)
+
+        for slot, terms in enumerate(doc_terms):
+            for term in terms:
+                positions.setdefault(term, []).append(slot)
+
+        with self._lock:
+            self._postings = {term: _bitmap(slot_list, len(records)) for term, slot_list in positions.items()}
+            self._slots = slots
+            self._profiles = records
+            self._doc_terms = doc_terms
+            self._free = []
+            self._live = (1 << len(records)) - 1
+
+    def add(self, profile: Any) -> None:
+        """
+        Index a profile, replacing any previous version of the same user.
+
+        Args:
+            profile: A Profile record with skills, city, country,
+                preferred_locations and experience_level
+        """
+        user_id = str(profile.user_id)
+        terms = self.profile_terms(profile)
+        with self._lock:
+            slot = self._slots.get(user_id)
+            if slot is None:
+                slot = self._free.pop() if self._free else len(self._profiles)
+                if slot == len(self._profiles):
+                    self._profiles.append(None)
+                    self._doc_terms.append(())
+                self._slots[user_id] = slot
+                self._live |= 1 << slot
+            else:
+                self._clear(slot)
+            bit = 1 << slot
+            for term in terms:
+                self._postings[term] = self._postings.get(term, 0) | bit
+            self._profiles[slot] = profile
+            self._doc_terms[slot] = terms
+
+    def remove(self, user_id: Any) -> bool:
+        """
+        Remove a profile from the index.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            True if the profile was indexed
+        """
+        with self._lock:
+            slot = self._slots.pop(str(user_id), None)
+            if slot is None:
+                return False
+            self._clear(slot)
+            self._profiles[slot] = None
+            self._live &= ~(1 << slot)
+            self._free.append(slot)
+            return True
+
+    def _clear(self, slot: int) -> None:
+        mask = ~(1 << slot)
+        for term in self._doc_terms[slot]:
+            remaining = self._postings[term] & mask
+            if remaining:
+                self._postings[term] = remaining
+            else:
+                del self._postings[term]
+        self._doc_terms[slot] = ()
+
+    @staticmethod
+    def profile_terms(profile: Any) -> Tuple[str, ...]:
+        """List the index terms of a profile, e.g. "skill:python" or "region:remote"."""
+        terms: Set[str] = {f"skill:{normalize_term(skill)}" for skill in profile.skills or () if skill.strip()}
+
+        home = ", ".join(part for part in (profile.city, profile.country) if part)
+        if home:
+            location = normalize_location(home)
+            terms.add(f"region:{location.region.lower()}")
+            if location.country_code:
+                terms.add(f"country:{location.country_code.lower()}")
+        for place in (profile.city, profile.country):
+            if place:
+                terms.add(f"place:{normalize_term(place)}")
+        for preferred in profile.preferred_locations or ():
+            region = preferred if preferred in REGIONS else normalize_location(preferred).region
+            terms.add(f"region:{region.lower()}")
+
+        if profile.experience_level:
+            terms.add(f"level:{SENIORITY_TERMS.get(normalize_term(profile.experience_level), normalize_term(profile.experience_level))}")
+        return tuple(sorted(terms))
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[Any, float]]:
+        """
+        Find profiles matching a boolean query, best match first.
+
+        Terms are skills, regions, places or seniority levels and may be
+        prefixed ("skill:go", "level:senior"); multi-word terms are quoted.
+        Adjacent terms are ANDed; AND, OR, NOT and parentheses are supported.
+        Matches are ranked by the summed rarity of the query terms they have,
+        so OR queries favor candidates matching more (and rarer) terms; ties
+        keep indexing order.
+
+        Args:
+            query: The query, e.g. 'Python AND (AWS OR GCP) AND Remote'
+            limit: Maximum number of profiles to return
+
+        Returns:
+            (profile, score) pairs
+
+        Raises:
+            QuerySyntaxError: If the query can't be parsed
+        """
+        parser = _QueryParser(query, self)
+        with self._lock:
+            matches = parser.parse()
+            if not matches:
+                return []
+
+            # Candidates with the same subset of query terms share a score, so
+            # walk the subsets best first and stop once the page is full
+            total = max(len(self._slots), 1)
+            terms = [term for term in dict.fromkeys(parser.positive_terms) if term in self._postings]
+            terms = terms[:MAX_RANKED_TERMS]
+            weights = [math.log(1 + total / self._postings[term].bit_count()) for term in terms]
+            subsets = sorted(
+                range(1 << len(terms)),
+                key=lambda subset: -sum(w for i, w in enumerate(weights) if subset >> i & 1)
+            )
+
+            results: List[Tuple[Any, float]] = []
+            for subset in subsets:
+                bitmap = matches
+                for i, term in enumerate(terms):
+                    bitmap &= self._postings[term] if subset >> i & 1 else ~self._postings[term]
+                    if not bitmap:
+                        break
+                if not bitmap:
+                    continue
+                score = round(sum(w for i, w in enumerate(weights) if subset >> i & 1), 4)
+                for slot in _iter_bits(bitmap):
+                    results.append((self._profiles[slot], score))
+                    if len(results) >= limit:
+                        return results
+            return results
+
+    def resolve(self, word: str) -> str:
+        """Map a query word to an index term."""
+        if ":" in word:
+            field, value = word.split(":", 1)
+            field = {"location": "place", "seniority": "level", "experience": "level"}.get(field.lower(), field.lower())
+            value = normalize_term(value)
+            if field == "level":
+                value = SENIORITY_TERMS.get(value, value)
+            return f"{field}:{value}"
+        value = normalize_term(word)
+        if value in _REGION_TERMS:
+            return f"region:{_REGION_TERMS[value]}"
+        if value in SENIORITY_TERMS:
+            return f"level:{SENIORITY_TERMS[value]}"
+        if f"skill:{value}" not in self._postings and f"place:{value}" in self._postings:
+            return f"place:{value}"
+        return f"skill:{value}"
+
+
+class _QueryParser:
+    """Recursive-descent parser that evaluates a query straight to a bitmap."""
+
+    def __init__(self, query: str, index: CandidateIndex):
+        self.index = index
+        self.tokens = self._tokenize(query)
+        self.position = 0
+        self.positive_terms: List[str] = []
+        self._negated = 0
+
+    @staticmethod
+    def _tokenize(query: str) -> List[Tuple[str, str]]:
+        tokens, position = [], 0
+        query = query.strip()
+        while position < len(query):
+            match = _TOKEN_RE.match(query, position)
+            if not match or match.end() == position:
+                raise QuerySyntaxError(f"Unexpected character at {position}: {query[position:]!r}")
+            position = match.end()
+            if match.group(1):
+                tokens.append(("(", "("))
+            elif match.group(2):
+                tokens.append((")", ")"))
+            elif match.group(3) is not None:
+                tokens.append(("term", match.group(3)))
+            elif match.group(4).upper() in ("AND", "OR", "NOT"):
+                tokens.append((match.group(4).upper(), match.group(4)))
+            else:
+                tokens.append(("term", match.group(4)))
+        return tokens
+
+    def parse(self) -> int:
+        if not self.tokens:
+            return 0
+        result = self._or()
+        if self.position < len(self.tokens):
+            raise QuerySyntaxError(f"Unexpected {self.tokens[self.position][1]!r}")
+        return result
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def _or(self) -> int:
+        result = self._and()
+        while self._peek() == "OR":
+            self.position += 1
+            result |= self._and()
+        return result
+
+    def _and(self) -> int:
+        result = self._not()
+        while self._peek() in ("AND", "NOT", "term", "("):
+            if self._peek() == "AND":
+                self.position += 1
+            result &= self._not()
+        return result
+
+    def _not(self) -> int:
+        if self._peek() == "NOT":
+            self.position += 1
+            self._negated += 1
+            operand = self._not()
+            self._negated -= 1
+            return self.index._live & ~operand
+        return self._atom()
+
+    def _atom(self) -> int:
+        kind = self._peek()
+        if kind == "(":
+            self.position += 1
+            result = self._or()
+            if self._peek() != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self.position += 1
+            return result
+        if kind == "term":
+            term = self.index.resolve(self.tokens[self.position][1])
+            self.position += 1
+            if not self._negated % 2:
+                self.positive_terms.append(term)
+            return self.index._postings.get(term, 0)
+        raise QuerySyntaxError("Query ended unexpectedly" if kind is None else f"Unexpected {self.tokens[self.position][1]!r}")
@@ -0,0 +1,279 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import jwt
+import requests
+
+# Clerk signs session tokens with RS256 only; anything else is rejected
+ALGORITHMS = ["RS256"]
+
+# Claims every session token must carry
+REQUIRED_CLAIMS = ["exp", "iat", "sub"]
+
+
+class ClerkAuthError(Exception):
+    """Exception raised for errors in Clerk authentication."""
+    pass
+
+
+def jwks_url_for(frontend_api: str) -> str:
+    """
+    Build the JWKS URL of a Clerk instance.
+
+    Args:
+        frontend_api: The Frontend API host, with or without a scheme
+
+    Returns:
+        The URL of the instance's public signing keys
+    """
+    host = frontend_api.strip().rstrip("/")
+    if not host.startswith(("http://", "https://")):
+        host = f"https://{host}"
+    return f"{host}/.well-known/jwks.json"
+
+
+class JWKSCache:
+    """
+    The signing keys of a Clerk instance, fetched once and kept by key id.
+
+    Keys are refetched when they reach their max age, and when a token names
+    a key id that isn't cached yet, which is how a key rotation shows up.
+    Refetches for unknown key ids are rate limited, so tokens with made-up
+    key ids can't turn into a stream of requests to Clerk. Only one thread
+    fetches at a time; the others wait for its result.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        fetch: Optional[Callable[[str], Dict[str, Any]]] = None,
+        max_age: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 5.0
+    ):
+        """
+        Initialize the cache; nothing is fetched until the first lookup.
+
+        Args:
+            url: The JWKS URL, see jwks_url_for
+            fetch: Returns the JWKS document for a URL; an HTTP GET by default
+            max_age: Seconds the keys are used before they are refetched
+            min_refresh_interval: Minimum seconds between refetches for unknown key ids
+            timeout: HTTP timeout in seconds for the default fetch
+        """
+        self.url = url
+        self.fetch = fetch or self._get
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"fetches": 0, "fetch_errors": 0, "unknown_kids": 0}
+
+    def _get(self, url: str) -> Dict[str, Any]:
+        response = requests.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_key(self, kid: str) -> Any:
+        """
+        Get the public key for a key id, refetching the key set if needed.
+
+        Args:
+            kid: The key id from the token header
+
+        Returns:
+            The public key to verify the signature with
+
+        Raises:
+            ClerkAuthError: If no key with that id exists
+        """
+        key = self._keys.get(kid)
+        if key is not None and time.monotonic() - self._fetched_at < self.max_age:
+            return key
+
+        with self._lock:
+            # Another thread may have refetched while this one waited
+            key = self._keys.get(kid)
+            age = time.monotonic() - self._fetched_at
+            if key is None or age >= self.max_age:
+                if key is not None or age >= self.min_refresh_interval:
+                    self._refresh()
+                key = self._keys.get(kid)
+            if key is None:
+                self._stats["unknown_kids"] += 1
+                raise ClerkAuthError(f"Unknown signing key: {kid}")
+            return key
+
+    def refresh(self) -> None:
+        """Fetch the key set now, e.g. to warm the cache at startup."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            document = self.fetch(self.url)
+            keys = {}
+            for jwk in document.get("keys", []):
+                if jwk.get("kid") and jwk.get("kty") == "RSA" and jwk.get("use", "sig") == "sig":
+                    keys[jwk["kid"]] = jwt.PyJWK(jwk, algorithm="RS256").key
+            self._stats["fetches"] += 1
+        except Exception as e:
+            # Keep serving the previous keys; the next lookup retries after the interval
+            self._stats["fetch_errors"] += 1
+            logging.error(f"Error fetching Clerk JWKS: {str(e)}")
+            self._fetched_at = time.monotonic() - self.max_age + self.min_refresh_interval
+            return
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return fetch counters and the cached key ids."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["kids"] = sorted(self._keys)
+        return stats
+
+
+class SessionVerifier:
+    """
+    Verifies Clerk session tokens locally and remembers the decoded claims.
+
+    A token is checked once: its RS256 signature against the cached JWKS,
+    then expiry, issuer and authorized party. The claims are cached by a
+    digest of the token until the token expires or the claims TTL passes,
+    whichever comes first, so checking the same session again costs a
+    dictionary lookup. The cache is LRU-bounded.
+    """
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        issuer: Optional[str] = None,
+        authorized_parties: Iterable[str] = (),
+        leeway: float = 5.0,
+        claims_ttl: float = 300.0,
+        max_entries: int = 10000
+    ):
+        """
+        Initialize the verifier.
+
+        Args:
+            jwks: The signing keys of the Clerk instance
+            issuer: Expected iss claim, the Frontend API URL; not checked if None
+            authorized_parties: Origins accepted in the azp claim; not checked if empty
+            leeway: Seconds of clock skew tolerated on exp, nbf and iat
+            claims_ttl: Maximum seconds decoded claims are served from the cache
+            max_entries: Maximum number of tokens whose claims are cached
+        """
+        self.jwks = jwks
+        self.issuer = issuer
+        self.authorized_parties = frozenset(authorized_parties)
+        self.leeway = leeway
+        self.claims_ttl = claims_ttl
+        self.max_entries = max_entries
+        # token digest -> (serve until, claims)
+        self._claims: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "verified": 0, "rejected": 0}
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a session token and return its claims.
+
+        Args:
+            token: The session JWT, e.g. from the __session cookie
+
+        Returns:
+            The token's claims
+
+        Raises:
+            ClerkAuthError: If the token is malformed, expired or not signed by Clerk
+        """
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(digest)
+            if entry is not None and entry[0] > now:
+                self._claims.move_to_end(digest)
+                self._stats["hits"] += 1
+                return entry[1]
+
+        try:
+            claims = self._decode(token)
+        except ClerkAuthError:
+            self._count("rejected")
+            raise
+
+        serve_until = min(float(claims["exp"]) + self.leeway, now + self.claims_ttl)
+        with self._lock:
+            self._claims[digest] = (serve_until, claims)
+            self._claims.move_to_end(digest)
+            while len(self._claims) > self.max_entries:
+                self._claims.popitem(last=False)
+            self._stats["verified"] += 1
+        return claims
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(token)
+            if header.get("alg") not in ALGORITHMS:
+                raise ClerkAuthError(f"Unexpected token algorithm: {header.get('alg')}")
+            key = self.jwks.get_key(header.get("kid", ""))
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=ALGORITHMS,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": REQUIRED_CLAIMS, "verify_iss": self.issuer is not None, "verify_aud": False}
+            )
+        except jwt.PyJWTError as e:
+            raise ClerkAuthError(f"Invalid session token: {str(e)}") from e
+        if self.authorized_parties and claims.get("azp") not in self.authorized_parties:
+            raise ClerkAuthError(f"Token issued for an unexpected origin: {claims.get('azp')}")
+        return claims
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/verify/reject counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._claims)
+        return stats
+
+
+def user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the user object the app keeps in session state from token claims.
+
+    Clerk's default session token only carries the user id (sub). Name,
+    email and role come from custom claims added to the session token
+    template in the Clerk dashboard, e.g.
+    {"email": "{{user.primary_email_address}}", "first_name": "{{user.first_name}}",
+     "last_name": "{{user.last_name}}", "metadata": "{{user.public_metadata}}"}.
+
+    Args:
+        claims: Verified claims from SessionVerifier.verify
+
+    Returns:
+        A dict shaped like Clerk's user object
+    """
+    metadata = claims.get("public_metadata") or claims.get("metadata") or {}
+    return {
+        "id": claims["sub"],
+        "email_addresses": [{"email_address": claims.get("email", "")}],
+        "first_name": claims.get("first_name", ""),
+        "last_name": claims.get("last_name", ""),
+        "public_metadata": {**metadata, "role": metadata.get("role", "jobseeker")},
+        "session_id": claims.get("sid"),
+        "session_expires_at": claims.get("exp"),
+    }
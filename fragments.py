@@ -0,0 +1,228 @@
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from html import escape
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+# {name} is HTML-escaped, {name:html} is inserted as is
+_PLACEHOLDER = re.compile(r"\{(\w+)(:html)?\}")
+
+
+def compact_html(source: str) -> str:
+    """
+    Collapse an indented HTML snippet onto one line.
+
+    Besides the bytes saved, a single line keeps st.markdown from reading
+    indented lines as a code block or ending the HTML block at a blank line.
+    """
+    return re.sub(r">\s+<", "><", " ".join(line.strip() for line in source.strip().splitlines() if line.strip()))
+
+
+@lru_cache(maxsize=8)
+def minify_css(css: str) -> str:
+    """Strip comments and whitespace from a stylesheet; the result is computed once per process."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+class FragmentTemplate:
+    """
+    An HTML snippet precompiled into literal text and value slots.
+
+    The snippet is compacted and split once, so rendering is a single join
+    instead of formatting and re-sending the indented source on every rerun.
+    """
+
+    def __init__(self, name: str, source: str):
+        """
+        Compile a template.
+
+        Args:
+            name: Template name, part of the fragment cache key
+            source: HTML with {field} placeholders; {field:html} marks trusted markup
+        """
+        self.name = name
+        text = compact_html(source)
+        self._slots: List[Tuple[str, str, bool]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(text):
+            self._slots.append((text[position:match.start()], match.group(1), bool(match.group(2))))
+            position = match.end()
+        self._tail = text[position:]
+        self.fields = tuple(field for _, field, _ in self._slots)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """
+        Fill in the template.
+
+        Args:
+            values: Value for every field; None renders as an empty string
+
+        Returns:
+            The HTML fragment
+        """
+        parts = []
+        for literal, field, trusted in self._slots:
+            value = values[field]
+            value = "" if value is None else str(value)
+            parts.append(literal)
+            parts.append(value if trusted else escape(value))
+        parts.append(self._tail)
+        return "".join(parts)
+
+
+JOB_CARD = FragmentTemplate("job_card", """
+    <div class='job-card'>
+        {logo:html}
+        <div class='job-title'>{title}</div>
+        <div class='company-name'>{company}</div>
+        <div class='job-details'>
+            <span class='detail-item'>{location}</span>
+            <span class='detail-item'>{job_type}</span>
+            <span class='detail-item'>{salary}</span>
+        </div>
+    </div>
+""")
+
+EMPLOYER_JOB_CARD = FragmentTemplate("employer_job_card", """
+    <div class='card'>
+        <h3>{title}</h3>
+        <div>Posted on: {posted_date} | Status: <span class='status-{status_class}'>{status}</span></div>
+        <div style='margin-top: 0.5rem;'>{applications} applications | {views} views</div>
+    </div>
+""")
+
+CANDIDATE_CARD = FragmentTemplate("candidate_card", """
+    <div class='card'>
+        <h3>{first_name} {last_name}</h3>
+        <div>{experience} | {place}</div>
+        <div class='skill-chips'>{skills:html}</div>
+        <div>Match score: {score}</div>
+    </div>
+""")
+
+SKILL_CHIP = FragmentTemplate("skill_chip", "<span class='skill-chip'>{skill}</span>")
+
+# Width and height are set so the page doesn't shift once the image loads
+LOGO = FragmentTemplate("logo", "<img class='{css_class}' src='{src}' alt='{name} logo' width='{size}' height='{size}'>")
+
+STAT_COUNTER = FragmentTemplate("stat_counter", """
+    <div class='stat-counter'>
+        <div class='counter-value'>{value}</div>
+        <div class='counter-label'>{label}</div>
+    </div>
+""")
+
+
+def wrap(html: str, css_class: str) -> str:
+    """Wrap a batch of fragments in one container div."""
+    return f"<div class='{css_class}'>{html}</div>"
+
+
+class FragmentCache:
+    """
+    Memo of rendered fragments, shared by every session.
+
+    Fragments are keyed by template, record id and a version of the record,
+    so a changed record renders afresh while unchanged cards are reused
+    across reruns and sessions. Records from the models module are frozen
+    and hashable, and their hash serves as the version by default. Bounded
+    with LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of fragments kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable, Hashable], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def render(
+        self,
+        template: FragmentTemplate,
+        record_id: Hashable,
+        version: Hashable,
+        values: Callable[[], Mapping[str, Any]]
+    ) -> str:
+        """
+        Return a record's fragment, rendering it if this version wasn't seen yet.
+
+        Args:
+            template: The template to fill in
+            record_id: Identity of the record, e.g. the job id
+            version: Anything that changes when the rendered values do
+            values: Builds the template values; only called on a miss
+
+        Returns:
+            The HTML fragment
+        """
+        key = (template.name, record_id, version)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return html
+            self._stats["misses"] += 1
+
+        html = template.render(values())
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return html
+
+    def render_many(
+        self,
+        template: FragmentTemplate,
+        records: Iterable[Any],
+        record_id: Callable[[Any], Hashable],
+        values: Callable[[Any], Mapping[str, Any]],
+        version: Callable[[Any], Hashable] = hash
+    ) -> str:
+        """
+        Render a list of records into one HTML string for a single st.markdown call.
+
+        Args:
+            template: The template to fill in for each record
+            records: The records, in display order
+            record_id: Returns a record's identity
+            values: Returns a record's template values
+            version: Returns a record's version; the record's hash by default
+
+        Returns:
+            The concatenated fragments
+        """
+        return "".join(
+            self.render(template, record_id(record), version(record), lambda record=record: values(record))
+            for record in records
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def render_skill_chips(skills: Iterable[str], css_class: Optional[str] = None) -> str:
+    """Render skill chips in one pass, optionally wrapped in a container."""
+    html = "".join(SKILL_CHIP.render({"skill": skill}) for skill in skills)
+    return wrap(html, css_class) if css_class else html
+
+
+def render_logo(src: Optional[str], name: str, css_class: str = "card-logo", size: int = 48) -> str:
+    """Render a logo image from a data URI, or nothing while there is none."""
+    return LOGO.render({"css_class": css_class, "src": src, "name": name, "size": size}) if src else ""
@@ -0,0 +1,389 @@
+import functools
+import inspect
+import itertools
+import logging
+import math
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+OPERATION_SECONDS = "jobwave_operation_seconds"
+OPERATION_ERRORS = "jobwave_operation_errors_total"
+HTTP_RESPONSE_BYTES = "jobwave_http_response_bytes"
+
+# A collector returns (name, type, help, labels, value) samples at scrape time
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+_local = threading.local()
+
+
+class Histogram:
+    """Fixed-bucket histogram, rendered with cumulative Prometheus buckets."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0.0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0.0
+
+    def observe(self, value: float, weight: float = 1.0) -> None:
+        self.counts[bisect_left(self.bounds, value)] += weight
+        self.sum += value * weight
+        self.count += weight
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0.0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = self.bounds[i - 1] if i else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else low * 2 or 1.0
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class MetricsRegistry:
+    """
+    Process-wide latency, size and error metrics.
+
+    Observations are sampled: with a sample rate of 0.1 every tenth call is
+    recorded with a weight of 10, so counts and sums stay unbiased while the
+    hot path mostly pays for one counter increment. Gauges such as cache
+    hit rates come from collectors that are only called at scrape time.
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        self._families: Dict[str, Tuple[str, str, Sequence[float]]] = {}
+        self._series: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any] = {}
+        self._collectors: List[Callable[[], Optional[Callable[[], Iterable[Sample]]]]] = []
+        self._lock = threading.Lock()
+        self._calls = itertools.count()
+        self.configure(sample_rate)
+        self.histogram(OPERATION_SECONDS, "Latency of instrumented operations.", LATENCY_BUCKETS)
+        self.counter(OPERATION_ERRORS, "Instrumented operations that raised.")
+        self.histogram(HTTP_RESPONSE_BYTES, "Size of database API responses.", SIZE_BUCKETS)
+
+    def configure(self, sample_rate: float) -> None:
+        """Set the share of observations that are recorded, between 0 and 1."""
+        self.sample_every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 0
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Declare a histogram family."""
+        self._families[name] = ("histogram", help_text, tuple(buckets))
+
+    def counter(self, name: str, help_text: str) -> None:
+        """Declare a counter family."""
+        self._families[name] = ("counter", help_text, ())
+
+    def sample(self) -> float:
+        """Decide whether to record the current call; returns its weight, 0 to skip."""
+        if not self.sample_every:
+            return 0.0
+        if self.sample_every == 1:
+            return 1.0
+        return float(self.sample_every) if next(self._calls) % self.sample_every == 0 else 0.0
+
+    def observe(self, name: str, value: float, weight: float = 1.0, **labels: str) -> None:
+        """Record a histogram observation."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = Histogram(self._families[name][2])
+            series.observe(value, weight)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Increment a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def add_collector(self, collect: Callable[[], Iterable[Sample]]) -> None:
+        """
+        Register a callable that reports gauges at scrape time.
+
+        Bound methods are held weakly, so a collector doesn't keep its
+        object alive.
+        """
+        ref = weakref.WeakMethod(collect) if inspect.ismethod(collect) else (lambda: collect)
+        with self._lock:
+            self._collectors.append(ref)
+
+    def histograms(self, name: str = OPERATION_SECONDS) -> Dict[str, Histogram]:
+        """Get a copy of a histogram family's series by their first label value."""
+        with self._lock:
+            result = {}
+            for (family, labels), series in self._series.items():
+                if family == name:
+                    copy = Histogram(series.bounds)
+                    copy.counts, copy.sum, copy.count = list(series.counts), series.sum, series.count
+                    result[labels[0][1] if labels else ""] = copy
+            return result
+
+    def collect(self) -> List[Sample]:
+        """Run the collectors and return their samples, dropping collectors whose object is gone."""
+        samples: List[Sample] = []
+        with self._lock:
+            collectors = list(self._collectors)
+        for ref in collectors:
+            collect = ref()
+            if collect is None:
+                with self._lock:
+                    self._collectors.remove(ref)
+                continue
+            try:
+                samples.extend(collect())
+            except Exception as e:
+                logging.error(f"Error collecting metrics: {str(e)}")
+        return samples
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            series = sorted(self._series.items(), key=lambda item: item[0])
+        by_family: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], Any]]] = {}
+        for (name, labels), value in series:
+            by_family.setdefault(name, []).append((labels, value))
+
+        for name, members in by_family.items():
+            kind, help_text, _ = self._families[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in members:
+                if kind == "counter":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0.0
+                for bound, n in zip(value.bounds + (math.inf,), value.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == math.inf else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {_number(value.count)}")
+
+        # Samples of one family must be contiguous
+        collected: Dict[str, List[Sample]] = {}
+        for sample in self.collect():
+            collected.setdefault(sample[0], []).append(sample)
+        for name, samples in collected.items():
+            lines.append(f"# HELP {name} {samples[0][2]}")
+            lines.append(f"# TYPE {name} {samples[0][1]}")
+            for _, _, _, labels, value in samples:
+                lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+class RerunTrace:
+    """The timed spans of one script run, in the order they started."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # (name, depth, milliseconds)
+        self.spans: List[Tuple[str, int, float]] = []
+        self.depth = 0
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+def start_trace() -> RerunTrace:
+    """Start collecting the spans timed on this thread, e.g. at the top of a script run."""
+    trace = _local.trace = RerunTrace()
+    return trace
+
+
+def current_trace() -> Optional[RerunTrace]:
+    """Get the trace collecting spans on this thread, if any."""
+    return getattr(_local, "trace", None)
+
+
+class timed:
+    """
+    Time an operation, as a decorator or a context manager.
+
+        @timed("connector.get_jobs")
+        def get_jobs(...): ...
+
+        with timed("page.home"):
+            ...
+
+    The latency goes into the jobwave_operation_seconds histogram (sampled)
+    and, when a trace is active on the thread, into the rerun breakdown.
+    Exceptions are counted in jobwave_operation_errors_total and re-raised.
+    start() and stop() time code that can't be wrapped in a block.
+    """
+
+    __slots__ = ("name", "registry", "_started", "_weight", "_trace", "_index")
+
+    def __init__(self, name: str, registry: MetricsRegistry = REGISTRY):
+        self.name = name
+        self.registry = registry
+        self._started = 0.0
+
+    def __call__(self, function: Callable) -> Callable:
+        name, registry = self.name, self.registry
+
+        if inspect.isgeneratorfunction(function):
+            # Time the whole iteration, not just creating the generator
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                with timed(name, registry):
+                    yield from function(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            weight = registry.sample()
+            if not weight and getattr(_local, "trace", None) is None:
+                # Unsampled call outside a traced run: no clock reads at all
+                return function(*args, **kwargs)
+            timer = timed(name, registry).start(weight)
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as e:
+                timer.__exit__(type(e), e, None)
+                raise
+            timer.stop()
+            return result
+        return wrapper
+
+    def start(self, weight: Optional[float] = None) -> "timed":
+        self._weight = self.registry.sample() if weight is None else weight
+        self._trace = current_trace()
+        if self._trace is not None:
+            self._index = len(self._trace.spans)
+            self._trace.spans.append((self.name, self._trace.depth, 0.0))
+            self._trace.depth += 1
+        self._started = time.perf_counter()
+        return self
+
+    def stop(self, failed: bool = False) -> float:
+        """Record the span and return its duration in seconds."""
+        elapsed = time.perf_counter() - self._started
+        if self._weight:
+            self.registry.observe(OPERATION_SECONDS, elapsed, self._weight, op=self.name)
+            if failed:
+                self.registry.inc(OPERATION_ERRORS, self._weight, op=self.name)
+        if self._trace is not None:
+            self._trace.depth -= 1
+            self._trace.spans[self._index] = (self.name, self._trace.depth, elapsed * 1000)
+        return elapsed
+
+    def __enter__(self) -> "timed":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Streamlit's rerun and stop signals and abandoned generators aren't failures
+        self.stop(failed=exc_type is not None and not issubclass(exc_type, GeneratorExit)
+                  and not exc_type.__name__.endswith(("RerunException", "StopException")))
+
+
+def instrument_class(prefix: str, exclude: Iterable[str] = ()) -> Callable[[type], type]:
+    """
+    Class decorator that times every method defined on the class.
+
+    Args:
+        prefix: Operation name prefix, e.g. "connector" gives "connector.get_jobs"
+        exclude: Method names left untouched, e.g. trivial accessors
+
+    Returns:
+        The decorator
+    """
+    excluded = set(exclude)
+
+    def decorate(cls: type) -> type:
+        for name, member in list(vars(cls).items()):
+            if name.startswith("__") or name in excluded or not inspect.isfunction(member):
+                continue
+            setattr(cls, name, timed(f"{prefix}.{name.lstrip('_')}")(member))
+        return cls
+    return decorate
+
+
+def instrument_http_client(session: Any, registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Record database API response sizes from an httpx client's Content-Length headers.
+
+    Args:
+        session: The httpx.Client or httpx.AsyncClient used by the PostgREST client
+        registry: Registry receiving the jobwave_http_response_bytes histogram
+    """
+    def on_response(response) -> None:
+        length = response.headers.get("content-length")
+        weight = registry.sample()
+        if length is not None and weight:
+            table = response.request.url.path.rstrip("/").rsplit("/", 1)[-1]
+            registry.observe(HTTP_RESPONSE_BYTES, int(length), weight, table=table)
+
+    hook = on_response
+    if inspect.iscoroutinefunction(getattr(session, "send", None)):
+        # An AsyncClient awaits its hooks
+        async def hook(response) -> None:
+            on_response(response)
+
+    session.event_hooks.setdefault("response", []).append(hook)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Serve the registry on http://host:port/metrics from a background thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind; local only by default
+        registry: Registry to expose
+
+    Returns:
+        The running server
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,365 @@
+"""
+Bulk import of partner job feeds.
+
+Usage:
+    python -m job_import feed.csv --batch-size 500 --concurrency 4
+
+Rows are streamed from a CSV or JSON Lines file (optionally gzipped),
+validated and normalized one at a time, grouped into batches and upserted
+into the jobs table on the external_key column. At most `concurrency`
+batches are in flight and the reader blocks once that many more are
+queued, so memory stays constant whatever the size of the file.
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from normalization import normalize_job
+
+# Columns an import may set; anything else in the feed is dropped
+IMPORT_COLUMNS = (
+    "external_key", "title", "company", "location", "job_type", "experience_level",
+    "salary", "salary_min", "salary_max", "posted_at", "skills", "description",
+)
+REQUIRED_COLUMNS = ("external_key", "title", "company")
+JOB_TYPES = ("Full-time", "Part-time", "Contract", "Internship")
+
+# Upsert conflict target; the jobs table needs a unique index on it
+CONFLICT_KEY = "external_key"
+
+# Longest value accepted for each text column
+MAX_LENGTHS = {"external_key": 200, "title": 200, "company": 200, "location": 200, "description": 20000}
+
+# Postgres error classes that fail the same way on every retry:
+# data exceptions, integrity violations, syntax and permission errors
+_PERMANENT_ERROR_CLASSES = ("22", "23", "42")
+
+# PostgREST's own errors are about the request itself, e.g. an unknown
+# column or a bad JWT, except group 0: the database couldn't be reached
+_POSTGREST_ERROR_PREFIX = "PGRST"
+_POSTGREST_CONNECTION_ERRORS = "PGRST0"
+
+# Invalid rows kept in the report, so a bad feed doesn't grow it without bound
+MAX_REPORTED_ERRORS = 100
+
+
+class JobValidationError(ValueError):
+    """Raised when a feed row can't be turned into a job."""
+
+
+@dataclass
+class ImportReport:
+    """Progress and outcome of a bulk import."""
+
+    rows_read: int = 0
+    rows_invalid: int = 0
+    rows_duplicate: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the import started, or its total duration once finished."""
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput so far."""
+        return self.rows_written / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summarize the report for logging or JSON output."""
+        return {
+            "rows_read": self.rows_read,
+            "rows_invalid": self.rows_invalid,
+            "rows_duplicate": self.rows_duplicate,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "batches": self.batches,
+            "retries": self.retries,
+            "elapsed_seconds": round(self.elapsed, 2),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": [{"row": row, "error": error} for row, error in self.errors],
+        }
+
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rows of a CSV or JSON Lines feed.
+
+    The format is picked from the extension (.csv, .jsonl or .ndjson, each
+    optionally followed by .gz). Blank JSONL lines are skipped.
+
+    Args:
+        path: Path of the feed file
+
+    Yields:
+        One dict per row
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    raw = gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+    with io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as handle:
+        if name.endswith(".csv"):
+            yield from csv.DictReader(handle)
+        elif name.endswith((".jsonl", ".ndjson")):
+            for number, line in enumerate(handle, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        # Surface as an invalid row instead of aborting the import
+                        yield {"_error": f"Line {number} is not valid JSON: {e.msg}"}
+        else:
+            raise ValueError(f"Unsupported feed format: {path}")
+
+
+def _text(row: Dict[str, Any], column: str) -> Optional[str]:
+    value = row.get(column)
+    if value is None:
+        return None
+    value = " ".join(str(value).split()) if column != "description" else str(value).strip()
+    if len(value) > MAX_LENGTHS.get(column, 500):
+        raise JobValidationError(f"{column} is longer than {MAX_LENGTHS.get(column, 500)} characters")
+    return value or None
+
+
+def _amount(row: Dict[str, Any], column: str) -> Optional[int]:
+    value = row.get(column)
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(str(value).replace(",", "")))
+    except ValueError:
+        raise JobValidationError(f"{column} is not a number: {value!r}")
+
+
+def validate_job(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a raw feed row into a normalized jobs row.
+
+    Text is whitespace-collapsed, skills may be a list or a comma-separated
+    string, explicit salary_min/salary_max win over the parsed salary text,
+    and region and country_code are derived from the location.
+
+    Args:
+        row: A row from read_rows
+
+    Returns:
+        The row restricted to IMPORT_COLUMNS, ready to upsert
+
+    Raises:
+        JobValidationError: If a required column is missing or a value is malformed
+    """
+    if "_error" in row:
+        raise JobValidationError(row["_error"])
+
+    job: Dict[str, Any] = {}
+    for column in IMPORT_COLUMNS:
+        if column in ("salary_min", "salary_max", "skills"):
+            continue
+        value = _text(row, column)
+        if value is not None:
+            job[column] = value
+    missing = [column for column in REQUIRED_COLUMNS if column not in job]
+    if missing:
+        raise JobValidationError(f"Missing {', '.join(missing)}")
+    if "job_type" in job and job["job_type"] not in JOB_TYPES:
+        raise JobValidationError(f"Unknown job_type: {job['job_type']!r}")
+
+    skills = row.get("skills")
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    if skills:
+        job["skills"] = [skill.strip() for skill in skills if str(skill).strip()]
+
+    job = normalize_job(job)
+    minimum, maximum = _amount(row, "salary_min"), _amount(row, "salary_max")
+    if minimum is not None or maximum is not None:
+        job["salary_min"] = minimum if minimum is not None else maximum
+        job["salary_max"] = maximum if maximum is not None else minimum
+        if job["salary_min"] > job["salary_max"]:
+            raise JobValidationError("salary_min is greater than salary_max")
+    return job
+
+
+def is_retryable(error: Exception) -> bool:
+    """Tell whether a failed batch write is worth retrying."""
+    code = str(getattr(error, "code", "") or "")
+    if code.startswith(_POSTGREST_ERROR_PREFIX):
+        return code.startswith(_POSTGREST_CONNECTION_ERRORS)
+    return not code.startswith(_PERMANENT_ERROR_CLASSES)
+
+
+class JobImporter:
+    """
+    Streams validated jobs into the database in batched, concurrent upserts.
+
+    Batches are written on a small thread pool. A semaphore caps the batches
+    that are queued or in flight, so the reader waits for the database
+    instead of buffering the feed. Failed batches are retried with full
+    jitter exponential backoff. Rows sharing an external key within a batch
+    are collapsed to the last one, since a single upsert can't touch the
+    same row twice; across batches the upsert itself dedupes them.
+    """
+
+    def __init__(
+        self,
+        upsert: Callable[[List[Dict[str, Any]]], Any],
+        batch_size: int = 500,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        on_progress: Optional[Callable[[ImportReport], None]] = None,
+        progress_interval: float = 2.0
+    ):
+        """
+        Initialize the importer.
+
+        Args:
+            upsert: Writes one batch of rows, raising on errors
+            batch_size: Rows per upsert request
+            concurrency: Upsert requests in flight at once
+            max_retries: Retries per batch before its rows count as failed
+            base_delay: Backoff ceiling in seconds for the first retry
+            max_delay: Largest backoff ceiling in seconds
+            on_progress: Called with the report at most every progress_interval seconds
+            progress_interval: Seconds between progress callbacks
+        """
+        self.upsert = upsert
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+
+    def run(self, rows: Iterable[Dict[str, Any]]) -> ImportReport:
+        """
+        Import a stream of raw feed rows.
+
+        Args:
+            rows: Rows as yielded by read_rows
+
+        Returns:
+            The finished report
+        """
+        report = ImportReport()
+        # One batch queued per worker on top of the ones being written
+        slots = threading.BoundedSemaphore(self.concurrency * 2)
+
+        def release(future: Future) -> None:
+            slots.release()
+            self._progress(report)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job-import") as pool:
+            for batch in self._batches(rows, report):
+                slots.acquire()
+                pool.submit(self._write, batch, report).add_done_callback(release)
+        report.finished = time.monotonic()
+        self._progress(report, force=True)
+        return report
+
+    def _batches(self, rows: Iterable[Dict[str, Any]], report: ImportReport) -> Iterator[List[Dict[str, Any]]]:
+        batch: Dict[str, Dict[str, Any]] = {}
+        for number, row in enumerate(rows, 1):
+            report.rows_read += 1
+            try:
+                job = validate_job(row)
+            except JobValidationError as e:
+                with self._lock:
+                    report.rows_invalid += 1
+                    if len(report.errors) < MAX_REPORTED_ERRORS:
+                        report.errors.append((number, str(e)))
+                continue
+            if job[CONFLICT_KEY] in batch:
+                report.rows_duplicate += 1
+            batch[job[CONFLICT_KEY]] = job
+            if len(batch) >= self.batch_size:
+                yield list(batch.values())
+                batch = {}
+        if batch:
+            yield list(batch.values())
+
+    def _write(self, batch: List[Dict[str, Any]], report: ImportReport) -> None:
+        attempt = 0
+        while True:
+            try:
+                self.upsert(batch)
+                with self._lock:
+                    report.rows_written += len(batch)
+                    report.batches += 1
+                return
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    logging.error(f"Error importing job batch of {len(batch)} rows: {str(e)}")
+                    with self._lock:
+                        report.rows_failed += len(batch)
+                        report.batches += 1
+                    return
+                # Full jitter keeps concurrent workers from retrying in lockstep
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                attempt += 1
+                with self._lock:
+                    report.retries += 1
+
+    def _progress(self, report: ImportReport, force: bool = False) -> None:
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_progress < self.progress_interval:
+                return
+            self._last_progress = now
+        try:
+            self.on_progress(report)
+        except Exception as e:
+            logging.error(f"Error reporting import progress: {str(e)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or JSON Lines feed, optionally gzipped")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-retries", type=int, default=5)
+    args = parser.parse_args()
+
+    from supabase_connector import SupabaseConnector
+
+    def progress(report: ImportReport) -> None:
+        print(
+            f"{report.rows_read} read, {report.rows_written} written, {report.rows_invalid} invalid, "
+            f"{report.rows_failed} failed ({report.rows_per_second:.0f} rows/s)",
+            flush=True
+        )
+
+    report = SupabaseConnector().import_jobs(
+        args.path,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        on_progress=progress
+    )
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Relative weight of each indexed field
+FIELD_WEIGHTS = {"title": 3.0, "company": 2.0, "description": 1.0}
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the to we with you your will".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+# Suffixes stripped by the stemmer, longest first
+_SUFFIXES = (
+    ("ational", "ate"), ("ization", "ize"), ("ments", ""), ("ment", ""), ("ings", ""), ("ing", ""),
+    ("ies", "y"), ("sses", "ss"), ("xes", "x"), ("ches", "ch"), ("shes", "sh"),
+    ("ers", ""), ("er", ""), ("ed", ""), ("ly", ""), ("s", ""),
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Reduce a word to a crude stem by stripping common English suffixes.
+
+    "developers", "developer" and "development" all become "develop".
+    """
+    if not word.isalpha():
+        return word
+    # Two passes so "engineering" and "engineer" meet at the same stem
+    for _ in range(2):
+        for suffix, replacement in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                if suffix == "s" and word.endswith(("ss", "us", "is")):
+                    return word
+                word = word[: len(word) - len(suffix)] + replacement
+                break
+        else:
+            return word
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase tokens, dropping stopwords."""
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class JobSearchIndex:
+    """
+    In-memory inverted index over job title, company and description.
+
+    Results are ranked with BM25 using field-weighted term frequencies. The
+    last query term also matches as a prefix, for type-ahead search. Jobs can
+    be added, updated and removed incrementally.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_prefix_expansions: int = 50):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            max_prefix_expansions: Maximum vocabulary terms a prefix expands to
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_prefix_expansions = max_prefix_expansions
+        self._postings: Dict[str, Dict[Any, float]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_terms: Dict[Any, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[Any, float] = {}
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, job_id: Any) -> bool:
+        return str(job_id) in self._doc_lengths
+
+    def build(self, jobs: Iterable[Any]) -> None:
+        """Replace the index contents with a snapshot of jobs."""
+        with self._lock:
+            self._postings.clear()
+            self._vocabulary = []
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0.0
+            for job in jobs:
+                self.add(job)
+
+    def add(self, job: Any) -> None:
+        """
+        Index a job, replacing any previous version with the same id.
+
+        Args:
+            job: A job dict or record with id, title, company and description
+        """
+        job_id = str(_field(job, "id"))
+        weighted: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field(job, field)):
+                weighted[stem(token)] += weight
+
+        with self._lock:
+            self.remove(job_id)
+            for term, tf in weighted.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._vocabulary, term)
+                postings[job_id] = tf
+            length = float(sum(weighted.values()))
+            self._doc_terms[job_id] = tuple(weighted)
+            self._doc_lengths[job_id] = length
+            self._total_length += length
+
+    def remove(self, job_id: Any) -> bool:
+        """
+        Remove a job from the index.
+
+        Args:
+            job_id: The job's ID
+
+        Returns:
+            True if the job was indexed
+        """
+        job_id = str(job_id)
+        with self._lock:
+            terms = self._doc_terms.pop(job_id, None)
+            if terms is None:
+                return False
+            for term in terms:
+                postings = self._postings[term]
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+                    del self._vocabulary[bisect_left(self._vocabulary, term)]
+            self._total_length -= self._doc_lengths.pop(job_id)
+            return True
+
+    def search(self, query: str, limit: int = 50, prefix: bool = True) -> List[Tuple[str, float]]:
+        """
+        Find the jobs matching every query term, best match first.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            prefix: Let the last term match any word it is a prefix of
+
+        Returns:
+            List of (job id, score) pairs
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            groups = [{stem(token)} for token in tokens]
+            if prefix:
+                groups[-1] = groups[-1] | set(self._expand_prefix(tokens[-1]))
+
+            candidates: Optional[Set[str]] = None
+            for group in groups:
+                matched: Set[str] = set()
+                for term in group:
+                    matched.update(self._postings.get(term, ()))
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return []
+
+            scores = {job_id: 0.0 for job_id in candidates}
+            for group in groups:
+                for term in group:
+                    self._score_term(term, scores)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _expand_prefix(self, token: str) -> List[str]:
+        start = bisect_left(self._vocabulary, token)
+        expansions = []
+        for term in self._vocabulary[start:start + self.max_prefix_expansions]:
+            if not term.startswith(token):
+                break
+            expansions.append(term)
+        return expansions
+
+    def _score_term(self, term: str, scores: Dict[str, float]) -> None:
+        postings = self._postings.get(term)
+        if not postings:
+            return
+        n = len(self._doc_lengths)
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        avg_length = self._total_length / n if n else 1.0
+        # Walk whichever side is smaller
+        if len(postings) < len(scores):
+            pairs = ((job_id, tf) for job_id, tf in postings.items() if job_id in scores)
+        else:
+            pairs = ((job_id, postings[job_id]) for job_id in scores if job_id in postings)
+        for job_id, tf in pairs:
+            norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[job_id] / avg_length)
+            scores[job_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+
+def _field(job: Any, name: str) -> Any:
+    if isinstance(job, dict):
+        return job.get(name)
+    return getattr(job, name, None)
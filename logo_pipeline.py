@@ -0,0 +1,327 @@
+import base64
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, BinaryIO, Callable, Dict, Optional, Set, Tuple
+
+from blob_store import BlobTooLarge, LocalBlobStore, iter_chunks
+
+# Namespace of company logos in the blob store
+LOGO_NAMESPACE = "logos"
+
+LOGO_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+MAX_LOGO_BYTES = 5 << 20
+
+# Uploads with more pixels are rejected before they are decoded
+MAX_LOGO_PIXELS = 40_000_000
+
+# Longest side in pixels of each variant. Cards show logos at 48 CSS
+# pixels and the company header at 160, so both stay sharp on 2x screens.
+LOGO_VARIANTS = {"header": 320, "card": 96}
+
+_MIME_TYPES = {"WEBP": "image/webp", "PNG": "image/png"}
+
+
+@lru_cache(maxsize=1)
+def variant_format() -> Tuple[str, str]:
+    """The format variants are encoded in and its key suffix: WebP where Pillow supports it, else PNG."""
+    from PIL import features
+    return ("WEBP", ".webp") if features.check("webp") else ("PNG", ".png")
+
+
+def variant_key(logo_key: str, variant: str) -> str:
+    """Key of a variant, derived from the original upload's key: logos/ab/<digest>.card.webp."""
+    return f"{os.path.splitext(logo_key)[0]}.{variant}{variant_format()[1]}"
+
+
+def render_variants(
+    path: str,
+    variants: Dict[str, int] = LOGO_VARIANTS,
+    max_pixels: int = MAX_LOGO_PIXELS
+) -> Dict[str, bytes]:
+    """
+    Decode an image once and encode every size variant of it.
+
+    JPEGs are decoded straight at the smallest scale that still covers the
+    largest variant. Variants are made largest first, each shrunk from the
+    previous one, so only the first resize works on the full image.
+
+    Args:
+        path: Local path of the uploaded PNG or JPEG
+        variants: Longest side in pixels by variant name
+        max_pixels: Reject images with more pixels than this
+
+    Returns:
+        Encoded variant by name
+
+    Raises:
+        ValueError: If the image has more than max_pixels pixels
+    """
+    # Imported on first use; cards of stored logos don't need Pillow
+    from PIL import Image, ImageOps
+
+    largest = max(variants.values())
+    with Image.open(path) as source:
+        if source.width * source.height > max_pixels:
+            raise ValueError(f"Image has more than {max_pixels} pixels")
+        source.draft("RGB", (largest, largest))
+        # Phone photos are often stored sideways with an orientation tag
+        image = ImageOps.exif_transpose(source)
+    transparent = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    image = image.convert("RGBA" if transparent else "RGB")
+
+    image_format, _ = variant_format()
+    rendered = {}
+    for name, size in sorted(variants.items(), key=lambda item: -item[1]):
+        image.thumbnail((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if image_format == "WEBP":
+            image.save(buffer, "WEBP", quality=85, method=4)
+        else:
+            image.save(buffer, "PNG", optimize=True)
+        rendered[name] = buffer.getvalue()
+    return rendered
+
+
+class LogoJob:
+    """
+    Handle on a logo moving through the pipeline, polled by the UI.
+
+    The status goes from uploading to processing, then saving while the
+    company write is queued, and ends at done or failed.
+    """
+
+    def __init__(self, owner_id: str, filename: str):
+        self.owner_id = owner_id
+        self.filename = filename
+        self.key: Optional[str] = None
+        self.size = 0
+        self.duplicate = False
+        self.error: Optional[str] = None
+        self.ticket = None
+        self._status = "uploading"
+        self._finished = threading.Event()
+
+    @property
+    def status(self) -> str:
+        """Current status; saving turns into done once the company write is stored."""
+        if self._status == "saving" and self.ticket is not None and self.ticket.done():
+            if not self.ticket.succeeded:
+                self.error = self.ticket.error
+                return "failed"
+            return "done"
+        return self._status
+
+    def done(self) -> bool:
+        """Tell whether the job finished, successfully or not."""
+        return self.status in ("done", "failed")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the variants are stored and the company write queued.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if processing succeeded
+        """
+        self._finished.wait(timeout)
+        return self._status == "saving"
+
+    def _fail(self, error: str) -> None:
+        self.error = error
+        self._status = "failed"
+        self._finished.set()
+
+
+class LogoPipeline:
+    """
+    Turns logo uploads into small variants off the rerun thread and serves them to cards.
+
+    An upload is streamed into the content-addressed blob store by a
+    thread, decoded once, and stored as a card and a header variant under
+    keys derived from the upload's digest. A logo uploaded again finds its
+    variants stored and skips decoding. Pillow releases the GIL while it
+    decodes, resizes and encodes, so threads are enough here.
+
+    Cards embed the card variant as a data URI, which is kept in a bounded
+    LRU so hot logos are read from disk once per process. A variant that
+    isn't stored, e.g. after the encoding format changed, is rendered again
+    in the background and the card goes without a logo meanwhile.
+    """
+
+    def __init__(
+        self,
+        store: LocalBlobStore,
+        on_processed: Callable[[str, Dict[str, Any]], Any],
+        max_workers: int = 2,
+        max_bytes: int = MAX_LOGO_BYTES,
+        max_thumbnails: int = 2048
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            store: Where uploads and variants are stored
+            on_processed: Called with the owner id and {"logo_key": key} once the
+                variants are stored; returns a WriteTicket for the company write
+            max_workers: Threads decoding and encoding images
+            max_bytes: Largest accepted upload
+            max_thumbnails: Variant data URIs kept in memory
+        """
+        self.store = store
+        self.on_processed = on_processed
+        self.max_bytes = max_bytes
+        self.max_thumbnails = max_thumbnails
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="logo")
+        self._thumbnails: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        # Logos whose variants are being rendered again, or couldn't be
+        self._rendering: Set[str] = set()
+        self._unrenderable: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stats = {"uploads": 0, "duplicates": 0, "rendered": 0, "failed": 0, "hits": 0, "misses": 0}
+
+    def submit(self, owner_id: str, file: BinaryIO, filename: str) -> LogoJob:
+        """
+        Start storing and resizing an upload.
+
+        Args:
+            owner_id: The employer whose company gets the logo
+            file: The uploaded file, e.g. from st.file_uploader
+            filename: Its original name, for the file type
+
+        Returns:
+            A job handle to poll
+        """
+        job = LogoJob(owner_id, filename)
+        suffix = os.path.splitext(filename)[1].lower()
+        if suffix not in LOGO_SUFFIXES:
+            job._fail(f"Unsupported file type: {suffix or filename}")
+            return job
+        self._executor.submit(self._process, job, file, ".jpg" if suffix == ".jpeg" else suffix)
+        return job
+
+    def _process(self, job: LogoJob, file: BinaryIO, suffix: str) -> None:
+        try:
+            blob = self.store.put_stream(LOGO_NAMESPACE, iter_chunks(file), suffix, self.max_bytes)
+        except BlobTooLarge as e:
+            job._fail(str(e))
+            return
+        except Exception as e:
+            logging.error(f"Error storing logo: {str(e)}")
+            job._fail("The logo could not be stored")
+            return
+        job.key, job.size = blob.key, blob.size
+        job._status = "processing"
+        with self._lock:
+            self._stats["uploads"] += 1
+
+        job.duplicate = all(self.store.exists(variant_key(blob.key, variant)) for variant in LOGO_VARIANTS)
+        if job.duplicate:
+            with self._lock:
+                self._stats["duplicates"] += 1
+        elif not self._render(blob.key):
+            job._fail("The logo could not be read as an image")
+            return
+
+        try:
+            job.ticket = self.on_processed(job.owner_id, {"logo_key": blob.key})
+        except Exception as e:
+            logging.error(f"Error saving company logo: {str(e)}")
+            job._fail("The logo could not be saved")
+            return
+        job._status = "saving"
+        job._finished.set()
+
+    def _render(self, logo_key: str) -> bool:
+        """Render and store the variants of a stored upload, priming the thumbnail cache."""
+        try:
+            rendered = render_variants(self.store.local_path(logo_key))
+            for variant, data in rendered.items():
+                self.store.put_derived(variant_key(logo_key, variant), data)
+        except Exception as e:
+            logging.error(f"Error rendering logo {logo_key}: {str(e)}")
+            with self._lock:
+                self._stats["failed"] += 1
+                self._unrenderable.add(logo_key)
+            return False
+        with self._lock:
+            self._stats["rendered"] += 1
+            self._remember((logo_key, "card"), self._data_uri(rendered["card"]))
+        return True
+
+    def _rerender(self, logo_key: str) -> None:
+        try:
+            self._render(logo_key)
+        finally:
+            with self._lock:
+                self._rendering.discard(logo_key)
+
+    @staticmethod
+    def _data_uri(data: bytes) -> str:
+        mime = _MIME_TYPES[variant_format()[0]]
+        return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+    def _remember(self, key: Tuple[str, str], uri: str) -> None:
+        """Cache a data URI; the caller holds the lock."""
+        self._thumbnails[key] = uri
+        self._thumbnails.move_to_end(key)
+        while len(self._thumbnails) > self.max_thumbnails:
+            self._thumbnails.popitem(last=False)
+
+    def thumbnail(self, logo_key: Optional[str], variant: str = "card") -> Optional[str]:
+        """
+        Return a variant of a stored logo as a data URI for an <img> tag.
+
+        Args:
+            logo_key: Key of the original upload, as saved on the company
+            variant: Name of the size variant, e.g. "card" or "header"
+
+        Returns:
+            The data URI, or None if there is no logo or its variant isn't ready
+        """
+        if not logo_key:
+            return None
+        key = (logo_key, variant)
+        with self._lock:
+            uri = self._thumbnails.get(key)
+            if uri is not None:
+                self._thumbnails.move_to_end(key)
+                self._stats["hits"] += 1
+                return uri
+            self._stats["misses"] += 1
+            if logo_key in self._rendering or logo_key in self._unrenderable:
+                return None
+
+        try:
+            with open(self.store.local_path(variant_key(logo_key, variant)), "rb") as file:
+                uri = self._data_uri(file.read())
+        except Exception:
+            with self._lock:
+                if logo_key in self._rendering:
+                    return None
+                self._rendering.add(logo_key)
+            self._executor.submit(self._rerender, logo_key)
+            return None
+        with self._lock:
+            self._remember(key, uri)
+        return uri
+
+    def stats(self) -> Dict[str, Any]:
+        """Return upload, render and thumbnail cache counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["thumbnails"] = len(self._thumbnails)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the processing threads."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+
+# Animations hard-coded by the app pages
+SIDEBAR_LOTTIE_URL = "https://assets5.lottiefiles.com/packages/lf20_kkflmtur.json"
+HOME_LOTTIE_URL = "https://assets3.lottiefiles.com/packages/lf20_nehbumrv.json"
+LANDING_LOTTIE_URL = "https://assets10.lottiefiles.com/packages/lf20_sSF6EG.json"
+
+PRELOAD_URLS = (SIDEBAR_LOTTIE_URL, HOME_LOTTIE_URL, LANDING_LOTTIE_URL)
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(_BASE_DIR, ".cache", "lottie")
+BUNDLED_DIR = os.path.join(_BASE_DIR, "assets", "lottie")
+FALLBACK_FILE = "fallback.json"
+
+
+def url_key(url: str) -> str:
+    """Return the stable file key used for a Lottie URL."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    """A cached animation plus the validators needed to revalidate it."""
+
+    __slots__ = ("data", "etag", "last_modified", "expires_at")
+
+    def __init__(self, data: Any, etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+
+class LottieCache:
+    """
+    Two-level cache for Lottie animation JSON.
+
+    Lookups hit an in-process LRU first, then an on-disk store keyed by URL.
+    Expired entries are revalidated with ETag/If-Modified-Since, and when the
+    CDN can't be reached the last known copy (or a bundled fallback) is served.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl: float = 24 * 60 * 60,
+        max_entries: int = 32,
+        timeout: float = 5.0,
+        error_backoff: float = 60.0,
+        offline: bool = False,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the on-disk store
+            ttl: Seconds an animation is served without revalidation
+            max_entries: Maximum number of animations kept in memory
+            timeout: Network timeout in seconds for a single fetch
+            error_backoff: Seconds to wait before retrying a failed URL
+            offline: Never touch the network, serve disk or bundled copies only
+            session: Optional requests session to reuse connections
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.error_backoff = error_backoff
+        self.offline = offline
+        self.session = session or requests.Session()
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            logging.error(f"Error creating Lottie cache directory: {str(e)}")
+
+    def get(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get an animation, fetching it only when no fresh copy exists.
+
+        Args:
+            url: The Lottie JSON URL
+            timeout: Optional network timeout overriding the default
+
+        Returns:
+            The animation JSON, or None if nothing could be served
+        """
+        now = time.time()
+        entry = self._memory_get(url)
+        if entry is None:
+            entry = self._disk_read(url)
+            if entry is not None:
+                self._memory_put(url, entry)
+
+        if entry is not None and (entry.is_fresh(now) or self.offline):
+            return entry.data
+
+        if self.offline:
+            return self._bundled(url)
+
+        refreshed = self._fetch(url, entry, timeout)
+        if refreshed is not None:
+            return refreshed.data
+
+        # Network failed: keep serving what we have and back off for a while
+        # so subsequent reruns don't pay the failed round trip again.
+        if entry is None:
+            entry = _Entry(self._bundled(url), None, None, 0.0)
+        entry.expires_at = now + self.error_backoff
+        self._memory_put(url, entry)
+        return entry.data
+
+    def preload(self, urls: Iterable[str] = PRELOAD_URLS, background: bool = True) -> None:
+        """
+        Warm the cache for the given URLs.
+
+        Args:
+            urls: URLs to load
+            background: Run the preload on a daemon thread
+        """
+        urls = list(urls)
+
+        def _run():
+            for url in urls:
+                self.get(url)
+
+        if background:
+            threading.Thread(target=_run, name="lottie-preload", daemon=True).start()
+        else:
+            _run()
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (disk copies are kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    # Internal helpers
+    def _memory_get(self, url: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+            return entry
+
+    def _memory_put(self, url: str, entry: _Entry) -> None:
+        with self._lock:
+            self._memory[url] = entry
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, url_key(url) + ".json")
+
+    def _disk_read(self, url: str) -> Optional[_Entry]:
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.error(f"Error reading cached Lottie file {path}: {str(e)}")
+            return None
+
+        return _Entry(
+            record.get("data"),
+            record.get("etag"),
+            record.get("last_modified"),
+            record.get("fetched_at", 0.0) + self.ttl,
+        )
+
+    def _disk_write(self, url: str, entry: _Entry, fetched_at: float) -> None:
+        record = {
+            "url": url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": fetched_at,
+            "data": entry.data,
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(url))
+        except OSError as e:
+            logging.error(f"Error writing cached Lottie file: {str(e)}")
+
+    def _fetch(self, url: str, entry: Optional[_Entry], timeout: Optional[float]) -> Optional[_Entry]:
+        headers = {}
+        if entry is not None and entry.data is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            r = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+            now = time.time()
+            if r.status_code == 304 and entry is not None:
+                refreshed = _Entry(entry.data, entry.etag, entry.last_modified, now + self.ttl)
+            elif r.status_code == 200:
+                refreshed = _Entry(
+                    r.json(),
+                    r.headers.get("ETag"),
+                    r.headers.get("Last-Modified"),
+                    now + self.ttl,
+                )
+            else:
+                logging.error(f"Unexpected status {r.status_code} fetching Lottie animation {url}")
+                return None
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Error fetching Lottie animation {url}: {str(e)}")
+            return None
+
+        self._memory_put(url, refreshed)
+        self._disk_write(url, refreshed, now)
+        return refreshed
+
+    def _bundled(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the animation shipped with the app for a URL, or the generic fallback."""
+        for name in (url_key(url) + ".json", FALLBACK_FILE):
+            path = os.path.join(BUNDLED_DIR, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logging.error(f"Error reading bundled Lottie file {path}: {str(e)}")
+        return None
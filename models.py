@@ -0,0 +1,297 @@
+import math
+import re
+import sys
+from array import array
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from normalization import normalize_location, parse_salary
+
+_RATING_RE = re.compile(r"(\d+(?:\.\d+)?)")
+_RELATIVE_RE = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago")
+_RELATIVE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+
+def parse_datetime(value: Any, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp or a relative time like "2 days ago".
+
+    Args:
+        value: ISO string, datetime, or relative time text
+        now: Reference time for relative values
+
+    Returns:
+        A timezone-aware datetime, or None if the value can't be parsed
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except ValueError:
+        pass
+
+    match = _RELATIVE_RE.search(text.lower().replace("a week", "1 week"))
+    if match:
+        now = now or datetime.now(timezone.utc)
+        return now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2)]
+    return None
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Parse an ISO date, returning None if it can't be parsed."""
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+_FIELD_NAMES: Dict[type, frozenset] = {}
+
+
+def _known(cls, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the keys of a row that are fields of a record type."""
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = frozenset(f.name for f in fields(cls))
+    return {key: value for key, value in row.items() if key in names and value is not None}
+
+
+# Low-cardinality job columns shared across rows via sys.intern
+_INTERNED_JOB_FIELDS = ("company", "location", "job_type", "experience_level", "salary", "salary_currency")
+
+# Profile columns stored as lists
+_PROFILE_LIST_FIELDS = ("skills", "preferred_titles", "preferred_job_types", "preferred_locations")
+
+
+class _Record:
+    """Shared helpers for the record types."""
+
+    __slots__ = ()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Dict-style access, for code that still treats records as rows."""
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def to_row(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable database row."""
+        row = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, _Record):
+                continue
+            row[f.name] = value
+        return row
+
+
+@dataclass(frozen=True, slots=True)
+class Job(_Record):
+    """A job posting."""
+
+    id: str
+    title: str = ""
+    company: str = ""
+    location: str = ""
+    job_type: str = ""
+    experience_level: str = ""
+    salary: str = ""
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: str = ""
+    posted_at: Optional[datetime] = None
+    description: str = ""
+    region: str = ""
+    country_code: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any], now: Optional[datetime] = None) -> "Job":
+        """Build a Job from a database row or fixture dict."""
+        values = _known(cls, row)
+        values["id"] = str(row.get("id", ""))
+        values["posted_at"] = parse_datetime(row.get("posted_at") or row.get("posted"), now)
+        if values.get("salary_min") is None and values.get("salary_max") is None:
+            values["salary_min"], values["salary_max"] = parse_salary(row.get("salary"))
+        if not values.get("region") and values.get("location"):
+            # Rows written before locations were normalized at ingestion
+            location = normalize_location(values["location"])
+            values["region"], values["country_code"] = location.region, location.country_code
+        for name in _INTERNED_JOB_FIELDS:
+            if isinstance(values.get(name), str):
+                values[name] = sys.intern(values[name])
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class Company(_Record):
+    """A company profile."""
+
+    id: str
+    name: str = ""
+    industry: str = ""
+    location: str = ""
+    company_size: str = ""
+    rating: Optional[float] = None
+    open_jobs: int = 0
+    website: str = ""
+    founded_year: Optional[int] = None
+    description: str = ""
+    logo_key: str = ""
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Company":
+        """Build a Company from a database row or fixture dict."""
+        values = _known(cls, row)
+        values["id"] = str(row.get("id", ""))
+        rating = row.get("rating")
+        if isinstance(rating, str):
+            # Fixtures store ratings as "4.8/5"
+            match = _RATING_RE.match(rating)
+            rating = float(match.group(1)) if match else None
+        values["rating"] = rating
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class Application(_Record):
+    """A job application, with its job resolved when available."""
+
+    id: str
+    job_id: str = ""
+    user_id: str = ""
+    status: str = ""
+    applied_date: Optional[date] = None
+    next_step: str = ""
+    job_title: str = ""
+    company: str = ""
+    job: Optional[Job] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any], job: Optional[Job] = None) -> "Application":
+        """Build an Application from a database row, using an embedded job if present."""
+        values = _known(cls, row)
+        embedded = row.get("jobs")
+        if job is None and isinstance(embedded, dict):
+            job = Job.from_row(embedded)
+        values["id"] = str(row.get("id", ""))
+        values["job_id"] = str(row.get("job_id") or (job.id if job else ""))
+        values["applied_date"] = parse_date(row.get("applied_date"))
+        values["job"] = job
+        if job is not None:
+            values.setdefault("job_title", job.title)
+            values.setdefault("company", job.company)
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class Profile(_Record):
+    """A user profile."""
+
+    user_id: str
+    first_name: str = ""
+    last_name: str = ""
+    email: str = ""
+    phone: str = ""
+    city: str = ""
+    country: str = ""
+    about: str = ""
+    website: str = ""
+    role: str = "jobseeker"
+    skills: Tuple[str, ...] = ()
+    experience_level: str = ""
+    preferred_titles: Tuple[str, ...] = ()
+    preferred_job_types: Tuple[str, ...] = ()
+    preferred_locations: Tuple[str, ...] = ()
+    salary_expectation: str = ""
+    resume_key: str = ""
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Profile":
+        """Build a Profile from a database row or fixture dict."""
+        values = _known(cls, row)
+        values["user_id"] = str(row.get("user_id", ""))
+        for name in _PROFILE_LIST_FIELDS:
+            if isinstance(values.get(name), (list, tuple)):
+                values[name] = tuple(values[name])
+            elif isinstance(values.get(name), str):
+                values[name] = tuple(item.strip() for item in values[name].split(",") if item.strip())
+        return cls(**values)
+
+
+class JobBatch:
+    """
+    Columnar storage for large job listings.
+
+    Holds the card columns of many jobs in parallel arrays instead of one
+    object per row. Repeated strings (companies, locations, job types) are
+    interned and numbers live in typed arrays. Descriptions are not kept.
+    """
+
+    __slots__ = ("ids", "titles", "companies", "locations", "job_types", "salaries",
+                 "salary_min", "salary_max", "posted_at")
+
+    _NO_NUMBER = -1
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.companies: List[str] = []
+        self.locations: List[str] = []
+        self.job_types: List[str] = []
+        self.salaries: List[str] = []
+        self.salary_min = array("q")
+        self.salary_max = array("q")
+        self.posted_at = array("d")
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Any]) -> "JobBatch":
+        """Build a batch from Job records or rows, consuming them one at a time."""
+        batch = cls()
+        for job in jobs:
+            batch.append(job if isinstance(job, Job) else Job.from_row(job))
+        return batch
+
+    def append(self, job: Job) -> None:
+        self.ids.append(job.id)
+        self.titles.append(sys.intern(job.title))
+        self.companies.append(sys.intern(job.company))
+        self.locations.append(sys.intern(job.location))
+        self.job_types.append(sys.intern(job.job_type))
+        self.salaries.append(sys.intern(job.salary))
+        self.salary_min.append(self._NO_NUMBER if job.salary_min is None else job.salary_min)
+        self.salary_max.append(self._NO_NUMBER if job.salary_max is None else job.salary_max)
+        self.posted_at.append(job.posted_at.timestamp() if job.posted_at else math.nan)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> Job:
+        posted_at = self.posted_at[i]
+        return Job(
+            id=self.ids[i],
+            title=self.titles[i],
+            company=self.companies[i],
+            location=self.locations[i],
+            job_type=self.job_types[i],
+            salary=self.salaries[i],
+            salary_min=None if self.salary_min[i] == self._NO_NUMBER else self.salary_min[i],
+            salary_max=None if self.salary_max[i] == self._NO_NUMBER else self.salary_max[i],
+            posted_at=None if math.isnan(posted_at) else datetime.fromtimestamp(posted_at, timezone.utc),
+        )
+
+    def __iter__(self) -> Iterator[Job]:
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,375 @@
+import re
+import threading
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Salaries are normalized to annual amounts in this currency
+BASE_CURRENCY = "USD"
+
+# Units of BASE_CURRENCY per unit of each currency. Static rates are good
+# enough to bucket salaries; override them via parse_salary_range(rates=...).
+FX_RATES = {
+    "USD": 1.0,
+    "EUR": 1.08,
+    "GBP": 1.27,
+    "CHF": 1.12,
+    "CAD": 0.73,
+    "AUD": 0.66,
+    "SGD": 0.74,
+    "INR": 0.012,
+    "JPY": 0.0067,
+}
+
+_CURRENCY_SYMBOLS = (
+    ("CA$", "CAD"), ("A$", "AUD"), ("S$", "SGD"),
+    ("€", "EUR"), ("£", "GBP"), ("₹", "INR"), ("¥", "JPY"), ("$", "USD"),
+)
+_CURRENCY_CODE_RE = re.compile(r"\b(" + "|".join(FX_RATES) + r")\b", re.IGNORECASE)
+_AMOUNT_RE = re.compile(r"(\d+(?:,\d+)+|\d+(?:\.\d+)?)\s*([kKmM]?)(?![a-zA-Z])")
+_PERIODS = (
+    (re.compile(r"/\s*h(ou)?r|per hour|hourly|an hour"), 2080),
+    (re.compile(r"/\s*day|per day|daily"), 260),
+    (re.compile(r"/\s*mo(nth)?|per month|monthly"), 12),
+)
+
+# Region values offered by the Location selectbox
+REGIONS = ("Remote", "USA", "Europe", "Asia", "Other")
+
+_COUNTRY_NAMES = {
+    "usa": "US", "us": "US", "u.s.": "US", "united states": "US", "america": "US",
+    "canada": "CA", "uk": "GB", "united kingdom": "GB", "england": "GB", "ireland": "IE",
+    "germany": "DE", "france": "FR", "spain": "ES", "italy": "IT", "netherlands": "NL",
+    "portugal": "PT", "poland": "PL", "sweden": "SE", "switzerland": "CH", "austria": "AT",
+    "belgium": "BE", "denmark": "DK", "norway": "NO", "finland": "FI",
+    "india": "IN", "china": "CN", "japan": "JP", "singapore": "SG", "south korea": "KR",
+    "korea": "KR", "hong kong": "HK", "vietnam": "VN", "philippines": "PH", "indonesia": "ID",
+    "malaysia": "MY", "thailand": "TH", "australia": "AU", "brazil": "BR", "mexico": "MX",
+}
+_REGION_COUNTRIES = {
+    "USA": {"US"},
+    "Europe": {"GB", "IE", "DE", "FR", "ES", "IT", "NL", "PT", "PL", "SE", "CH", "AT", "BE", "DK", "NO", "FI"},
+    "Asia": {"IN", "CN", "JP", "SG", "KR", "HK", "VN", "PH", "ID", "MY", "TH"},
+}
+# Locations often name a city or state without the country
+_PLACES = {
+    "new york": "US", "nyc": "US", "san francisco": "US", "seattle": "US", "chicago": "US",
+    "austin": "US", "boston": "US", "los angeles": "US", "denver": "US", "atlanta": "US",
+    "ny": "US", "ca": "US", "tx": "US", "wa": "US", "ma": "US", "il": "US",
+    "london": "GB", "berlin": "DE", "munich": "DE", "paris": "FR", "amsterdam": "NL",
+    "dublin": "IE", "madrid": "ES", "barcelona": "ES", "lisbon": "PT", "stockholm": "SE",
+    "zurich": "CH", "warsaw": "PL", "bangalore": "IN", "bengaluru": "IN", "mumbai": "IN",
+    "hyderabad": "IN", "delhi": "IN", "tokyo": "JP", "seoul": "KR", "shanghai": "CN",
+    "beijing": "CN", "toronto": "CA", "vancouver": "CA", "sydney": "AU",
+}
+
+# Salary filter labels as closed (minimum, maximum) annual USD bounds
+SALARY_RANGES = {
+    "Under $50K": (None, 49_999),
+    "$50K - $100K": (50_000, 100_000),
+    "$100K - $150K": (100_000, 150_000),
+    "Over $150K": (150_001, None),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SalaryRange:
+    """An annual salary range, converted to BASE_CURRENCY."""
+
+    minimum: int
+    maximum: int
+    currency: str = BASE_CURRENCY
+
+
+@dataclass(frozen=True, slots=True)
+class Location:
+    """A location mapped to a country code and a Location filter region."""
+
+    region: str
+    country_code: Optional[str] = None
+
+
+def parse_salary_range(
+    text: Optional[str],
+    default_currency: str = BASE_CURRENCY,
+    rates: Optional[Mapping[str, float]] = None
+) -> Optional[SalaryRange]:
+    """
+    Parse free-text salary such as "$120K - $150K" or "€45/hour" into an annual range.
+
+    Args:
+        text: The salary text
+        default_currency: Currency assumed when the text names none
+        rates: Exchange rates to BASE_CURRENCY, FX_RATES by default
+
+    Returns:
+        The range in annual BASE_CURRENCY units, or None if no amount was found
+    """
+    if not text:
+        return None
+    rates = rates or FX_RATES
+
+    currency = default_currency
+    match = _CURRENCY_CODE_RE.search(text)
+    if match:
+        currency = match.group(1).upper()
+    else:
+        currency = next((code for symbol, code in _CURRENCY_SYMBOLS if symbol in text), currency)
+
+    amounts = []
+    for number, suffix in _AMOUNT_RE.findall(text):
+        value = float(number.replace(",", "")) * {"k": 1_000, "m": 1_000_000}.get(suffix.lower(), 1)
+        amounts.append(value)
+    if not amounts:
+        return None
+
+    lowered = text.lower()
+    multiplier = next((periods for pattern, periods in _PERIODS if pattern.search(lowered)), 1)
+    rate = rates.get(currency, 1.0) * multiplier
+    return SalaryRange(round(min(amounts) * rate), round(max(amounts) * rate), currency)
+
+
+def parse_salary(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse free-text salary into (minimum, maximum) annual BASE_CURRENCY bounds.
+
+    Args:
+        text: The salary text
+
+    Returns:
+        (minimum, maximum); both None if the text has no amount
+    """
+    salary = parse_salary_range(text)
+    return (salary.minimum, salary.maximum) if salary else (None, None)
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(text: Optional[str]) -> Location:
+    """
+    Map a free-text location like "New York, USA" to a region and country code.
+
+    Args:
+        text: The location text
+
+    Returns:
+        The Location; unknown places map to region "Other"
+    """
+    if not text:
+        return Location("Other")
+    lowered = text.strip().lower()
+    if "remote" in lowered or "anywhere" in lowered:
+        return Location("Remote")
+
+    # Most specific part last: "San Francisco, CA, USA"
+    country = None
+    for part in reversed([part.strip(" .") for part in re.split(r"[,/()\-]", lowered) if part.strip(" .")]):
+        country = _COUNTRY_NAMES.get(part) or _PLACES.get(part)
+        if country:
+            break
+    if country is None:
+        return Location("Other")
+    region = next((name for name, countries in _REGION_COUNTRIES.items() if country in countries), "Other")
+    return Location(region, country)
+
+
+def normalize_job(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill in the normalized salary and location columns of a job before it is written.
+
+    Args:
+        row: The job row with free-text salary and location
+
+    Returns:
+        A copy of the row with salary_min, salary_max, salary_currency,
+        region and country_code set
+    """
+    row = dict(row)
+    salary = parse_salary_range(row.get("salary"))
+    if salary is not None:
+        row["salary_min"] = salary.minimum
+        row["salary_max"] = salary.maximum
+        row["salary_currency"] = salary.currency
+    location = normalize_location(row.get("location"))
+    row["region"] = location.region
+    row["country_code"] = location.country_code
+    return row
+
+
+def location_region(value: Optional[str]) -> Optional[str]:
+    """Return the region a Location filter value selects, or None for a free-text location."""
+    return value if value in REGIONS else None
+
+
+class SalaryIntervalIndex:
+    """
+    Static interval tree over salary ranges.
+
+    Intervals are kept sorted by start in parallel arrays that form an
+    implicit balanced tree: the middle of every slice is a node, and each
+    node stores the largest end in its slice. Overlap queries prune whole
+    subtrees, so they take O(log n + k). Writes mark the tree dirty and it
+    is rebuilt on the next query.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[str, Tuple[int, int]] = {}
+        self._ids: List[str] = []
+        self._starts = array("q")
+        self._ends = array("q")
+        self._max_ends = array("q")
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, item_id: Any, minimum: int, maximum: int) -> None:
+        """Add or replace the interval of an item."""
+        with self._lock:
+            self._intervals[str(item_id)] = (minimum, maximum)
+            self._dirty = True
+
+    def remove(self, item_id: Any) -> None:
+        """Remove the interval of an item, if present."""
+        with self._lock:
+            if self._intervals.pop(str(item_id), None) is not None:
+                self._dirty = True
+
+    def overlapping(self, minimum: Optional[int] = None, maximum: Optional[int] = None) -> List[str]:
+        """
+        Find items whose interval overlaps [minimum, maximum].
+
+        Args:
+            minimum: Lower bound, unbounded if None
+            maximum: Upper bound, unbounded if None
+
+        Returns:
+            Ids of the overlapping items
+        """
+        low = minimum if minimum is not None else -(1 << 62)
+        high = maximum if maximum is not None else 1 << 62
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            ids, starts, ends, max_ends = self._ids, self._starts, self._ends, self._max_ends
+
+            found = []
+            stack = [(0, len(ids))]
+            while stack:
+                left, right = stack.pop()
+                if left >= right:
+                    continue
+                mid = (left + right) // 2
+                if max_ends[mid] < low:
+                    continue
+                stack.append((left, mid))
+                if starts[mid] <= high:
+                    if ends[mid] >= low:
+                        found.append(ids[mid])
+                    stack.append((mid + 1, right))
+            return found
+
+    def _rebuild(self) -> None:
+        ordered = sorted(self._intervals.items(), key=lambda item: item[1])
+        self._ids = [item_id for item_id, _ in ordered]
+        self._starts = array("q", (start for _, (start, _) in ordered))
+        self._ends = array("q", (end for _, (_, end) in ordered))
+        self._max_ends = array("q", self._ends)
+
+        # Fill each node's subtree maximum, children before parents
+        def fill(left: int, right: int) -> int:
+            if left >= right:
+                return -(1 << 62)
+            mid = (left + right) // 2
+            self._max_ends[mid] = max(self._ends[mid], fill(left, mid), fill(mid + 1, right))
+            return self._max_ends[mid]
+
+        fill(0, len(self._ids))
+        self._dirty = False
+
+
+class JobFacetIndex:
+    """
+    In-memory index answering salary-overlap and region filters over jobs.
+
+    Fed from the same snapshot as the search index; salaries go into a
+    SalaryIntervalIndex and locations into per-region id sets.
+    """
+
+    def __init__(self):
+        self.salaries = SalaryIntervalIndex()
+        self._regions: Dict[str, Set[str]] = {region: set() for region in REGIONS}
+        self._job_regions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._job_regions)
+
+    def build(self, jobs: Iterable[Any]) -> None:
+        """Replace the index contents with a snapshot of jobs."""
+        with self._lock:
+            self.salaries = SalaryIntervalIndex()
+            self._regions = {region: set() for region in REGIONS}
+            self._job_regions = {}
+        for job in jobs:
+            self.add(job)
+
+    def add(self, job: Any) -> None:
+        """
+        Index a job, replacing any previous version with the same id.
+
+        Args:
+            job: A job dict or record with id, location and salary columns
+        """
+        job_id = str(_field(job, "id"))
+        region = _field(job, "region") or normalize_location(_field(job, "location")).region
+        minimum, maximum = _field(job, "salary_min"), _field(job, "salary_max")
+        if minimum is None and maximum is None:
+            minimum, maximum = parse_salary(_field(job, "salary"))
+
+        with self._lock:
+            self._remove(job_id)
+            self._regions.setdefault(region, set()).add(job_id)
+            self._job_regions[job_id] = region
+        if minimum is not None or maximum is not None:
+            self.salaries.add(job_id, minimum if minimum is not None else maximum,
+                              maximum if maximum is not None else minimum)
+
+    def remove(self, job_id: Any) -> None:
+        """Remove a job from the index."""
+        with self._lock:
+            self._remove(str(job_id))
+
+    def _remove(self, job_id: str) -> None:
+        region = self._job_regions.pop(job_id, None)
+        if region is not None:
+            self._regions[region].discard(job_id)
+        self.salaries.remove(job_id)
+
+    def match(self, region: Optional[str] = None, salary: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Find jobs in a region whose salary range overlaps a salary filter.
+
+        Args:
+            region: A value from REGIONS
+            salary: A label from SALARY_RANGES
+
+        Returns:
+            The matching job ids, or None if neither filter applies
+        """
+        bounds = SALARY_RANGES.get(salary) if salary else None
+        if region not in REGIONS and bounds is None:
+            return None
+
+        with self._lock:
+            ids = set(self._regions.get(region, ())) if region in REGIONS else None
+        if bounds is not None:
+            in_range = self.salaries.overlapping(*bounds)
+            ids = set(in_range) if ids is None else ids.intersection(in_range)
+        return ids
+
+
+def _field(job: Any, name: str) -> Any:
+    """Read a column from a job dict or record."""
+    return job.get(name) if isinstance(job, dict) else getattr(job, name, None)
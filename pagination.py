@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Stable sort keys used for keyset pagination
+JOB_SORT_KEY = ("posted_at", "id")
+COMPANY_SORT_KEY = ("name", "id")
+PROFILE_SORT_KEY = ("user_id",)
+
+# Order in which the search index picks up changed jobs
+JOB_SYNC_KEY = ("updated_at", "id")
+
+
+class InvalidCursorError(ValueError):
+    """Exception raised when a pagination cursor can't be decoded."""
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort-key values of the last row of a page as an opaque cursor.
+
+    Args:
+        values: Sort-key values in key order
+
+    Returns:
+        A URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: Sequence[str]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: The opaque cursor
+        sort_key: The sort key the cursor must match
+
+    Returns:
+        The sort-key values of the row the next page starts after
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {str(e)}")
+
+    if not isinstance(values, list) or len(values) != len(sort_key):
+        raise InvalidCursorError("Cursor does not match the sort key")
+    return values
+
+
+def cursor_for(row: Dict[str, Any], sort_key: Sequence[str]) -> str:
+    """Build the cursor pointing after a row."""
+    return encode_cursor([row.get(column) for column in sort_key])
+
+
+def _literal(value: Any) -> str:
+    """Quote a value for use inside a PostgREST logic filter."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def apply_keyset(query, sort_key: Sequence[str], after: Optional[Sequence[Any]], descending: bool):
+    """
+    Order a PostgREST query by the sort key and seek past a previous page.
+
+    The seek predicate is the expanded form of (a, b) < (x, y), which lets
+    Postgres walk the matching composite index instead of counting an OFFSET.
+    The first column of a two-column key may be NULL (e.g. a job without
+    posted_at): those rows sort last in either direction, ordered by the
+    second column, and the predicate has a branch that reaches them.
+
+    Args:
+        query: The PostgREST query builder
+        sort_key: One- or two-column sort key, the last column being unique
+        after: Sort-key values of the last row already returned, or None
+        descending: Whether to sort newest/largest first
+
+    Returns:
+        The query with ordering and the seek predicate applied
+    """
+    if len(sort_key) == 1:
+        query = query.order(sort_key[0], desc=descending)
+    else:
+        query = query.order(sort_key[0], desc=descending, nullsfirst=False).order(sort_key[1], desc=descending)
+
+    if after is not None:
+        op = "lt" if descending else "gt"
+        if len(sort_key) == 1:
+            return getattr(query, op)(sort_key[0], after[0])
+        first, last = sort_key
+        b = _literal(after[1])
+        if after[0] is None:
+            # Already among the trailing NULLs
+            return query.or_(f"and({first}.is.null,{last}.{op}.{b})")
+        a = _literal(after[0])
+        query = query.or_(f"{first}.{op}.{a},and({first}.eq.{a},{last}.{op}.{b}),{first}.is.null")
+    return query
+
+
+def paginate_rows(
+    rows: Sequence[Dict[str, Any]],
+    sort_key: Sequence[str],
+    cursor: Optional[str],
+    page_size: int,
+    descending: bool,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Keyset-paginate an in-memory list of rows with the same semantics as the database.
+
+    Args:
+        rows: Rows to paginate
+        sort_key: Sort key columns
+        cursor: Cursor from a previous page, or None for the first page
+        page_size: Number of rows per page
+        descending: Sort direction
+
+    Returns:
+        The page of rows and the cursor for the next page (None on the last page)
+    """
+    def key(values):
+        # NULLs sort last in either direction, as apply_keyset orders them
+        return tuple(((value is None) != descending, str(value or "")) for value in values)
+
+    ordered = sorted(rows, key=lambda row: key(row.get(column) for column in sort_key), reverse=descending)
+    if cursor is not None:
+        after = key(decode_cursor(cursor, sort_key))
+        if descending:
+            ordered = [row for row in ordered if key(row.get(column) for column in sort_key) < after]
+        else:
+            ordered = [row for row in ordered if key(row.get(column) for column in sort_key) > after]
+
+    page = ordered[:page_size]
+    next_cursor = cursor_for(page[-1], sort_key) if len(ordered) > page_size else None
+    return page, next_cursor
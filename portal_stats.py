@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+# Application statuses that count towards the success rate
+SUCCESS_STATUSES = ("Hired", "Offer Accepted")
+
+# Counters kept by PortalStats
+COUNTERS = ("active_jobs", "job_seekers", "companies", "applications", "successful_applications")
+
+
+@dataclass(frozen=True, slots=True)
+class StatsSnapshot:
+    """The portal counters at one point in time."""
+
+    active_jobs: int = 0
+    job_seekers: int = 0
+    companies: int = 0
+    applications: int = 0
+    successful_applications: int = 0
+    as_of: Optional[datetime] = None
+
+    @property
+    def success_rate(self) -> float:
+        """Share of applications that ended in a hire, between 0 and 1."""
+        return self.successful_applications / self.applications if self.applications else 0.0
+
+
+def format_count(value: int) -> str:
+    """
+    Format a counter the way the Home page shows it, e.g. 2000000 as "2M+".
+
+    Args:
+        value: The counter value
+
+    Returns:
+        The value rounded down to a compact label
+    """
+    if value >= 1_000_000:
+        return f"{value // 1_000_000}M+"
+    if value >= 10_000:
+        return f"{value // 1_000}K+"
+    return f"{value}+" if value else "0"
+
+
+class PortalStats:
+    """
+    Aggregate counters for the "JobWave in Numbers" panel.
+
+    The counters are seeded once from a bulk count, adjusted by deltas as
+    writes go through the connector, and reconciled against a fresh count
+    in the background so drift from writes made elsewhere doesn't build up.
+    Reads never touch the database.
+    """
+
+    def __init__(self, seed: Callable[[], Dict[str, int]], reconcile_interval: float = 900.0):
+        """
+        Initialize the counters.
+
+        Args:
+            seed: Callable returning exact values for the counters in COUNTERS
+            reconcile_interval: Seconds between background reconciliations
+        """
+        self.seed = seed
+        self.reconcile_interval = reconcile_interval
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+        self._as_of: Optional[datetime] = None
+        self._reconciled_at = 0.0
+        self._reconciling = False
+        # Deltas applied while a seed runs, replayed on top of it
+        self._deltas_since_seed: Dict[str, int] = {}
+
+    def snapshot(self) -> StatsSnapshot:
+        """
+        Get the current counters, starting a background reconcile if they are due.
+
+        Returns:
+            The counters and the time they were last changed; as_of is None
+            until the first seed finished
+        """
+        if time.monotonic() - self._reconciled_at > self.reconcile_interval:
+            self.reconcile()
+        with self._lock:
+            return StatsSnapshot(as_of=self._as_of, **self._counters)
+
+    def apply_delta(self, **deltas: int) -> None:
+        """
+        Adjust counters after a write, e.g. apply_delta(applications=1).
+
+        Args:
+            deltas: Amount to add to each named counter
+        """
+        with self._lock:
+            for name, delta in deltas.items():
+                if name not in self._counters:
+                    raise KeyError(f"Unknown portal counter: {name}")
+                self._counters[name] = max(0, self._counters[name] + delta)
+                if self._reconciling:
+                    self._deltas_since_seed[name] = self._deltas_since_seed.get(name, 0) + delta
+            self._as_of = datetime.now(timezone.utc)
+
+    def reconcile(self, wait: bool = False) -> None:
+        """
+        Replace the counters with a fresh seed plus the deltas applied while it ran.
+
+        Args:
+            wait: Run in the calling thread instead of in the background
+        """
+        with self._lock:
+            if self._reconciling:
+                return
+            self._reconciling = True
+            self._deltas_since_seed = {}
+
+        if wait:
+            self._reconcile()
+        else:
+            threading.Thread(target=self._reconcile, name="portal-stats", daemon=True).start()
+
+    def _reconcile(self) -> None:
+        try:
+            counts = self.seed()
+            with self._lock:
+                # Writes counted while the seed ran may be missing from it
+                for name in COUNTERS:
+                    if name in counts:
+                        self._counters[name] = max(0, int(counts[name]) + self._deltas_since_seed.get(name, 0))
+                self._as_of = datetime.now(timezone.utc)
+        except Exception as e:
+            logging.error(f"Error reconciling portal statistics: {str(e)}")
+        finally:
+            with self._lock:
+                self._reconciled_at = time.monotonic()
+                self._reconciling = False
+                self._deltas_since_seed = {}
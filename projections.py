@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Sequence
+
+# Column projections for each view. List views only ship the columns they
+# render; the full job row is fetched when a detail view is opened.
+JOB_CARD_FIELDS = "id,title,company,location,job_type,salary,salary_min,salary_max,posted_at"
+JOB_DETAIL_FIELDS = (
+    "id,title,company,location,job_type,experience_level,salary,salary_min,salary_max,"
+    "salary_currency,posted_at,description"
+)
+JOB_SEARCH_FIELDS = "id,title,company,description,location,salary,salary_min,salary_max,updated_at"
+COMPANY_CARD_FIELDS = "id,name,industry,location,company_size,rating,open_jobs,logo_key"
+COMPANY_DETAIL_FIELDS = (
+    "id,name,industry,location,company_size,rating,open_jobs,website,founded_year,description,logo_key"
+)
+PROFILE_FIELDS = (
+    "user_id,first_name,last_name,email,phone,city,country,about,website,role,skills,experience_level,"
+    "preferred_titles,preferred_job_types,preferred_locations,salary_expectation"
+)
+CANDIDATE_FIELDS = (
+    "user_id,first_name,last_name,city,country,role,skills,experience_level,"
+    "preferred_titles,preferred_job_types,preferred_locations,salary_expectation"
+)
+JOB_MATCH_FIELDS = "id,title,description,skills,job_type,location,salary,salary_min,salary_max"
+APPLICATION_ROW_FIELDS = "id,job_id,user_id,status,applied_date,next_step"
+
+ALL_FIELDS = "*"
+
+
+def split_fields(fields: str) -> List[str]:
+    """
+    Split a select string into its top-level columns.
+
+    Embedded resources such as "jobs(id,title)" are kept as one item.
+
+    Args:
+        fields: A PostgREST select string
+
+    Returns:
+        The top-level items of the select string
+    """
+    items, depth, current = [], 0, []
+    for char in fields:
+        if char == "," and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        current.append(char)
+    if current:
+        items.append("".join(current).strip())
+    return [item for item in items if item]
+
+
+def with_columns(fields: str, columns: Sequence[str]) -> str:
+    """Make sure a projection includes the given columns (e.g. a sort key)."""
+    if fields == ALL_FIELDS:
+        return fields
+    present = split_fields(fields)
+    missing = [column for column in columns if column not in present]
+    return ",".join(present + missing)
+
+
+def project_rows(rows: Sequence[Dict[str, Any]], fields: str) -> List[Dict[str, Any]]:
+    """
+    Apply a projection to in-memory rows, as the database would.
+
+    Embedded resources are kept whole when present on the row.
+
+    Args:
+        rows: Rows to project
+        fields: A PostgREST select string
+
+    Returns:
+        Copies of the rows restricted to the projected columns
+    """
+    if fields == ALL_FIELDS:
+        return [dict(row) for row in rows]
+
+    columns = [item.split("(", 1)[0] for item in split_fields(fields)]
+    return [{column: row[column] for column in columns if column in row} for row in rows]
@@ -0,0 +1,330 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+# Filter values that mean "no filter" in the app's selectboxes
+FILTER_DEFAULTS = {
+    "location": "Any Location",
+    "job_type": "Any Type",
+    "experience": "Any Level",
+    "salary": "Any Range",
+    "industry": "All Industries",
+    "size": "Any Size",
+}
+
+
+def normalize_filters(filters: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Reduce a filters dict to a hashable canonical form.
+
+    Empty values and "Any ..." defaults are dropped and search terms are
+    case-folded, so equivalent filter dicts share one cache entry.
+
+    Args:
+        filters: The filters passed to a connector read
+
+    Returns:
+        A sorted tuple of (name, value) pairs
+    """
+    if not filters:
+        return ()
+
+    normalized = []
+    for name, value in filters.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if name == "search":
+                value = value.casefold()
+        if value in (None, "", [], ()) or FILTER_DEFAULTS.get(name) == value:
+            continue
+        if isinstance(value, (list, set)):
+            value = tuple(sorted(value))
+        normalized.append((name, value))
+    return tuple(sorted(normalized))
+
+
+class QueryCache:
+    """
+    Thread-safe read-through cache for query results with TTL and LRU bound.
+
+    Entries are tagged with the table they were read from so write paths can
+    invalidate everything derived from that table. Loads are single-flight:
+    callers that miss on a key while it is being loaded wait for that load
+    and share its result, so a popular listing requested by many sessions
+    at once costs one request.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a result stays valid
+            max_entries: Maximum number of cached results
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        # Loads in flight, shared by callers that miss on the same key meanwhile
+        self._loading: Dict[Tuple[str, Hashable], Future] = {}
+        # Bumped by invalidate, so loads that started before a write don't cache what they read
+        self._generations: Dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0, "misses": 0, "coalesced": 0, "stale_loads": 0,
+            "evictions": 0, "expirations": 0, "invalidations": 0,
+        }
+
+    def get_or_load(self, table: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for a key, loading it on a miss.
+
+        Exceptions raised by the loader propagate, to every caller waiting
+        on that load, and nothing is cached. A result is not cached either if
+        its table was invalidated while it loaded, since it may predate the
+        write; the callers still get it.
+
+        Args:
+            table: The table the result was read from
+            key: Hashable query key
+            loader: Callable that runs the query
+
+        Returns:
+            The cached or freshly loaded result
+        """
+        hit, value = self.lookup(table, key)
+        if hit:
+            return value
+
+        flight, generation = self.begin_load(table, key)
+        if generation is None:
+            return flight.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            self.end_load(table, key, flight, generation, error=e)
+            raise
+        self.end_load(table, key, flight, generation, value)
+        return value
+
+    def begin_load(self, table: str, key: Hashable) -> Tuple[Future, Optional[Tuple[int, int]]]:
+        """
+        Join the load of a key already in flight, or start one.
+
+        Lets callers that can't hand get_or_load a blocking loader, such as
+        coroutines, share loads with it.
+
+        Args:
+            table: The table the result is read from
+            key: Hashable query key
+
+        Returns:
+            The future of the load, and the generation to pass to end_load if
+            the caller must run the load itself (None if it just waits)
+        """
+        full_key = (table, key)
+        with self._lock:
+            flight = self._loading.get(full_key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                return flight, None
+            flight = self._loading[full_key] = Future()
+            return flight, self._generation_of(table)
+
+    def end_load(
+        self,
+        table: str,
+        key: Hashable,
+        flight: Future,
+        generation: Tuple[int, int],
+        value: Any = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Finish a load started with begin_load and hand its outcome to the callers waiting on it.
+
+        Args:
+            table: The table the result was read from
+            key: Hashable query key
+            flight: The future returned by begin_load
+            generation: The generation returned by begin_load
+            value: The loaded result, cached unless error is set
+            error: The exception the load raised, if it failed
+        """
+        full_key = (table, key)
+        # Stored before the flight ends, so callers arriving afterwards hit the cache
+        with self._lock:
+            if error is None and self._generation_of(table) == generation:
+                self._put(full_key, value)
+            elif error is None:
+                self._stats["stale_loads"] += 1
+            self._end_flight(full_key, flight)
+        if error is None:
+            flight.set_result(value)
+        else:
+            flight.set_exception(error)
+
+    def _end_flight(self, full_key: Tuple[str, Hashable], flight: Future) -> None:
+        """Stop sharing a load, unless an invalidation already replaced it; the caller holds the lock."""
+        if self._loading.get(full_key) is flight:
+            del self._loading[full_key]
+
+    def _generation_of(self, table: str) -> Tuple[int, int]:
+        """Invalidation counters covering a table; the caller holds the lock."""
+        return self._generation, self._generations.get(table, 0)
+
+    def lookup(self, table: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached result without loading it.
+
+        Args:
+            table: The table the result was read from
+            key: Hashable query key
+
+        Returns:
+            (True, value) on a hit, (False, None) on a miss
+        """
+        full_key = (table, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(full_key)
+                    self._stats["hits"] += 1
+                    return True, entry[1]
+                del self._entries[full_key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return False, None
+
+    def store(self, table: str, key: Hashable, value: Any) -> None:
+        """Cache a result, evicting the least recently used entries."""
+        with self._lock:
+            self._put((table, key), value)
+
+    def _put(self, full_key: Tuple[str, Hashable], value: Any) -> None:
+        """Cache a result; the caller holds the lock."""
+        self._entries[full_key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, *tables: str) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            tables: Tables whose results should be dropped; all if omitted
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            # Callers missing from now on start a new load rather than wait for a stale one
+            if not tables:
+                self._generation += 1
+                self._loading.clear()
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                for table in tables:
+                    self._generations[table] = self._generations.get(table, 0) + 1
+                for k in [k for k in self._loading if k[0] in tables]:
+                    del self._loading[k]
+                stale = [k for k in self._entries if k[0] in tables]
+                for k in stale:
+                    del self._entries[k]
+                removed = len(stale)
+            self._stats["invalidations"] += removed
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            return stats
+
+
+class RecordCache:
+    """
+    Thread-safe LRU of records keyed by id, shared by every session.
+
+    Lets rows that reference the same record (e.g. applications pointing at
+    one popular job) share a single copy that is only fetched when missing.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of records kept
+            ttl: Seconds a record stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_many(self, ids: Iterable[Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Look up records by id.
+
+        Args:
+            ids: Record ids
+
+        Returns:
+            The cached records by id, and the ids that must be fetched
+        """
+        found, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for record_id in dict.fromkeys(str(i) for i in ids):
+                entry = self._entries.get(record_id)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(record_id)
+                    found[record_id] = entry[1]
+                else:
+                    missing.append(record_id)
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(missing)
+        return found, missing
+
+    def put_many(self, records: Mapping[Any, Any]) -> None:
+        """Store records by id, evicting the least recently used."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for record_id, record in records.items():
+                record_id = str(record_id)
+                self._entries[record_id] = (expires_at, record)
+                self._entries.move_to_end(record_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def discard(self, *ids: Any) -> None:
+        """Drop records after they were written; all records if no ids are given."""
+        with self._lock:
+            if not ids:
+                self._entries.clear()
+            for record_id in ids:
+                self._entries.pop(str(record_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            return stats
@@ -0,0 +1,286 @@
+import math
+import threading
+import zlib
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from job_search import stem, tokenize
+from normalization import REGIONS, normalize_location, parse_salary
+
+# Size of the hashed feature space; a power of two
+N_FEATURES = 1 << 18
+
+# How much each job field contributes to a term's frequency
+JOB_FIELD_WEIGHTS = {"title": 3.0, "skills": 2.0, "description": 1.0}
+
+# How much each profile field contributes to the candidate vector
+PROFILE_FIELD_WEIGHTS = {"preferred_titles": 3.0, "skills": 2.0}
+
+# Score added when the job's salary range overlaps the candidate's expectation
+SALARY_MATCH_BONUS = 0.05
+
+# Candidates scored together per sparse product in batch scoring
+BATCH_CHUNK_SIZE = 64
+
+
+@lru_cache(maxsize=65536)
+def feature_index(term: str, n_features: int = N_FEATURES) -> int:
+    """Hash a stemmed term to a column of the feature matrix (stable across processes)."""
+    return zlib.crc32(term.encode("utf-8")) & (n_features - 1)
+
+
+def _field(item: Any, name: str) -> Any:
+    """Read a field from a dict or record."""
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def _text(value: Any) -> str:
+    """Join list-valued fields such as skills into one string."""
+    if isinstance(value, (list, tuple, set)):
+        return " ".join(str(v) for v in value)
+    return value or ""
+
+
+def _term_counts(item: Any, weights: Dict[str, float]) -> Counter:
+    counts: Counter = Counter()
+    for name, weight in weights.items():
+        # Stem each distinct token once
+        for token, n in Counter(tokenize(_text(_field(item, name)))).items():
+            counts[stem(token)] += weight * n
+    return counts
+
+
+def preference_regions(locations: Iterable[str]) -> List[str]:
+    """Map preferred locations such as "United States" or "Europe" to Location filter regions."""
+    regions = []
+    for location in locations or ():
+        region = location if location in REGIONS else normalize_location(location).region
+        if region not in regions:
+            regions.append(region)
+    return regions
+
+
+class JobRecommender:
+    """
+    Content-based job recommendations from hashed TF-IDF vectors.
+
+    Jobs are embedded once into a sparse matrix with one L2-normalized row
+    per job. A candidate is embedded the same way from their skills and
+    preferred titles, so scoring every job is one sparse matrix-vector
+    product. Job type and location preferences are boolean masks over the
+    job arrays and the top k come from argpartition.
+    """
+
+    def __init__(self, n_features: int = N_FEATURES):
+        """
+        Initialize an empty recommender.
+
+        Args:
+            n_features: Size of the hashed feature space, a power of two
+        """
+        self.n_features = n_features
+        self.job_ids: List[str] = []
+        self._matrix = sparse.csc_matrix((0, n_features), dtype=np.float32)
+        self._idf = np.ones(n_features, dtype=np.float32)
+        self._job_types = np.zeros(0, dtype=np.int16)
+        self._regions = np.zeros(0, dtype=np.int16)
+        self._salary_min = np.zeros(0, dtype=np.float64)
+        self._salary_max = np.zeros(0, dtype=np.float64)
+        self._job_type_codes: Dict[str, int] = {}
+        self._region_codes = {region: code for code, region in enumerate(REGIONS)}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def fit(self, jobs: Iterable[Any]) -> "JobRecommender":
+        """
+        Embed a snapshot of jobs, replacing the previous one.
+
+        Args:
+            jobs: Job dicts or records with title, description and optionally
+                skills, job_type, location and salary columns
+
+        Returns:
+            The recommender
+        """
+        job_ids, rows, cols, values = [], array("i"), array("i"), array("f")
+        job_types, regions, salary_min, salary_max = array("h"), array("h"), array("d"), array("d")
+        job_type_codes: Dict[str, int] = {}
+
+        for row, job in enumerate(jobs):
+            job_ids.append(str(_field(job, "id")))
+            for term, tf in _term_counts(job, JOB_FIELD_WEIGHTS).items():
+                rows.append(row)
+                cols.append(feature_index(term, self.n_features))
+                values.append(1.0 + math.log(tf))
+            job_types.append(job_type_codes.setdefault(_field(job, "job_type") or "", len(job_type_codes)))
+            region = _field(job, "region") or normalize_location(_field(job, "location")).region
+            regions.append(self._region_codes.get(region, self._region_codes["Other"]))
+            low, high = _field(job, "salary_min"), _field(job, "salary_max")
+            if low is None and high is None:
+                low, high = parse_salary(_field(job, "salary"))
+            salary_min.append(math.nan if low is None else low)
+            salary_max.append(math.nan if high is None else high)
+
+        n_jobs = len(job_ids)
+        matrix = sparse.csr_matrix(
+            (np.frombuffer(values, dtype=np.float32), (np.frombuffer(rows, dtype=np.int32), np.frombuffer(cols, dtype=np.int32))),
+            shape=(n_jobs, self.n_features),
+            dtype=np.float32
+        )
+        matrix.sum_duplicates()
+
+        # Smoothed inverse document frequency of every hashed column
+        df = np.bincount(matrix.indices, minlength=self.n_features)
+        idf = (np.log((1 + n_jobs) / (1 + df)) + 1).astype(np.float32)
+        matrix = sparse.csr_matrix(matrix.multiply(idf))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix = sparse.diags((1 / norms).astype(np.float32)) @ matrix
+
+        with self._lock:
+            self.job_ids = job_ids
+            # Column-major so a sparse candidate vector only touches its own columns
+            self._matrix = matrix.tocsc()
+            self._idf = idf
+            self._job_types = np.frombuffer(job_types, dtype=np.int16).copy()
+            self._regions = np.frombuffer(regions, dtype=np.int16).copy()
+            self._salary_min = np.frombuffer(salary_min, dtype=np.float64).copy()
+            self._salary_max = np.frombuffer(salary_max, dtype=np.float64).copy()
+            self._job_type_codes = job_type_codes
+        return self
+
+    def embed(self, profile: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Embed a candidate profile as a sparse, L2-normalized vector.
+
+        Args:
+            profile: A Profile record or dict with skills and preferred_titles
+
+        Returns:
+            The vector's column indices and values
+        """
+        weights: Dict[int, float] = {}
+        for term, tf in _term_counts(profile, PROFILE_FIELD_WEIGHTS).items():
+            column = feature_index(term, self.n_features)
+            weights[column] = weights.get(column, 0.0) + (1.0 + math.log(tf))
+        columns = np.fromiter(weights, dtype=np.int32, count=len(weights))
+        values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights)) * self._idf[columns]
+        norm = np.linalg.norm(values)
+        return columns, values / norm if norm else values
+
+    def recommend(self, profile: Any, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Score every job against a candidate and return the best k.
+
+        Args:
+            profile: A Profile record or dict with skills, preferred_titles,
+                preferred_job_types, preferred_locations and salary_expectation
+            k: Number of jobs to return
+
+        Returns:
+            (job id, score) pairs, best first
+        """
+        with self._lock:
+            if not self.job_ids:
+                return []
+            columns, values = self.embed(profile)
+            scores = self._matrix[:, columns] @ values if len(columns) else np.zeros(len(self.job_ids), np.float32)
+            return self._rank(np.asarray(scores, dtype=np.float32).reshape(-1, 1), [profile], k)[0]
+
+    def recommend_batch(self, profiles: Sequence[Any], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Score many candidates at once, e.g. for the nightly email digests.
+
+        Each chunk of candidates is scored with one product of the job
+        matrix, restricted to the columns the chunk uses, and a dense
+        weight matrix; masking and top-k selection then run on the whole
+        jobs x BATCH_CHUNK_SIZE score block.
+
+        Args:
+            profiles: Profile records or dicts
+            k: Number of jobs per candidate
+
+        Returns:
+            One list of (job id, score) pairs per profile, in input order
+        """
+        results: List[List[Tuple[str, float]]] = []
+        with self._lock:
+            if not self.job_ids:
+                return [[] for _ in profiles]
+            for start in range(0, len(profiles), BATCH_CHUNK_SIZE):
+                chunk = profiles[start:start + BATCH_CHUNK_SIZE]
+                embedded = [self.embed(profile) for profile in chunk]
+
+                # Only the columns some candidate uses take part in the product
+                used, positions = np.unique(
+                    np.concatenate([columns for columns, _ in embedded] or [np.zeros(0, np.int32)]),
+                    return_inverse=True
+                )
+                weights = np.zeros((len(used), len(chunk)), dtype=np.float32)
+                offset = 0
+                for column, (columns, values) in enumerate(embedded):
+                    weights[positions[offset:offset + len(columns)], column] = values
+                    offset += len(columns)
+
+                block = np.asarray(self._matrix[:, used] @ weights, dtype=np.float32)
+                results.extend(self._rank(block, chunk, k))
+        return results
+
+    def _rank(self, block: np.ndarray, profiles: Sequence[Any], k: int) -> List[List[Tuple[str, float]]]:
+        """
+        Apply preference masks and the salary bonus to a jobs x candidates
+        score block, then pick the top k of every column.
+        """
+        n_candidates = len(profiles)
+        job_type_ok = np.ones((max(len(self._job_type_codes), 1), n_candidates), dtype=bool)
+        region_ok = np.ones((len(self._region_codes), n_candidates), dtype=bool)
+        low = np.full(n_candidates, np.nan)
+        high = np.full(n_candidates, np.inf)
+        for column, profile in enumerate(profiles):
+            job_types = _field(profile, "preferred_job_types")
+            if job_types:
+                job_type_ok[:, column] = False
+                job_type_ok[[self._job_type_codes[t] for t in job_types if t in self._job_type_codes], column] = True
+            locations = _field(profile, "preferred_locations")
+            if locations:
+                region_ok[:, column] = False
+                region_ok[[self._region_codes[r] for r in preference_regions(locations)], column] = True
+            expectation = _field(profile, "salary_expectation")
+            minimum, maximum = parse_salary(expectation)
+            if minimum is not None:
+                low[column] = minimum
+                if not str(expectation).rstrip().endswith("+"):
+                    high[column] = maximum
+
+        # Lookup tables indexed by each job's code give the jobs x candidates masks
+        mask = job_type_ok[self._job_types] & region_ok[self._regions]
+        # NaN bounds compare False, so jobs or candidates without a salary get no bonus;
+        # the bonus only reorders jobs that already match on content
+        overlaps = (self._salary_max[:, None] >= low) & (self._salary_min[:, None] <= high) & (block > 0)
+        block = np.where(mask, block + np.float32(SALARY_MATCH_BONUS) * overlaps, -np.inf)
+
+        k = min(k, len(block))
+        if k <= 0:
+            return [[] for _ in profiles]
+        # Candidates x jobs, so every candidate's partition runs over contiguous memory
+        scores = np.ascontiguousarray(block.T)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [
+                (self.job_ids[i], float(score))
+                for i, score in zip(top[column], top_scores[column])
+                if np.isfinite(score) and score > 0
+            ]
+            for column in range(n_candidates)
+        ]
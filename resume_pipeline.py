@@ -0,0 +1,399 @@
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.machinery import ModuleSpec
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from blob_store import BlobTooLarge, LocalBlobStore, iter_chunks
+
+# Namespace of resumes in the blob store
+RESUME_NAMESPACE = "resumes"
+
+RESUME_SUFFIXES = (".pdf", ".docx")
+
+DEFAULT_MAX_BYTES = 10 << 20
+
+# Skills recognized in resume text, in their display spelling
+SKILL_VOCABULARY = (
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#", "Ruby", "PHP",
+    "Kotlin", "Swift", "Scala", "SQL", "Bash", "HTML", "CSS", "React", "Angular", "Vue.js",
+    "Node.js", "Next.js", "Django", "Flask", "FastAPI", "Spring", "Rails", ".NET", "GraphQL",
+    "REST", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Kafka", "Spark",
+    "Hadoop", "Airflow", "dbt", "Snowflake", "AWS", "Azure", "GCP", "Docker", "Kubernetes",
+    "Terraform", "Ansible", "Jenkins", "CI/CD", "Git", "Linux", "Machine Learning",
+    "Deep Learning", "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "NumPy", "NLP",
+    "Computer Vision", "Data Analysis", "Tableau", "Power BI", "Excel", "Figma", "Agile",
+    "Scrum", "Project Management", "Product Management", "Salesforce", "SEO",
+)
+
+# Longest skill in words; phrases up to this length are looked up
+_MAX_SKILL_WORDS = 3
+
+# Words keep +, # and inner dots and slashes, so "C++", "C#", "Node.js" and "CI/CD" survive
+_WORD = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+
+_YEARS = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+
+
+def _skill_lookup(vocabulary: Iterable[str]) -> Dict[Tuple[str, ...], str]:
+    return {tuple(_WORD.findall(skill.lower())): skill for skill in vocabulary}
+
+
+_SKILLS = _skill_lookup(SKILL_VOCABULARY)
+
+
+def parse_skills(text: str, vocabulary: Optional[Dict[Tuple[str, ...], str]] = None) -> List[str]:
+    """
+    Find known skills in free text, longest phrase first.
+
+    Args:
+        text: Resume text
+        vocabulary: Word tuples mapped to display names; SKILL_VOCABULARY by default
+
+    Returns:
+        Skills in order of first mention, without duplicates
+    """
+    vocabulary = _SKILLS if vocabulary is None else vocabulary
+    words = _WORD.findall(text.lower())
+    found: Dict[str, None] = {}
+    position = 0
+    while position < len(words):
+        for length in range(min(_MAX_SKILL_WORDS, len(words) - position), 0, -1):
+            skill = vocabulary.get(tuple(words[position:position + length]))
+            if skill is not None:
+                found.setdefault(skill)
+                position += length
+                break
+        else:
+            position += 1
+    return list(found)
+
+
+def experience_level(text: str) -> str:
+    """Guess the experience level from the largest "N years" in the text, or "" if none."""
+    years = max((int(match) for match in _YEARS.findall(text)), default=None)
+    if years is None:
+        return ""
+    if years < 2:
+        return "Entry Level"
+    if years < 5:
+        return "Mid Level"
+    if years < 12:
+        return "Senior"
+    return "Executive"
+
+
+def _docx_text(path: str) -> str:
+    """Text of a DOCX file: the w:t runs of word/document.xml, one line per paragraph."""
+    namespace = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+    lines, line = [], []
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document:
+        for event, element in ElementTree.iterparse(document, events=("end",)):
+            if element.tag == f"{namespace}t" and element.text:
+                line.append(element.text)
+            elif element.tag == f"{namespace}tab":
+                line.append(" ")
+            elif element.tag == f"{namespace}p":
+                lines.append("".join(line))
+                line = []
+                element.clear()
+    return "\n".join(lines)
+
+
+# Literal strings shown by the Tj and TJ text operators
+_PDF_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.DOTALL)
+_PDF_SHOWN = re.compile(rb"\((?:[^()\\]|\\.)*\)\s*Tj|\[(?:[^\]\\]|\\.)*\]\s*TJ", re.DOTALL)
+_PDF_LITERAL = re.compile(rb"\(((?:[^()\\]|\\.)*)\)", re.DOTALL)
+_PDF_ESCAPE = re.compile(rb"\\([nrtbf()\\]|[0-7]{1,3})")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f", b"(": b"(", b")": b")", b"\\": b"\\"}
+
+
+def _pdf_text(path: str) -> str:
+    """
+    Text of a PDF file.
+
+    Uses pypdf when it is installed. Otherwise falls back to reading the
+    literal strings of the text operators in the page streams, which
+    covers PDFs written with simple fonts, as most resume exports are.
+    """
+    try:
+        import pypdf
+    except ImportError:
+        pypdf = None
+    if pypdf is not None:
+        return "\n".join(page.extract_text() or "" for page in pypdf.PdfReader(path).pages)
+
+    with open(path, "rb") as file:
+        data = file.read()
+    lines = []
+    for stream in _PDF_STREAM.findall(data):
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        for shown in _PDF_SHOWN.findall(stream):
+            text = b"".join(
+                _PDF_ESCAPE.sub(lambda m: _PDF_ESCAPES.get(m.group(1)) or bytes([int(m.group(1), 8) & 0xFF]), literal)
+                for literal in _PDF_LITERAL.findall(shown)
+            )
+            lines.append(text.decode("latin-1"))
+    return "\n".join(lines)
+
+
+def extract_resume(path: str) -> Dict[str, Any]:
+    """
+    Extract text from a stored resume and parse it; runs in a worker process.
+
+    Args:
+        path: Local path of the PDF or DOCX file
+
+    Returns:
+        Dict with skills, experience_level and the number of text characters
+    """
+    text = _docx_text(path) if path.lower().endswith(".docx") else _pdf_text(path)
+    return {
+        "skills": parse_skills(text),
+        "experience_level": experience_level(text),
+        "characters": len(text),
+    }
+
+
+def _hide_script_main() -> None:
+    """
+    Keep worker processes from running the Streamlit script.
+
+    New workers re-import the parent's __main__ by path, and under
+    Streamlit that is the app script. multiprocessing leaves a __main__
+    whose spec names it "__main__" alone, as `python -m` gives it.
+    """
+    main = sys.modules.get("__main__")
+    if main is not None and getattr(main, "__spec__", None) is None and getattr(main, "__file__", None):
+        main.__spec__ = ModuleSpec("__main__", None)
+
+
+class ResumeJob:
+    """
+    Handle on a resume moving through the pipeline, polled by the UI.
+
+    The status goes from uploading to parsing, then saving while the
+    profile write is queued, and ends at done or failed.
+    """
+
+    def __init__(self, user_id: str, filename: str):
+        self.user_id = user_id
+        self.filename = filename
+        self.key: Optional[str] = None
+        self.size = 0
+        self.duplicate = False
+        self.skills: List[str] = []
+        self.experience_level = ""
+        self.error: Optional[str] = None
+        self.ticket = None
+        self._status = "uploading"
+        self._finished = threading.Event()
+
+    @property
+    def status(self) -> str:
+        """Current status; saving turns into done once the profile write is stored."""
+        if self._status == "saving" and self.ticket is not None and self.ticket.done():
+            if not self.ticket.succeeded:
+                self.error = self.ticket.error
+                return "failed"
+            return "done"
+        return self._status
+
+    def done(self) -> bool:
+        """Tell whether the job finished, successfully or not."""
+        return self.status in ("done", "failed")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the resume is parsed and its write queued.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if parsing succeeded
+        """
+        self._finished.wait(timeout)
+        return self._status == "saving"
+
+    def _fail(self, error: str) -> None:
+        self.error = error
+        self._status = "failed"
+        self._finished.set()
+
+
+class ResumePipeline:
+    """
+    Stores resume uploads and parses them off the rerun thread.
+
+    An upload is streamed in chunks into the content-addressed blob store
+    by a thread, so the rerun returns at once. The stored file's path then
+    goes to a process pool, where text extraction and skill parsing run
+    without holding the server's GIL. The result is handed to on_parsed,
+    which queues the profile write and returns its WriteTicket. Parses are
+    shared by content digest, both while running and afterwards, so the
+    same file uploaded again skips the pool.
+    """
+
+    def __init__(
+        self,
+        store: LocalBlobStore,
+        on_parsed: Callable[[str, Dict[str, Any]], Any],
+        max_workers: int = 2,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_results: int = 1024
+    ):
+        """
+        Initialize the pipeline; worker processes start on the first upload.
+
+        Args:
+            store: Where uploads are stored
+            on_parsed: Called with the user id and the parse result plus the
+                resume_key; returns a WriteTicket for the profile write
+            max_workers: Worker processes for extraction
+            max_bytes: Largest accepted upload
+            max_results: Parse results remembered by digest
+        """
+        self.store = store
+        self.on_parsed = on_parsed
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.max_results = max_results
+        self._uploads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resume-upload")
+        self._workers: Optional[ProcessPoolExecutor] = None
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Digest -> parse still running, shared by identical uploads
+        self._parsing: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"uploads": 0, "duplicates": 0, "parsed": 0, "failed": 0}
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._workers is None:
+                # Not forked: forking the threaded server copies locks other threads
+                # may hold, e.g. the logging or connection pool locks, and the child
+                # can deadlock on them. The forkserver forks workers from a clean
+                # process that has imported this module once.
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context("forkserver")
+                    context.set_forkserver_preload([__name__])
+                else:
+                    context = multiprocessing.get_context("spawn")
+                self._workers = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._workers
+
+    def submit(self, user_id: str, file: BinaryIO, filename: str) -> ResumeJob:
+        """
+        Start storing and parsing an upload.
+
+        Args:
+            user_id: The user whose profile gets the result
+            file: The uploaded file, e.g. from st.file_uploader
+            filename: Its original name, for the file type
+
+        Returns:
+            A job handle to poll
+        """
+        job = ResumeJob(user_id, filename)
+        suffix = os.path.splitext(filename)[1].lower()
+        if suffix not in RESUME_SUFFIXES:
+            job._fail(f"Unsupported file type: {suffix or filename}")
+            return job
+        self._uploads.submit(self._store, job, file, suffix)
+        return job
+
+    def _store(self, job: ResumeJob, file: BinaryIO, suffix: str) -> None:
+        try:
+            blob = self.store.put_stream(RESUME_NAMESPACE, iter_chunks(file), suffix, self.max_bytes)
+        except BlobTooLarge as e:
+            job._fail(str(e))
+            return
+        except Exception as e:
+            logging.error(f"Error storing resume: {str(e)}")
+            job._fail("The resume could not be stored")
+            return
+        job.key, job.size, job.duplicate = blob.key, blob.size, not blob.created
+        job._status = "parsing"
+
+        submitted = False
+        try:
+            pool = self._pool()
+            with self._lock:
+                self._stats["uploads"] += 1
+                result = self._results.get(blob.sha256)
+                future = self._parsing.get(blob.sha256)
+                if result is not None:
+                    self._results.move_to_end(blob.sha256)
+                    self._stats["duplicates"] += 1
+                elif future is not None:
+                    self._stats["duplicates"] += 1
+                else:
+                    # Registered under the lock, so identical uploads racing in share it
+                    _hide_script_main()
+                    future = self._parsing[blob.sha256] = pool.submit(extract_resume, self.store.local_path(blob.key))
+                    submitted = True
+        except Exception as e:
+            logging.error(f"Error starting resume parsing: {str(e)}")
+            job._fail("The resume could not be parsed")
+            return
+        if result is not None:
+            self._finish(job, result)
+            return
+        if submitted:
+            # Outside the lock: a finished future runs its callback right away
+            future.add_done_callback(lambda future: self._parsed(blob.sha256, future))
+        future.add_done_callback(lambda future: self._deliver(job, future))
+
+    def _parsed(self, sha256: str, future: Future) -> None:
+        with self._lock:
+            self._parsing.pop(sha256, None)
+            if future.exception() is not None:
+                logging.error(f"Error parsing resume {sha256}: {str(future.exception())}")
+                self._stats["failed"] += 1
+                return
+            self._stats["parsed"] += 1
+            self._results[sha256] = future.result()
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+    def _deliver(self, job: ResumeJob, future: Future) -> None:
+        if future.exception() is not None:
+            job._fail("The resume could not be parsed")
+            return
+        self._finish(job, future.result())
+
+    def _finish(self, job: ResumeJob, result: Dict[str, Any]) -> None:
+        job.skills = list(result["skills"])
+        job.experience_level = result["experience_level"]
+        try:
+            job.ticket = self.on_parsed(job.user_id, {**result, "resume_key": job.key})
+        except Exception as e:
+            logging.error(f"Error saving parsed resume: {str(e)}")
+            job._fail("The parsed resume could not be saved")
+            return
+        job._status = "saving"
+        job._finished.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return upload, duplicate, parse and failure counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the upload threads and worker processes."""
+        self._uploads.shutdown(wait=wait)
+        with self._lock:
+            if self._workers is not None:
+                self._workers.shutdown(wait=wait)
+                self._workers = None
@@ -0,0 +1,135 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, MutableMapping, Optional, Tuple
+
+# Key of the cache in st.session_state
+SESSION_STATE_KEY = "_session_cache"
+
+
+class SessionCache:
+    """
+    Memo of one session's per-user reads, kept across Streamlit reruns.
+
+    Every widget change reruns the whole script, so reads such as the
+    user's profile would otherwise go to the database on every click.
+    Entries live for a staleness window, are marked dirty when the user
+    saves so the next rerun reloads them, and are bounded per session with
+    LRU eviction. The cache is stored in st.session_state, so Streamlit
+    reclaims it with the session; it is used from the script thread only
+    and needs no lock.
+    """
+
+    def __init__(self, owner: Optional[str], ttl: float = 120.0, max_entries: int = 32):
+        """
+        Initialize the cache.
+
+        Args:
+            owner: The user whose data is cached
+            ttl: Seconds an entry is served before it is reloaded
+            max_entries: Maximum number of entries kept for the session
+        """
+        self.owner = owner
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # (namespace, key) -> (expires at, dirty, value)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, bool, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0, "evictions": 0}
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the memoized result of a read, loading it when missing, stale or dirty.
+
+        None results aren't kept, since connector reads return None on errors.
+
+        Args:
+            namespace: Kind of data, e.g. "profile"; the unit of mark_dirty
+            key: Hashable query key, e.g. the fields or filters
+            loader: Callable that runs the read
+            ttl: Staleness window for this entry instead of the default
+
+        Returns:
+            The memoized or freshly loaded result
+        """
+        full_key = (namespace, key)
+        entry = self._entries.get(full_key)
+        if entry is not None:
+            expires, dirty, value = entry
+            if not dirty and expires > time.monotonic():
+                self._entries.move_to_end(full_key)
+                self._stats["hits"] += 1
+                return value
+            self._stats["reloads"] += 1
+        else:
+            self._stats["misses"] += 1
+
+        value = loader()
+        if value is None:
+            self._entries.pop(full_key, None)
+            return value
+        self._entries[full_key] = (time.monotonic() + (self.ttl if ttl is None else ttl), False, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+        return value
+
+    def mark_dirty(self, *namespaces: str) -> int:
+        """
+        Mark entries for reloading, e.g. after the user saved their profile.
+
+        Args:
+            namespaces: Namespaces to mark; all entries if omitted
+
+        Returns:
+            Number of entries marked
+        """
+        marked = 0
+        for full_key, (expires, _, value) in list(self._entries.items()):
+            if not namespaces or full_key[0] in namespaces:
+                self._entries[full_key] = (expires, True, value)
+                marked += 1
+        return marked
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/reload counters and the current size."""
+        stats = dict(self._stats)
+        stats["size"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"] + stats["reloads"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def get_session_cache(
+    state: MutableMapping[str, Any],
+    owner: Optional[str],
+    ttl: float = 120.0,
+    max_entries: int = 32
+) -> SessionCache:
+    """
+    Get the session's cache, starting a fresh one when the user changed.
+
+    Args:
+        state: The session state, normally st.session_state
+        owner: The logged in user's ID
+        ttl: Staleness window for a new cache
+        max_entries: Size bound for a new cache
+
+    Returns:
+        The cache holding this user's data
+    """
+    cache = state.get(SESSION_STATE_KEY)
+    if cache is None or cache.owner != owner:
+        cache = state[SESSION_STATE_KEY] = SessionCache(owner, ttl=ttl, max_entries=max_entries)
+    return cache
+
+
+def drop_session_cache(state: MutableMapping[str, Any]) -> None:
+    """Release a session's cached data, e.g. on logout."""
+    cache = state.pop(SESSION_STATE_KEY, None)
+    if cache is not None:
+        cache.clear()
@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SQLITE_PATH = os.path.join(_BASE_DIR, ".cache", "sessions.sqlite3")
+
+# Sign-ins last a day unless SESSION_TTL says otherwise
+DEFAULT_SESSION_TTL = 86400.0
+
+# Expired rows are purged on one write in this many
+_PURGE_EVERY = 100
+
+
+class SessionStore(ABC):
+    """
+    Signed-in sessions kept outside the Streamlit process.
+
+    st.session_state lives in one server process, so when a load balancer
+    sends a reconnecting browser to another replica the user would be signed
+    out. Sessions are stored under a random id instead, which the browser
+    keeps and any replica can look up. Subclasses provide Redis-style
+    get, set with expiry and delete on string values.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SESSION_TTL, prefix: str = "session:"):
+        """
+        Initialize the store.
+
+        Args:
+            ttl: Seconds a session stays valid after sign-in
+            prefix: Namespace of the store's keys
+        """
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def create_session(self, user: Dict[str, Any], ttl: Optional[float] = None) -> str:
+        """
+        Store a signed-in user under a new session id.
+
+        Args:
+            user: The user object kept in session state
+            ttl: Lifetime of this session instead of the default
+
+        Returns:
+            The session id; unguessable, so it serves as the bearer credential
+        """
+        session_id = secrets.token_urlsafe(32)
+        self._set(self.prefix + session_id, json.dumps(user), self.ttl if ttl is None else ttl)
+        return session_id
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a session's user.
+
+        Args:
+            session_id: Id returned by create_session
+
+        Returns:
+            The user object, or None if the session is unknown, expired or the store failed
+        """
+        if not session_id:
+            return None
+        try:
+            value = self._get(self.prefix + session_id)
+            return json.loads(value) if value is not None else None
+        except Exception as e:
+            logging.error(f"Error loading session: {str(e)}")
+            return None
+
+    def end_session(self, session_id: str) -> None:
+        """
+        Delete a session, e.g. on logout.
+
+        Args:
+            session_id: Id returned by create_session
+        """
+        if not session_id:
+            return
+        try:
+            self._delete(self.prefix + session_id)
+        except Exception as e:
+            logging.error(f"Error ending session: {str(e)}")
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        """Return a key's value, or None if it is missing or expired."""
+
+    @abstractmethod
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value that expires after ttl seconds."""
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        """Remove a key if it exists."""
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions in process memory; only valid while a single replica serves the app."""
+
+    def __init__(self, ttl: float = DEFAULT_SESSION_TTL, prefix: str = "session:"):
+        super().__init__(ttl, prefix)
+        # key -> (expires at, value)
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (now + ttl, value)
+            self._writes += 1
+            if self._writes % _PURGE_EVERY == 0:
+                for expired in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[expired]
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions in a SQLite file, shared by every replica on one host.
+
+    A local stand-in for Redis with the same semantics: replicas started
+    on the same machine or sharing a volume see each other's sessions. The
+    database runs in WAL mode so lookups don't block on sign-ins, and each
+    thread keeps its own connection.
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, ttl: float = DEFAULT_SESSION_TTL, prefix: str = "session:"):
+        """
+        Open the store, creating the database file if needed.
+
+        Args:
+            path: Path of the SQLite file
+            ttl: Seconds a session stays valid after sign-in
+            prefix: Namespace of the store's keys
+        """
+        super().__init__(ttl, prefix)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=10000")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT value FROM sessions WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT INTO sessions (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, now + ttl)
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            connection.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+    def _delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions in Redis, shared by replicas on any host.
+
+    Needs the redis package, which is only imported when this store is
+    configured. Expiry is left to Redis.
+    """
+
+    def __init__(self, url: str, ttl: float = DEFAULT_SESSION_TTL, prefix: str = "jobwave:session:"):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+            ttl: Seconds a session stays valid after sign-in
+            prefix: Namespace of the store's keys
+        """
+        import redis
+
+        super().__init__(ttl, prefix)
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def _get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        self._client.set(key, value, px=int(ttl * 1000))
+
+    def _delete(self, key: str) -> None:
+        self._client.delete(key)
+
+
+def open_session_store(url: Optional[str] = None, ttl: float = DEFAULT_SESSION_TTL) -> SessionStore:
+    """
+    Open the session store a URL names.
+
+    Args:
+        url: memory:// (the default), sqlite:///path/to/file or redis://host:port/db
+        ttl: Seconds a session stays valid after sign-in
+
+    Returns:
+        The session store
+    """
+    if not url or url.startswith("memory://"):
+        return MemorySessionStore(ttl=ttl)
+    if url.startswith("sqlite://"):
+        return SqliteSessionStore(url[len("sqlite:///"):] or DEFAULT_SQLITE_PATH, ttl=ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(url, ttl=ttl)
+    raise ValueError(f"Unsupported session store URL: {url}")
@@ -0,0 +1,61 @@
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from instrumentation import timed
+
+
+class WarmUp:
+    """
+    Runs an expensive initializer on a background thread.
+
+    Used to import heavy modules and open connections after the first page
+    has been sent, so the first rerun that needs them doesn't wait. The
+    initializer is expected to be memoized (e.g. an st.cache_resource
+    function), so calling it again from the script thread returns the
+    warmed result, or waits for the warm-up still in flight.
+    """
+
+    def __init__(self, name: str, initializer: Callable[[], Any]):
+        """
+        Initialize the warm-up; nothing runs until start().
+
+        Args:
+            name: Name of the warm-up, used in the startup.<name> timer
+            initializer: Callable that does the work
+        """
+        self.name = name
+        self.initializer = initializer
+        self.error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self, wait: bool = False) -> "WarmUp":
+        """
+        Start the warm-up unless it already started.
+
+        Args:
+            wait: Block until the warm-up finished
+
+        Returns:
+            The warm-up itself
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"warm-up-{self.name}", daemon=True)
+                self._thread.start()
+        if wait:
+            self._thread.join()
+        return self
+
+    def done(self) -> bool:
+        """Tell whether the warm-up finished, successfully or not."""
+        return self._thread is not None and not self._thread.is_alive()
+
+    def _run(self) -> None:
+        try:
+            with timed(f"startup.{self.name}"):
+                self.initializer()
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Error warming up {self.name}: {str(e)}")
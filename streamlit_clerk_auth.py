@@ -1,15 +1,175 @@
 import streamlit as st
-import requests
 import json
+import logging
 import time
+import uuid
 from typing import Optional, Dict, Any
-import hmac
-import base64
-import os
 
-class ClerkAuthError(Exception):
-    """Exception raised for errors in Clerk authentication."""
-    pass
+from session_cache import drop_session_cache
+from session_store import DEFAULT_SESSION_TTL, SessionStore, open_session_store
+
+# Cookie in which Clerk's frontend SDK keeps the short-lived session token
+SESSION_COOKIE = "__session"
+
+# Cookie carrying the session id of a demo sign-in, so any replica can restore it
+SESSION_ID_COOKIE = "jobwave_session"
+
+# Session state key of a session id cookie waiting to be written to the browser
+_PENDING_COOKIE = "session_cookie_pending"
+
+# Session state key of a session id found stale, so it is dropped once per session
+_DROPPED_COOKIE = "session_cookie_dropped"
+
+# Namespace of the user ids derived from email addresses; never change it, ids are stored with the data
+USER_ID_NAMESPACE = uuid.UUID("6f1c3e52-8d4b-5a7e-9c2f-1b0d4e6a8f31")
+
+def stable_user_id(email: str) -> str:
+    """
+    Derive a user id from an email address.
+    
+    The id is a UUID5 of the normalized address: the same in every process
+    and replica, and collision-free in practice, unlike the built-in hash,
+    which is salted per process.
+    
+    Args:
+        email: The user's email address
+        
+    Returns:
+        str: The user id
+    """
+    return f"user_{uuid.uuid5(USER_ID_NAMESPACE, email.strip().lower()).hex}"
+
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    """
+    Get the store of signed-in sessions shared by all sessions of this process.
+    
+    SESSION_STORE_URL picks the backend: memory:// keeps sessions in this
+    process, sqlite:///path shares them between replicas on one host and
+    redis://host:port/db between replicas anywhere.
+    
+    Returns:
+        SessionStore: The session store
+    """
+    return open_session_store(
+        st.secrets.get("SESSION_STORE_URL", "memory://"),
+        ttl=float(st.secrets.get("SESSION_TTL", DEFAULT_SESSION_TTL))
+    )
+
+@st.cache_resource
+def get_session_verifier() -> Optional[Any]:
+    """
+    Get the session token verifier shared by all sessions, or None if Clerk isn't configured.
+    
+    The JWKS is fetched on the first verification and then cached, so signing
+    in costs one signature check rather than a call to Clerk's API.
+    
+    Returns:
+        Optional[SessionVerifier]: The verifier
+    """
+    # PyJWT and cryptography load only when a session token arrives
+    from clerk_jwt import JWKSCache, SessionVerifier, jwks_url_for
+    
+    jwks_url = st.secrets.get("CLERK_JWKS_URL", "")
+    frontend_api = st.secrets.get("CLERK_FRONTEND_API", "")
+    if not jwks_url and not frontend_api:
+        return None
+    
+    authorized_parties = st.secrets.get("CLERK_AUTHORIZED_PARTIES", [])
+    if isinstance(authorized_parties, str):
+        authorized_parties = [party.strip() for party in authorized_parties.split(",") if party.strip()]
+    
+    jwks = JWKSCache(
+        jwks_url or jwks_url_for(frontend_api),
+        max_age=float(st.secrets.get("CLERK_JWKS_MAX_AGE", 3600)),
+        min_refresh_interval=float(st.secrets.get("CLERK_JWKS_MIN_REFRESH_INTERVAL", 30))
+    )
+    return SessionVerifier(
+        jwks,
+        issuer=st.secrets.get("CLERK_ISSUER") or None,
+        authorized_parties=authorized_parties,
+        claims_ttl=float(st.secrets.get("CLERK_CLAIMS_TTL", 300))
+    )
+
+def _cookie(name: str) -> Optional[str]:
+    """Read a request cookie, if Streamlit exposes them."""
+    context = getattr(st, "context", None)
+    cookies = getattr(context, "cookies", None) if context is not None else None
+    if not cookies:
+        return None
+    return cookies.get(name)
+
+def _session_token() -> Optional[str]:
+    """Read Clerk's session token from the request cookies."""
+    return _cookie(SESSION_COOKIE)
+
+def _write_session_cookie(session_id: str, max_age: float) -> None:
+    """
+    Set or clear the session id cookie in the browser.
+    
+    Streamlit can read request cookies but not set them, so a script on
+    the page sets it. It takes effect on the next connection, which is
+    when restore_session needs it.
+    
+    Args:
+        session_id: The session id, or "" to clear the cookie
+        max_age: Seconds the browser keeps the cookie; 0 clears it
+    """
+    cookie = json.dumps(f"{SESSION_ID_COOKIE}={session_id}; Max-Age={int(max_age)}; Path=/; SameSite=Strict")
+    st.html(
+        f"<script>document.cookie = {cookie} + (location.protocol === 'https:' ? '; Secure' : '');</script>",
+        unsafe_allow_javascript=True
+    )
+
+def verify_session() -> Optional[Dict[str, Any]]:
+    """
+    Sign the user in from a valid Clerk session token, if the request carries one.
+    
+    Returns:
+        Optional[Dict[str, Any]]: The user object, or None if there is no valid token
+    """
+    token = _session_token()
+    if not token:
+        return None
+    
+    verifier = get_session_verifier()
+    if verifier is None:
+        return None
+    
+    from clerk_jwt import ClerkAuthError, user_from_claims
+    try:
+        return user_from_claims(verifier.verify(token))
+    except ClerkAuthError as e:
+        logging.error(f"Rejected Clerk session token: {str(e)}")
+        return None
+
+def restore_session() -> Optional[Dict[str, Any]]:
+    """
+    Restore a demo sign-in from the session store, e.g. after reconnecting to another replica.
+    
+    Returns:
+        Optional[Dict[str, Any]]: The user object, or None if the cookie names no live session
+    """
+    session_id = _cookie(SESSION_ID_COOKIE)
+    if not session_id or st.session_state.get(_DROPPED_COOKIE) == session_id:
+        return None
+    user_data = get_session_store().load_session(session_id)
+    if user_data is None:
+        # Expired or ended elsewhere; drop the stale id from the browser
+        st.session_state[_DROPPED_COOKIE] = session_id
+        _write_session_cookie("", 0)
+    return user_data
+
+def sign_out() -> None:
+    """
+    End the signed-in session in the session store.
+    
+    The browser keeps the cookie until the next run finds its session
+    ended and clears it; the id is useless by then.
+    """
+    session_id = st.session_state.get("session_id") or _cookie(SESSION_ID_COOKIE)
+    if session_id:
+        get_session_store().end_session(session_id)
 
 def authenticate() -> Optional[Dict[str, Any]]:
     """
@@ -25,9 +185,32 @@ def authenticate() -> Optional[Dict[str, Any]]:
     if "user" not in st.session_state:
         st.session_state.user = None
     
-    # If already authenticated, return the user
+    # A sign-in of the previous run stores its session id in the browser
+    pending = st.session_state.pop(_PENDING_COOKIE, None)
+    if pending:
+        _write_session_cookie(pending, get_session_store().ttl)
+    
+    # If already authenticated, return the user; the token was verified when the session signed in
     if st.session_state.authenticated and st.session_state.user:
-        return st.session_state.user
+        expires_at = st.session_state.user.get("session_expires_at")
+        if not expires_at or time.time() < float(expires_at):
+            return st.session_state.user
+        
+        # The Clerk token expired; the cookie holds a refreshed one unless the session ended
+        user_data = verify_session()
+        if not user_data:
+            drop_session_cache(st.session_state)
+            st.session_state.authenticated = False
+            st.session_state.user = None
+    else:
+        # A Clerk session cookie signs the user in with one local signature check
+        # Otherwise a session stored by any replica, named in a cookie
+        user_data = verify_session() or restore_session()
+    
+    if user_data:
+        st.session_state.authenticated = True
+        st.session_state.user = user_data
+        return user_data
     
     # Get Clerk keys from Streamlit secrets
     clerk_secret_key = st.secrets.get("CLERK_API_KEY", "")
@@ -113,13 +296,10 @@ def authenticate() -> Optional[Dict[str, Any]]:
             try:
                 if email and password:
                     with st.spinner("Processing..."):
-                        # Simulate API delay
-                        time.sleep(1)
-                        
                         if auth_mode == "Sign In":
                             # Demo login logic - in a real app you'd call Clerk's API
                             user_data = {
-                                "id": f"user_{hash(email) % 10000}",
+                                "id": stable_user_id(email),
                                 "email_addresses": [{"email_address": email}],
                                 "first_name": "Demo",
                                 "last_name": "User",
@@ -134,7 +314,7 @@ def authenticate() -> Optional[Dict[str, Any]]:
                                 return None
                                 
                             user_data = {
-                                "id": f"user_{hash(email) % 10000}",
+                                "id": stable_user_id(email),
                                 "email_addresses": [{"email_address": email}],
                                 "first_name": first_name,
                                 "last_name": last_name,
@@ -145,11 +325,13 @@ def authenticate() -> Optional[Dict[str, Any]]:
                         
                         st.session_state.authenticated = True
                         st.session_state.user = user_data
+                        # The cookie is written on the next run; this one ends in a rerun
+                        st.session_state.session_id = get_session_store().create_session(user_data)
+                        st.session_state[_PENDING_COOKIE] = st.session_state.session_id
                         
                         # Success message and rerun to update the UI
                         message = "Signed in successfully!" if auth_mode == "Sign In" else "Account created successfully!"
                         st.success(message)
-                        time.sleep(1)  # Give time for the success message to be seen
                         st.rerun()
                 else:
                     st.error("Please enter your email and password")
@@ -1,61 +1,536 @@
 import streamlit as st
 from supabase import create_client, Client
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, Iterable, List, Any, Iterator, Mapping, Optional, Tuple, Union
+from datetime import datetime, timezone
+import importlib
 import logging
+import threading
+import time
+from query_cache import QueryCache, RecordCache, normalize_filters
+from projections import (
+    JOB_CARD_FIELDS, JOB_DETAIL_FIELDS, JOB_SEARCH_FIELDS, JOB_MATCH_FIELDS, COMPANY_CARD_FIELDS, PROFILE_FIELDS,
+    CANDIDATE_FIELDS, APPLICATION_ROW_FIELDS, with_columns
+)
+from job_search import JobSearchIndex
+from normalization import JobFacetIndex, SALARY_RANGES, location_region, normalize_job
+from recommendations import JobRecommender
+from candidate_index import CandidateIndex
+from portal_stats import PortalStats, StatsSnapshot, SUCCESS_STATUSES
+from job_import import CONFLICT_KEY, ImportReport, JobImporter, read_rows
+from write_behind import DEFAULT_JOURNAL_PATH, WriteBehindQueue, WriteTicket
+from instrumentation import REGISTRY, Sample, instrument_class, instrument_http_client
+from models import Application, Company, Job, JobBatch, Profile
+from pagination import (
+    JOB_SORT_KEY, JOB_SYNC_KEY, COMPANY_SORT_KEY, PROFILE_SORT_KEY, apply_keyset, cursor_for, decode_cursor, paginate_rows
+)
 
+
+# Mock data used when the database is not available
+MOCK_JOBS = [
+    {
+        "id": "1",
+        "title": "Senior Full Stack Developer", 
+        "company": "TechNova Inc.",
+        "location": "Remote",
+        "job_type": "Full-time",
+        "salary": "$120K - $150K",
+        "posted": "2 days ago",
+        "description": "Join our team to build innovative solutions for enterprise clients using React, Node.js, and AWS."
+    },
+    {
+        "id": "2",
+        "title": "UX/UI Designer", 
+        "company": "CreativeMinds",
+        "location": "New York, USA",
+        "job_type": "Full-time",
+        "salary": "$90K - $110K",
+        "posted": "5 days ago",
+        "description": "We're looking for a talented designer to create beautiful interfaces. Experience with Figma and design systems required."
+    },
+    {
+        "id": "3",
+        "title": "Data Scientist", 
+        "company": "DataFlow Analytics",
+        "location": "San Francisco, USA",
+        "job_type": "Full-time",
+        "salary": "$130K - $160K",
+        "posted": "1 week ago",
+        "description": "Build ML models and analyze large datasets to extract valuable insights. Strong Python and statistics skills required."
+    },
+    {
+        "id": "4",
+        "title": "DevOps Engineer", 
+        "company": "CloudSphere",
+        "location": "Remote",
+        "job_type": "Contract",
+        "salary": "$100K - $130K",
+        "posted": "2 weeks ago",
+        "description": "Improve our cloud infrastructure and implement CI/CD pipelines. Experience with Kubernetes and AWS required."
+    },
+    {
+        "id": "5",
+        "title": "Product Manager", 
+        "company": "InnovateCorp",
+        "location": "Chicago, USA",
+        "job_type": "Full-time",
+        "salary": "$110K - $140K",
+        "posted": "3 days ago",
+        "description": "Lead product development from concept to launch. Strong communication and analytical skills required."
+    }
+]
+
+MOCK_COMPANIES = [
+    {
+        "id": "1",
+        "name": "TechNova Inc.",
+        "industry": "Technology",
+        "location": "San Francisco, USA",
+        "company_size": "Medium (201-1000)",
+        "rating": "4.8/5",
+        "description": "A leading software development company specializing in enterprise solutions.",
+        "open_jobs": 15
+    },
+    {
+        "id": "2",
+        "name": "DataFlow Analytics",
+        "industry": "Technology",
+        "location": "New York, USA",
+        "company_size": "Small (51-200)",
+        "rating": "4.6/5",
+        "description": "Data science and analytics company helping businesses leverage their data.",
+        "open_jobs": 8
+    },
+    {
+        "id": "3",
+        "name": "CloudSphere",
+        "industry": "Technology",
+        "location": "Seattle, USA",
+        "company_size": "Large (1000+)",
+        "rating": "4.5/5",
+        "description": "Cloud infrastructure and services provider with global presence.",
+        "open_jobs": 23
+    }
+]
+
+
+MOCK_APPLICATIONS = [
+    {
+        "id": "1",
+        "job_id": "1",
+        "job_title": "Senior Full Stack Developer",
+        "company": "TechNova Inc.",
+        "applied_date": "2023-02-15",
+        "status": "Interview Scheduled",
+        "next_step": "Technical Interview on March 5, 2023"
+    },
+    {
+        "id": "2",
+        "job_id": "2",
+        "job_title": "UX/UI Designer",
+        "company": "CreativeMinds",
+        "applied_date": "2023-02-10",
+        "status": "Application Review",
+        "next_step": "Waiting for feedback"
+    },
+    {
+        "id": "3",
+        "job_id": "5",
+        "job_title": "Product Manager",
+        "company": "InnovateCorp",
+        "applied_date": "2023-02-01",
+        "status": "Rejected",
+        "next_step": "Try other opportunities"
+    }
+]
+
+MOCK_PROFILE = {
+    "user_id": "demo",
+    "first_name": "Demo",
+    "last_name": "User",
+    "email": "demo@example.com",
+    "phone": "+1 555-123-4567",
+    "city": "New York",
+    "country": "USA",
+    "about": "This is a demo profile as the database connection is not available.",
+    "website": "https://example.com",
+    "role": "jobseeker",
+    "skills": ["Python", "JavaScript", "React", "Node.js", "SQL", "AWS", "Docker", "Git"],
+    "preferred_titles": ["Full Stack Developer", "Frontend Developer"],
+    "preferred_job_types": ["Full-time", "Contract"],
+    "preferred_locations": ["Remote", "United States"],
+    "salary_expectation": "$100K - $120K"
+}
+
+MOCK_CANDIDATES = [
+    {
+        "user_id": "candidate_1",
+        "first_name": "Alex",
+        "last_name": "Morgan",
+        "city": "Austin",
+        "country": "USA",
+        "role": "jobseeker",
+        "skills": ["Python", "AWS", "Docker", "PostgreSQL"],
+        "experience_level": "Senior",
+        "preferred_titles": ["Backend Developer"],
+        "preferred_locations": ["Remote", "United States"]
+    },
+    {
+        "user_id": "candidate_2",
+        "first_name": "Priya",
+        "last_name": "Shah",
+        "city": "London",
+        "country": "United Kingdom",
+        "role": "jobseeker",
+        "skills": ["Python", "Machine Learning", "SQL", "GCP"],
+        "experience_level": "Mid Level",
+        "preferred_titles": ["Data Scientist"],
+        "preferred_locations": ["Europe"]
+    },
+    {
+        "user_id": "candidate_3",
+        "first_name": "Sam",
+        "last_name": "Lee",
+        "city": "Seattle",
+        "country": "USA",
+        "role": "jobseeker",
+        "skills": ["JavaScript", "React", "Node.js", "AWS"],
+        "experience_level": "Entry Level",
+        "preferred_titles": ["Frontend Developer"],
+        "preferred_locations": ["Remote"]
+    },
+    {
+        "user_id": "candidate_4",
+        "first_name": "Maria",
+        "last_name": "Garcia",
+        "city": "Berlin",
+        "country": "Germany",
+        "role": "jobseeker",
+        "skills": ["Kubernetes", "AWS", "Terraform", "Python"],
+        "experience_level": "Senior",
+        "preferred_titles": ["DevOps Engineer"],
+        "preferred_locations": ["Remote", "Europe"]
+    }
+]
+
+MOCK_PORTAL_STATS = {
+    "active_jobs": 5000,
+    "job_seekers": 2000000,
+    "companies": 10000,
+    "applications": 100000,
+    "successful_applications": 85000
+}
+
+# Fixture records are built once at import and shared by every call
+MOCK_JOB_RECORDS = tuple(Job.from_row(job) for job in MOCK_JOBS)
+MOCK_COMPANY_RECORDS = tuple(Company.from_row(company) for company in MOCK_COMPANIES)
+_MOCK_JOBS_BY_ID = {job.id: job for job in MOCK_JOB_RECORDS}
+MOCK_CANDIDATE_RECORDS = tuple(Profile.from_row(candidate) for candidate in MOCK_CANDIDATES)
+MOCK_APPLICATION_RECORDS = tuple(
+    Application.from_row(application, job=_MOCK_JOBS_BY_ID.get(application["job_id"]))
+    for application in MOCK_APPLICATIONS
+)
+
+
+def apply_job_filters(
+    query,
+    filters: Optional[Dict[str, Any]],
+    job_ids: Optional[List[str]] = None,
+    resolved: Tuple[str, ...] = ()
+):
+    """
+    Apply the job search filters to a PostgREST query.
+    
+    When the in-memory indexes already resolved the search text (and possibly
+    the filters named in resolved) to job ids, those ids replace the
+    unindexable ilike('%term%') scan.
+    """
+    if filters:
+        # Apply filters
+        if job_ids is not None:
+            query = query.in_("id", job_ids)
+        elif "search" in filters and filters["search"]:
+            query = query.ilike("title", f"%{filters['search']}%")
+        
+        if "location" in filters and filters["location"] and filters["location"] != "Any Location" and "location" not in resolved:
+            region = location_region(filters["location"])
+            if region:
+                query = query.eq("region", region)
+            else:
+                query = query.eq("location", filters["location"])
+        
+        if "job_type" in filters and filters["job_type"] and filters["job_type"] != "Any Type":
+            query = query.eq("job_type", filters["job_type"])
+        
+        if "experience" in filters and filters["experience"] and filters["experience"] != "Any Level":
+            query = query.eq("experience_level", filters["experience"])
+        
+        if "salary" in filters and filters["salary"] in SALARY_RANGES and "salary" not in resolved:
+            # Match every job whose range overlaps the selected range
+            minimum, maximum = SALARY_RANGES[filters["salary"]]
+            if minimum is not None:
+                query = query.gte("salary_max", minimum)
+            if maximum is not None:
+                query = query.lte("salary_min", maximum)
+    return query
+
+
+def apply_company_filters(query, filters: Optional[Dict[str, Any]]):
+    """Apply the company search filters to a PostgREST query."""
+    if filters:
+        # Apply filters
+        if "search" in filters and filters["search"]:
+            query = query.ilike("name", f"%{filters['search']}%")
+        
+        if "industry" in filters and filters["industry"] and filters["industry"] != "All Industries":
+            query = query.eq("industry", filters["industry"])
+        
+        if "size" in filters and filters["size"] and filters["size"] != "Any Size":
+            query = query.eq("company_size", filters["size"])
+    return query
+
+
+def apply_profile_filters(query, filters: Optional[Dict[str, Any]]):
+    """Apply the profile filters to a PostgREST query."""
+    if filters:
+        if "role" in filters and filters["role"]:
+            query = query.eq("role", filters["role"])
+    return query
+
+
+# Sort key, direction and record type of each paginated table
+_PAGED_TABLES = {
+    "jobs": (JOB_SORT_KEY, True, Job),
+    "companies": (COMPANY_SORT_KEY, False, Company),
+    "profiles": (PROFILE_SORT_KEY, False, Profile),
+}
+
+def load_factory(path: str) -> Callable[[str, str], Any]:
+    """
+    Import a client constructor named as "module:function".
+    
+    Args:
+        path: Dotted module path and attribute, e.g. "benchmarks.sqlite_postgrest:create_client"
+        
+    Returns:
+        The callable, taking the Supabase URL and key
+    """
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+# Maximum number of ids sent in one in_() filter, to keep request URLs short
+ID_BATCH_SIZE = 200
+
+# Maximum number of ranked search hits turned into an id filter; they go
+# into one in_() filter, and larger facet matches are filtered by the database
+SEARCH_MAX_IDS = ID_BATCH_SIZE
+
+
+@instrument_class(
+    "connector",
+    exclude=(
+        "is_connected", "invalidate_cache", "cache_stats", "job_cache_stats", "write_queue_stats", "_collect_metrics",
+        "_page_query", "_page_result"
+    )
+)
 class SupabaseConnector:
     """Class to handle Supabase database operations for the job portal."""
     
-    def __init__(self):
-        """Initialize the Supabase client."""
+    def __init__(self, client: Optional[Any] = None, settings: Optional[Mapping[str, Any]] = None):
+        """
+        Initialize the Supabase client.
+        
+        Args:
+            client: A ready client to use instead of connecting with the
+                SUPABASE_URL and SUPABASE_KEY secrets, e.g. a local stand-in
+            settings: Configuration to read instead of st.secrets
+        """
+        self.settings = st.secrets if settings is None else settings
+        
+        # Result cache shared by every session using this connector
+        self.query_cache = QueryCache(
+            ttl=float(self.settings.get("QUERY_CACHE_TTL", 60)),
+            max_entries=int(self.settings.get("QUERY_CACHE_MAX_ENTRIES", 256))
+        )
+        
+        # Job card records shared by every session, keyed by job id
+        self.job_cache = RecordCache(
+            max_entries=int(self.settings.get("JOB_CACHE_MAX_ENTRIES", 10000)),
+            ttl=float(self.settings.get("JOB_CACHE_TTL", 300))
+        )
+        
+        # Full-text job index, built from a snapshot in the background
+        self.search_index = JobSearchIndex()
+        self.search_refresh_interval = float(self.settings.get("SEARCH_REFRESH_SECONDS", 300))
+        # Refreshes only see changed rows, so deleted jobs leave with the next full rebuild
+        self.search_rebuild_interval = float(self.settings.get("SEARCH_REBUILD_SECONDS", 3600))
+        self._search_lock = threading.Lock()
+        self._search_state = {"ready": False, "building": False, "refreshed_at": 0.0, "rebuilt_at": 0.0, "watermark": None}
+        
+        # Salary and region index, fed from the same snapshot as the search index
+        self.facet_index = JobFacetIndex()
+        
+        # Job recommender, refit from a snapshot in the background
+        self.recommender = JobRecommender()
+        self.recommender_refresh_interval = float(self.settings.get("RECOMMENDER_REFRESH_SECONDS", 3600))
+        self._recommender_state = {"ready": False, "building": False, "refreshed_at": 0.0}
+        
+        # Talent pool index for employer candidate search
+        self.candidate_index = CandidateIndex()
+        self.candidate_refresh_interval = float(self.settings.get("CANDIDATE_INDEX_REFRESH_SECONDS", 900))
+        self._candidate_state = {"ready": False, "building": False, "refreshed_at": 0.0}
+        
+        # Home page counters, kept current by the write paths below
+        self.portal_stats = PortalStats(
+            self._count_portal_stats,
+            reconcile_interval=float(self.settings.get("PORTAL_STATS_RECONCILE_SECONDS", 900))
+        )
+        
         try:
-            self.supabase_url = st.secrets.get("SUPABASE_URL", "")
-            self.supabase_key = st.secrets.get("SUPABASE_KEY", "")
+            self.supabase_url = self.settings.get("SUPABASE_URL", "")
+            self.supabase_key = self.settings.get("SUPABASE_KEY", "")
             
-            if not self.supabase_url or not self.supabase_key:
+            if client is not None:
+                self.client = client
+            elif not self.supabase_url or not self.supabase_key:
                 st.warning("Supabase credentials not found in secrets. Using mock data.")
                 self.client = None
             else:
-                self.client = create_client(self.supabase_url, self.supabase_key)
+                # "module:function" of an alternative client constructor, e.g. a local stand-in for load tests
+                factory = self.settings.get("SUPABASE_CLIENT_FACTORY")
+                self.client = (load_factory(factory) if factory else create_client)(self.supabase_url, self.supabase_key)
+                # Stand-ins without an httpx session aren't instrumented
+                session = getattr(getattr(self.client, "postgrest", None), "session", None)
+                if session is not None:
+                    instrument_http_client(session)
                 
         except Exception as e:
             logging.error(f"Error initializing Supabase client: {str(e)}")
             st.error(f"Error connecting to database. Using mock data instead.")
             self.client = None
+        
+        # Profile and company saves are written in the background; see WriteBehindQueue
+        self.write_queue = None
+        if self.client is not None:
+            self.write_queue = WriteBehindQueue(
+                self._flush_writes,
+                journal_path=self.settings.get("WRITE_JOURNAL_PATH", DEFAULT_JOURNAL_PATH),
+                on_flushed=self._on_writes_flushed,
+                flush_interval=float(self.settings.get("WRITE_FLUSH_INTERVAL", 0.5)),
+                max_batch=int(self.settings.get("WRITE_MAX_BATCH", 100))
+            )
+        
+        if self.client is None:
+            self.search_index.build(MOCK_JOB_RECORDS)
+            self.facet_index.build(MOCK_JOB_RECORDS)
+            self._search_state["ready"] = True
+            self.recommender.fit(MOCK_JOB_RECORDS)
+            self._recommender_state["ready"] = True
+            self.candidate_index.build(MOCK_CANDIDATE_RECORDS)
+            self._candidate_state["ready"] = True
+        
+        # Seed the counters from the fixtures right away, or from the database in the background
+        self.portal_stats.reconcile(wait=not self.is_connected())
+        
+        # Cache and queue gauges for the metrics endpoint
+        REGISTRY.add_collector(self._collect_metrics)
     
     def is_connected(self) -> bool:
         """Check if connected to Supabase."""
         return self.client is not None
     
+    # Cache operations
+    def invalidate_cache(self, *tables: str) -> None:
+        """
+        Drop cached read results after a write.
+        
+        Args:
+            tables: Tables that were written; all tables if omitted
+        """
+        self.query_cache.invalidate(*tables)
+    
+    def write_queue_stats(self) -> Dict[str, Any]:
+        """Get counters of the write-behind queue, including writes not stored yet."""
+        return self.write_queue.stats() if self.write_queue is not None else {}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters of the query cache."""
+        return self.query_cache.stats()
+    
+    def job_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters of the shared job record cache."""
+        return self.job_cache.stats()
+    
+    def _collect_metrics(self) -> List[Sample]:
+        """Report cache hit counters and queue sizes for the metrics endpoint."""
+        samples: List[Sample] = []
+        for cache, stats in (("query", self.cache_stats()), ("job_records", self.job_cache_stats())):
+            labels = {"cache": cache}
+            samples.append(("jobwave_cache_hits_total", "counter", "Cache lookups that hit.", labels, stats["hits"]))
+            samples.append(("jobwave_cache_misses_total", "counter", "Cache lookups that missed.", labels, stats["misses"]))
+            samples.append(("jobwave_cache_entries", "gauge", "Entries currently cached.", labels, stats["size"]))
+        queue = self.write_queue_stats()
+        if queue:
+            samples.append(("jobwave_write_queue_pending", "gauge", "Records waiting to be written.", {}, queue["pending"]))
+            samples.append(("jobwave_write_queue_failed_total", "counter", "Queued writes that gave up.", {}, queue["failed"]))
+        return samples
+    
+    # Statistics operations
+    def get_portal_stats(self) -> StatsSnapshot:
+        """
+        Get the precomputed portal counters for the Home page.
+        
+        Returns:
+            The counters with the time they were last updated
+        """
+        return self.portal_stats.snapshot()
+    
+    def _count_portal_stats(self) -> Dict[str, int]:
+        """Count the rows behind each portal counter, raising on errors."""
+        if not self.is_connected():
+            return dict(MOCK_PORTAL_STATS)
+        
+        def count(table: str, query=lambda q: q) -> int:
+            # limit(1) keeps the payload to a single row; the total comes back in Content-Range
+            response = query(self.client.table(table).select("id", count="exact")).limit(1).execute()
+            return response.count or 0
+        
+        return {
+            "active_jobs": count("jobs"),
+            "job_seekers": count("profiles", lambda q: q.eq("role", "jobseeker")),
+            "companies": count("companies"),
+            "applications": count("applications"),
+            "successful_applications": count("applications", lambda q: q.in_("status", list(SUCCESS_STATUSES)))
+        }
+    
     # User operations
-    def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+    def get_user_profile(self, user_id: str, fields: str = PROFILE_FIELDS) -> Optional[Profile]:
         """
         Get a user's profile from the database.
         
         Args:
             user_id: The user's ID
+            fields: Columns to fetch
             
         Returns:
             The user profile or None if not found
         """
         if not self.is_connected():
             # Return mock data
-            return {
-                "user_id": user_id,
-                "first_name": "Demo",
-                "last_name": "User",
-                "email": "demo@example.com",
-                "phone": "+1 555-123-4567",
-                "city": "New York",
-                "country": "USA",
-                "about": "This is a demo profile as the database connection is not available.",
-                "website": "https://example.com",
-                "role": "jobseeker"
-            }
+            return Profile.from_row({**MOCK_PROFILE, "user_id": user_id})
             
         try:
-            response = self.client.table("profiles").select("*").eq("user_id", user_id).single().execute()
-            return response.data if response.data else None
+            # No row yet is not an error: the profile may still be in the write-behind queue
+            response = self.client.table("profiles").select(fields).eq("user_id", user_id).limit(1).execute()
+            row = response.data[0] if response.data else None
+            # Saves still in the write-behind queue win over what the database has
+            pending = self.write_queue.pending_values("profiles", user_id)
+            if row is None and not pending:
+                return None
+            profile = Profile.from_row({**(row or {"user_id": user_id}), **(pending or {})})
+            if fields == PROFILE_FIELDS:
+                # Full reads keep the talent pool index current between snapshots
+                self._index_candidate(profile)
+            return profile
         except Exception as e:
             logging.error(f"Error fetching user profile: {str(e)}")
             return None
@@ -64,228 +539,866 @@ class SupabaseConnector:
         """
         Create a new user profile.
         
+        The profile is queued for writing in the background; it is visible to
+        get_user_profile and the talent search right away.
+        
         Args:
-            profile_data: The profile data to insert
+            profile_data: The profile data to insert, including user_id
             
         Returns:
-            True if successful, False otherwise
+            True if the profile was queued, False otherwise
         """
         if not self.is_connected():
             # Simulate success for demo
             return True
             
         try:
-            self.client.table("profiles").insert(profile_data).execute()
+            user_id = profile_data["user_id"]
+            # The upsert may only update a profile that is stored or queued already
+            existed = self.write_queue.pending_values("profiles", user_id) is not None or bool(
+                self.client.table("profiles").select("user_id").eq("user_id", user_id).limit(1).execute().data
+            )
+            ticket = self.save_user_profile(user_id, profile_data)
+            if ticket.done() and not ticket.succeeded:
+                return False
+            if not existed and profile_data.get("role", "jobseeker") == "jobseeker":
+                self.portal_stats.apply_delta(job_seekers=1)
+            self._index_candidate(Profile.from_row(profile_data))
             return True
         except Exception as e:
             logging.error(f"Error creating user profile: {str(e)}")
             return False
     
+    def save_user_profile(self, user_id: str, changes: Dict[str, Any]) -> WriteTicket:
+        """
+        Save changes to a user's profile, such as the Personal Info form.
+        
+        Args:
+            user_id: The user's ID
+            changes: Profile columns to set
+            
+        Returns:
+            A ticket that resolves once the changes are stored
+        """
+        return self._enqueue_write("profiles", "user_id", user_id, changes)
+    
+    def save_preferences(self, user_id: str, preferences: Dict[str, Any]) -> WriteTicket:
+        """
+        Save a job seeker's skills and job preferences.
+        
+        Preferences live on the profile row, so they coalesce with other
+        pending saves of the same profile into one write.
+        
+        Args:
+            user_id: The user's ID
+            preferences: Values for skills, preferred_titles, preferred_job_types,
+                preferred_locations and salary_expectation
+            
+        Returns:
+            A ticket that resolves once the preferences are stored
+        """
+        return self._enqueue_write("profiles", "user_id", user_id, {
+            name: list(value) if isinstance(value, (list, tuple)) else value
+            for name, value in preferences.items()
+        })
+    
+    def save_company_profile(self, owner_id: str, changes: Dict[str, Any]) -> WriteTicket:
+        """
+        Save an employer's company profile.
+        
+        Args:
+            owner_id: The employer's user ID; companies are unique per owner_id
+            changes: Company columns to set
+            
+        Returns:
+            A ticket that resolves once the changes are stored
+        """
+        return self._enqueue_write("companies", "owner_id", owner_id, changes)
+    
+    def _enqueue_write(self, table: str, key_column: str, key: str, values: Dict[str, Any]) -> WriteTicket:
+        """Queue a record write and drop cached reads it makes stale."""
+        if self.write_queue is None:
+            # Simulate success for demo
+            return WriteTicket.completed()
+        
+        ticket = self.write_queue.enqueue(table, key_column, key, values)
+        self.invalidate_cache(table)
+        return ticket
+    
+    def _flush_writes(self, table: str, key_column: str, rows: List[Dict[str, Any]]) -> None:
+        """Upsert one batch from the write-behind queue, raising on errors."""
+        self.client.table(table).upsert(rows, on_conflict=key_column).execute()
+    
+    def _on_writes_flushed(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """Drop cached reads that were filled while the writes were in flight."""
+        self.invalidate_cache(table)
+    
+    # Candidate operations
+    def search_candidates(self, query: str, limit: int = 20) -> List[Tuple[Profile, float]]:
+        """
+        Search the talent pool with a boolean skill query.
+        
+        Args:
+            query: Query such as "Python AND AWS AND Remote"; see CandidateIndex.search
+            limit: Maximum number of candidates to return
+            
+        Returns:
+            (profile, match score) pairs, best match first; empty until the index is built
+            
+        Raises:
+            QuerySyntaxError: If the query can't be parsed
+        """
+        state = self._candidate_state
+        if self.is_connected() and time.monotonic() - state["refreshed_at"] > self.candidate_refresh_interval:
+            self.refresh_candidate_index()
+        if not state["ready"]:
+            return []
+        return self.candidate_index.search(query, limit)
+    
+    def refresh_candidate_index(self, wait: bool = False) -> None:
+        """
+        Rebuild the talent pool index from a snapshot of job seeker profiles.
+        
+        Args:
+            wait: Run in the calling thread instead of in the background
+        """
+        with self._search_lock:
+            if self._candidate_state["building"]:
+                return
+            self._candidate_state["building"] = True
+        
+        if wait:
+            self._sync_candidate_index()
+        else:
+            threading.Thread(target=self._sync_candidate_index, name="candidate-index", daemon=True).start()
+    
+    def _index_candidate(self, profile: Profile) -> None:
+        """Add a job seeker to the talent pool index, or drop a profile that is no longer one."""
+        if profile.role == "jobseeker":
+            self.candidate_index.add(profile)
+        else:
+            self.candidate_index.remove(profile.user_id)
+    
+    def _sync_candidate_index(self) -> None:
+        """Build a fresh talent pool index off to the side and swap it in."""
+        state = self._candidate_state
+        try:
+            index = CandidateIndex()
+            index.build(self._iter_pages("profiles", {"role": "jobseeker"}, 1000, CANDIDATE_FIELDS))
+            self.candidate_index = index
+            state["ready"] = True
+        except Exception as e:
+            logging.error(f"Error building candidate index: {str(e)}")
+        finally:
+            state["refreshed_at"] = time.monotonic()
+            state["building"] = False
+    
     # Job operations
-    def get_jobs(self, filters: Optional[Dict[str, Any]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_jobs(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        fields: str = JOB_CARD_FIELDS
+    ) -> List[Job]:
         """
         Get jobs with optional filtering.
         
         Args:
             filters: Optional dictionary of filters
             limit: Maximum number of jobs to return
+            fields: Columns to fetch, card columns by default
+            
+        Returns:
+            List of jobs, newest first
+        """
+        jobs, _ = self.get_jobs_page(filters, page_size=limit, fields=fields)
+        return jobs
+    
+    def get_job(self, job_id: str, fields: str = JOB_DETAIL_FIELDS) -> Optional[Job]:
+        """
+        Get a single job for its detail view.
+        
+        Args:
+            job_id: The job's ID
+            fields: Columns to fetch, the full detail row by default
             
         Returns:
-            List of jobs
+            The job or None if not found
         """
         if not self.is_connected():
             # Return mock data
-            return [
-                {
-                    "id": "1",
-                    "title": "Senior Full Stack Developer", 
-                    "company": "TechNova Inc.",
-                    "location": "Remote",
-                    "job_type": "Full-time",
-                    "salary": "$120K - $150K",
-                    "posted": "2 days ago",
-                    "description": "Join our team to build innovative solutions for enterprise clients using React, Node.js, and AWS."
-                },
-                {
-                    "id": "2",
-                    "title": "UX/UI Designer", 
-                    "company": "CreativeMinds",
-                    "location": "New York, USA",
-                    "job_type": "Full-time",
-                    "salary": "$90K - $110K",
-                    "posted": "5 days ago",
-                    "description": "We're looking for a talented designer to create beautiful interfaces. Experience with Figma and design systems required."
-                },
-                {
-                    "id": "3",
-                    "title": "Data Scientist", 
-                    "company": "DataFlow Analytics",
-                    "location": "San Francisco, USA",
-                    "job_type": "Full-time",
-                    "salary": "$130K - $160K",
-                    "posted": "1 week ago",
-                    "description": "Build ML models and analyze large datasets to extract valuable insights. Strong Python and statistics skills required."
-                },
-                {
-                    "id": "4",
-                    "title": "DevOps Engineer", 
-                    "company": "CloudSphere",
-                    "location": "Remote",
-                    "job_type": "Contract",
-                    "salary": "$100K - $130K",
-                    "posted": "2 weeks ago",
-                    "description": "Improve our cloud infrastructure and implement CI/CD pipelines. Experience with Kubernetes and AWS required."
-                },
-                {
-                    "id": "5",
-                    "title": "Product Manager", 
-                    "company": "InnovateCorp",
-                    "location": "Chicago, USA",
-                    "job_type": "Full-time",
-                    "salary": "$110K - $140K",
-                    "posted": "3 days ago",
-                    "description": "Lead product development from concept to launch. Strong communication and analytical skills required."
-                }
-            ]
+            return next((job for job in MOCK_JOB_RECORDS if job.id == str(job_id)), None)
             
         try:
-            query = self.client.table("jobs").select("*").limit(limit)
+            key = ("detail", str(job_id), fields)
+            return self.query_cache.get_or_load("jobs", key, lambda: self._query_job(job_id, fields))
+        except Exception as e:
+            logging.error(f"Error fetching job: {str(e)}")
+            return None
+    
+    def _query_job(self, job_id: str, fields: str) -> Optional[Job]:
+        """Fetch one job row from Supabase, raising on errors."""
+        response = self.client.table("jobs").select(fields).eq("id", job_id).limit(1).execute()
+        return Job.from_row(response.data[0]) if response.data else None
+    
+    def create_job(self, job_data: Dict[str, Any]) -> bool:
+        """
+        Post a new job.
+        
+        Args:
+            job_data: The job data to insert
             
-            if filters:
-                # Apply filters
-                if "search" in filters and filters["search"]:
-                    query = query.ilike("title", f"%{filters['search']}%")
-                
-                if "location" in filters and filters["location"] and filters["location"] != "Any Location":
-                    query = query.eq("location", filters["location"])
-                
-                if "job_type" in filters and filters["job_type"] and filters["job_type"] != "Any Type":
-                    query = query.eq("job_type", filters["job_type"])
-                
-                if "experience" in filters and filters["experience"] and filters["experience"] != "Any Level":
-                    query = query.eq("experience_level", filters["experience"])
-                
-                if "salary" in filters and filters["salary"] and filters["salary"] != "Any Range":
-                    # Handle salary range filtering (simplified)
-                    if filters["salary"] == "Under $50K":
-                        query = query.lt("salary_max", 50000)
-                    elif filters["salary"] == "$50K - $100K":
-                        query = query.gte("salary_min", 50000).lt("salary_max", 100000)
-                    elif filters["salary"] == "$100K - $150K":
-                        query = query.gte("salary_min", 100000).lt("salary_max", 150000)
-                    elif filters["salary"] == "Over $150K":
-                        query = query.gte("salary_min", 150000)
-            
-            response = query.execute()
-            return response.data if response.data else []
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_connected():
+            # Simulate success for demo
+            return True
+            
+        try:
+            # posted_at is the first pagination key; a job without one would sort after all others
+            job_data = {"posted_at": datetime.now(timezone.utc).isoformat(), **job_data}
+            response = self.client.table("jobs").insert(normalize_job(job_data)).execute()
+            self.invalidate_cache("jobs")
+            self._index_written_jobs(response.data or [])
+            self.portal_stats.apply_delta(active_jobs=1)
+            return True
+        except Exception as e:
+            logging.error(f"Error creating job: {str(e)}")
+            return False
+
+    def import_jobs(
+        self,
+        source: Union[str, Iterable[Dict[str, Any]]],
+        batch_size: int = 500,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        on_progress: Optional[Callable[[ImportReport], None]] = None
+    ) -> ImportReport:
+        """
+        Bulk import a partner job feed.
+
+        Rows are validated and normalized, deduplicated on external_key and
+        upserted in batches; see JobImporter. Once the import finishes the
+        portal counters are reconciled and the recommender refit in the
+        background, since an upsert doesn't say which rows were new.
+
+        Args:
+            source: Path of a CSV or JSON Lines feed, or an iterable of raw rows
+            batch_size: Rows per upsert request
+            concurrency: Upsert requests in flight at once
+            max_retries: Retries per batch before its rows count as failed
+            on_progress: Called periodically with the running report
+
+        Returns:
+            The import report
+        """
+        importer = JobImporter(
+            self._upsert_job_batch,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            on_progress=on_progress
+        )
+        report = importer.run(read_rows(source) if isinstance(source, str) else source)
+        if self.is_connected() and report.rows_written:
+            self.portal_stats.reconcile()
+            self.refresh_recommender()
+        return report
+
+    def _upsert_job_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Upsert one batch of validated jobs on external_key, raising on errors."""
+        if not self.is_connected():
+            # Simulate success for demo
+            return
+
+        response = self.client.table("jobs").upsert(rows, on_conflict=CONFLICT_KEY).execute()
+        written = response.data or []
+        self.invalidate_cache("jobs")
+        self.job_cache.discard(*(job["id"] for job in written if "id" in job))
+        self._index_written_jobs(written)
+
+    def _index_written_jobs(self, written: List[Dict[str, Any]]) -> None:
+        """Keep the search and facet indexes current with written rows until the next sync."""
+        if self._search_state["ready"]:
+            for job in written:
+                if "id" in job:
+                    self.search_index.add(job)
+                    self.facet_index.add(job)
+
+    def get_jobs_by_ids(self, job_ids: List[str]) -> Dict[str, Job]:
+        """
+        Resolve job ids to card records through the shared job cache.
+        
+        Only ids missing from the cache are fetched, in batched in_() queries.
+        
+        Args:
+            job_ids: The job IDs to resolve
+            
+        Returns:
+            Jobs by ID; IDs that don't exist are left out
+        """
+        if not self.is_connected():
+            # Return mock data
+            return {str(i): _MOCK_JOBS_BY_ID[str(i)] for i in job_ids if str(i) in _MOCK_JOBS_BY_ID}
+        
+        jobs, missing = self.job_cache.get_many(job_ids)
+        for start in range(0, len(missing), ID_BATCH_SIZE):
+            batch = missing[start:start + ID_BATCH_SIZE]
+            try:
+                response = self.client.table("jobs").select(JOB_CARD_FIELDS).in_("id", batch).execute()
+            except Exception as e:
+                logging.error(f"Error fetching jobs by id: {str(e)}")
+                continue
+            fetched = {job.id: job for job in (Job.from_row(row) for row in response.data or [])}
+            self.job_cache.put_many(fetched)
+            jobs.update(fetched)
+        return jobs
+    
+    def get_jobs_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        fields: str = JOB_CARD_FIELDS
+    ) -> Tuple[List[Job], Optional[str]]:
+        """
+        Get one page of jobs using keyset pagination.
+        
+        Jobs are ordered newest first by (posted_at, id), so every page is a
+        single index seek no matter how deep into the listing it is.
+        
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of jobs per page
+            cursor: Cursor returned with the previous page, or None for the first page
+            fields: Columns to fetch, card columns by default
+            
+        Returns:
+            The jobs on the page and the cursor of the next page (None on the last page)
+        """
+        if not self.is_connected():
+            # Paginate mock data
+            jobs = MOCK_JOB_RECORDS
+            job_ids, _ = self._filter_job_ids(filters)
+            if job_ids is not None:
+                hits = set(job_ids)
+                jobs = [job for job in jobs if job.id in hits]
+            return paginate_rows(jobs, JOB_SORT_KEY, cursor, page_size, descending=True)
+            
+        try:
+            key = (normalize_filters(filters), page_size, cursor, fields)
+            return self.query_cache.get_or_load(
+                "jobs", key, lambda: self._query_page("jobs", filters, page_size, cursor, fields)
+            )
         except Exception as e:
             logging.error(f"Error fetching jobs: {str(e)}")
+            return [], None
+    
+    def iter_jobs(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        fields: str = JOB_CARD_FIELDS
+    ) -> Iterator[Job]:
+        """
+        Stream all matching jobs, fetching one page at a time.
+        
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of jobs fetched per round trip
+            fields: Columns to fetch, card columns by default
+            
+        Yields:
+            Jobs, newest first
+        """
+        yield from self._iter_pages("jobs", filters, page_size, fields)
+    
+    def load_job_batch(self, filters: Optional[Dict[str, Any]] = None, page_size: int = 1000) -> JobBatch:
+        """
+        Load all matching jobs into a compact columnar batch.
+        
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of jobs fetched per round trip
+            
+        Returns:
+            A JobBatch holding the card columns of every matching job
+        """
+        return JobBatch.from_jobs(self.iter_jobs(filters, page_size))
+    
+    # Search operations
+    def search_jobs(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        fields: str = JOB_CARD_FIELDS
+    ) -> List[Job]:
+        """
+        Full-text search over job title, company and description.
+        
+        Args:
+            text: Search text; the last word also matches as a prefix
+            filters: Optional dictionary of additional filters
+            limit: Maximum number of jobs to return
+            fields: Columns to fetch, card columns by default
+            
+        Returns:
+            List of jobs, best match first
+        """
+        job_ids = self._search_job_ids(text)
+        if job_ids is None:
+            # Index not built yet; fall back to the database scan
+            return self.get_jobs({**(filters or {}), "search": text}, limit, fields)
+        if not job_ids:
+            return []
+        
+        rank = {job_id: i for i, job_id in enumerate(job_ids)}
+        if not self.is_connected():
+            jobs = [job for job in MOCK_JOB_RECORDS if job.id in rank]
+            jobs.sort(key=lambda job: rank[job.id])
+            return jobs[:limit]
+            
+        try:
+            key = ("search", text.strip().casefold(), normalize_filters(filters), limit, fields)
+            
+            def load():
+                query = self.client.table("jobs").select(with_columns(fields, ("id",)))
+                query = apply_job_filters(query, {**(filters or {}), "search": text}, job_ids)
+                jobs = [Job.from_row(row) for row in query.execute().data or []]
+                jobs.sort(key=lambda job: rank.get(job.id, len(rank)))
+                return jobs[:limit]
+            
+            return self.query_cache.get_or_load("jobs", key, load)
+        except Exception as e:
+            logging.error(f"Error searching jobs: {str(e)}")
             return []
     
+    def refresh_search_index(self, wait: bool = False) -> None:
+        """
+        Bring the search index up to date with the jobs table.
+        
+        The first call builds the index from a full snapshot; later calls only
+        re-index jobs whose (updated_at, id) moved past the last sync. Every
+        SEARCH_REBUILD_SECONDS the index is rebuilt from a snapshot instead,
+        which drops deleted jobs.
+        
+        Args:
+            wait: Run in the calling thread instead of in the background
+        """
+        with self._search_lock:
+            if self._search_state["building"]:
+                return
+            self._search_state["building"] = True
+        
+        if wait:
+            self._sync_search_index()
+        else:
+            threading.Thread(target=self._sync_search_index, name="job-search-index", daemon=True).start()
+    
+    def _search_job_ids(self, text: Optional[str]) -> Optional[List[str]]:
+        """Resolve search text to ranked job ids, or None if the index can't answer yet."""
+        # Checked with or without text: region and salary filters read the facet index of the same sync
+        state = self._search_state
+        if self.is_connected() and time.monotonic() - state["refreshed_at"] > self.search_refresh_interval:
+            self.refresh_search_index()
+        if not text or not text.strip() or not state["ready"]:
+            return None
+        return [job_id for job_id, _ in self.search_index.search(text, SEARCH_MAX_IDS)]
+    
+    def _filter_job_ids(self, filters: Optional[Dict[str, Any]]) -> Tuple[Optional[List[str]], Tuple[str, ...]]:
+        """
+        Resolve search text, region and salary filters to job ids through the in-memory indexes.
+        
+        Returns:
+            The job ids (None if the indexes can't narrow the query down) and
+            the filters they already account for
+        """
+        filters = filters or {}
+        job_ids = self._search_job_ids(filters.get("search"))
+        if not self._search_state["ready"]:
+            return job_ids, ()
+        
+        region = location_region(filters.get("location"))
+        salary = filters.get("salary") if filters.get("salary") in SALARY_RANGES else None
+        facet_ids = self.facet_index.match(region, salary)
+        if facet_ids is None:
+            return job_ids, ()
+        if job_ids is not None:
+            job_ids = [job_id for job_id in job_ids if job_id in facet_ids]
+        elif len(facet_ids) <= SEARCH_MAX_IDS:
+            job_ids = list(facet_ids)
+        else:
+            # Too many ids for one request; let the database apply the filters
+            return None, ()
+        resolved = (("location",) if region else ()) + (("salary",) if salary else ())
+        return job_ids, resolved
+    
+    def _sync_search_index(self) -> None:
+        """Build, rebuild or incrementally refresh the search index from Supabase."""
+        state = self._search_state
+        try:
+            if not state["ready"] or time.monotonic() - state["rebuilt_at"] > self.search_rebuild_interval:
+                # Build a fresh index off to the side and swap it in
+                started = time.monotonic()
+                index = JobSearchIndex()
+                facets = JobFacetIndex()
+                watermark = None
+                for job in self._iter_pages("jobs", None, 1000, JOB_SEARCH_FIELDS, raw=True):
+                    index.add(job)
+                    facets.add(job)
+                    key = [job.get("updated_at"), job["id"]]
+                    if key[0] and (watermark is None or key > watermark):
+                        watermark = key
+                self.search_index = index
+                self.facet_index = facets
+                # A rebuild keeps the old watermark, so the pass below catches jobs written while it ran
+                if not state["ready"]:
+                    state["watermark"] = watermark
+                state["rebuilt_at"] = started
+                state["ready"] = True
+            
+            while True:
+                query = self.client.table("jobs").select(JOB_SEARCH_FIELDS)
+                query = apply_keyset(query, JOB_SYNC_KEY, state["watermark"], descending=False)
+                rows = query.limit(1000).execute().data or []
+                for job in rows:
+                    self.search_index.add(job)
+                    self.facet_index.add(job)
+                # Jobs without updated_at sort last; the watermark stays on the last stamped one
+                stamped = [job for job in rows if job.get("updated_at")]
+                if stamped:
+                    state["watermark"] = [stamped[-1]["updated_at"], stamped[-1]["id"]]
+                if len(rows) < 1000 or len(stamped) < len(rows):
+                    break
+        except Exception as e:
+            logging.error(f"Error syncing job search index: {str(e)}")
+        finally:
+            state["refreshed_at"] = time.monotonic()
+            state["building"] = False
+    
+    # Recommendation operations
+    def recommend_jobs(self, profile: Profile, limit: int = 10) -> List[Job]:
+        """
+        Recommend jobs matching a candidate's skills and preferences.
+        
+        Args:
+            profile: The candidate's profile with skills and job preferences
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            List of jobs, best match first; empty until the recommender is built
+        """
+        if not self._recommender_ready():
+            return []
+        
+        job_ids = [job_id for job_id, _ in self.recommender.recommend(profile, limit)]
+        jobs = self.get_jobs_by_ids(job_ids)
+        return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+    
+    def recommend_jobs_batch(self, profiles: List[Profile], limit: int = 10) -> Dict[str, List[str]]:
+        """
+        Recommend jobs for many candidates at once, e.g. for email digests.
+        
+        Args:
+            profiles: The candidates' profiles
+            limit: Maximum number of jobs per candidate
+            
+        Returns:
+            Recommended job IDs by user ID, best match first
+        """
+        if not self._recommender_ready():
+            return {profile.user_id: [] for profile in profiles}
+        
+        results = self.recommender.recommend_batch(profiles, limit)
+        return {
+            profile.user_id: [job_id for job_id, _ in matches]
+            for profile, matches in zip(profiles, results)
+        }
+    
+    def refresh_recommender(self, wait: bool = False) -> None:
+        """
+        Refit the recommender from a snapshot of the jobs table.
+        
+        Args:
+            wait: Run in the calling thread instead of in the background
+        """
+        with self._search_lock:
+            if self._recommender_state["building"]:
+                return
+            self._recommender_state["building"] = True
+        
+        if wait:
+            self._fit_recommender()
+        else:
+            threading.Thread(target=self._fit_recommender, name="job-recommender", daemon=True).start()
+    
+    def _recommender_ready(self) -> bool:
+        """Start a refit when the recommender is stale and report whether it can answer."""
+        state = self._recommender_state
+        if self.is_connected() and time.monotonic() - state["refreshed_at"] > self.recommender_refresh_interval:
+            self.refresh_recommender()
+        return state["ready"]
+    
+    def _fit_recommender(self) -> None:
+        """Fit a fresh recommender off to the side and swap it in."""
+        state = self._recommender_state
+        try:
+            recommender = JobRecommender(self.recommender.n_features)
+            recommender.fit(self._iter_pages("jobs", None, 1000, JOB_MATCH_FIELDS, raw=True))
+            self.recommender = recommender
+            state["ready"] = True
+        except Exception as e:
+            logging.error(f"Error fitting job recommender: {str(e)}")
+        finally:
+            state["refreshed_at"] = time.monotonic()
+            state["building"] = False
+    
     # Application operations
-    def get_applications_by_user(self, user_id: str) -> List[Dict[str, Any]]:
+    def get_applications_by_user(self, user_id: str, fields: str = APPLICATION_ROW_FIELDS) -> List[Application]:
         """
         Get applications made by a user.
         
         Args:
             user_id: The user's ID
+            fields: Application columns to fetch; jobs are resolved separately
             
         Returns:
             List of applications
         """
         if not self.is_connected():
             # Return mock data
-            return [
-                {
-                    "job_title": "Senior Full Stack Developer",
-                    "company": "TechNova Inc.",
-                    "applied_date": "2023-02-15",
-                    "status": "Interview Scheduled",
-                    "next_step": "Technical Interview on March 5, 2023"
-                },
-                {
-                    "job_title": "UX/UI Designer",
-                    "company": "CreativeMinds",
-                    "applied_date": "2023-02-10",
-                    "status": "Application Review",
-                    "next_step": "Waiting for feedback"
-                },
-                {
-                    "job_title": "Product Manager",
-                    "company": "InnovateCorp",
-                    "applied_date": "2023-02-01",
-                    "status": "Rejected",
-                    "next_step": "Try other opportunities"
-                }
-            ]
+            return list(MOCK_APPLICATION_RECORDS)
             
         try:
-            response = self.client.table("applications").select("*, jobs(*)").eq("user_id", user_id).execute()
-            return response.data if response.data else []
+            response = self.client.table("applications").select(fields).eq("user_id", user_id).execute()
+            rows = response.data or []
+            
+            # Resolve jobs in one batch from the shared cache instead of embedding a copy per row
+            jobs = self.get_jobs_by_ids([row["job_id"] for row in rows if row.get("job_id") is not None])
+            return [Application.from_row(row, job=jobs.get(str(row.get("job_id")))) for row in rows]
         except Exception as e:
             logging.error(f"Error fetching applications: {str(e)}")
             return []
     
+    def create_application(self, application_data: Dict[str, Any]) -> bool:
+        """
+        Submit a job application.
+        
+        Args:
+            application_data: The application data to insert
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_connected():
+            # Simulate success for demo
+            return True
+            
+        try:
+            self.client.table("applications").insert(application_data).execute()
+            self.invalidate_cache("applications")
+            self.portal_stats.apply_delta(
+                applications=1,
+                successful_applications=int(application_data.get("status") in SUCCESS_STATUSES)
+            )
+            return True
+        except Exception as e:
+            logging.error(f"Error creating application: {str(e)}")
+            return False
+    
     # Company operations
-    def get_companies(self, filters: Optional[Dict[str, Any]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_companies(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        fields: str = COMPANY_CARD_FIELDS
+    ) -> List[Company]:
         """
         Get companies with optional filtering.
         
         Args:
             filters: Optional dictionary of filters
             limit: Maximum number of companies to return
+            fields: Columns to fetch, card columns by default
             
         Returns:
-            List of companies
+            List of companies, ordered by name
         """
+        companies, _ = self.get_companies_page(filters, page_size=limit, fields=fields)
+        return companies
+    
+    def get_company_logos(self, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the logo keys of companies by name, for the logos on job cards.
+        
+        Args:
+            names: Company names, e.g. the companies of the jobs on a page
+        
+        Returns:
+            Logo key by company name; companies without a logo are left out
+        """
+        names = tuple(sorted({name for name in names if name}))
+        if not names:
+            return {}
         if not self.is_connected():
-            # Return mock data
-            return [
-                {
-                    "name": "TechNova Inc.",
-                    "industry": "Technology",
-                    "location": "San Francisco, USA",
-                    "size": "Medium (201-1000)",
-                    "rating": "4.8/5",
-                    "description": "A leading software development company specializing in enterprise solutions.",
-                    "open_jobs": 15
-                },
-                {
-                    "name": "DataFlow Analytics",
-                    "industry": "Technology",
-                    "location": "New York, USA",
-                    "size": "Small (51-200)",
-                    "rating": "4.6/5",
-                    "description": "Data science and analytics company helping businesses leverage their data.",
-                    "open_jobs": 8
-                },
-                {
-                    "name": "CloudSphere",
-                    "industry": "Technology",
-                    "location": "Seattle, USA",
-                    "size": "Large (1000+)",
-                    "rating": "4.5/5",
-                    "description": "Cloud infrastructure and services provider with global presence.",
-                    "open_jobs": 23
-                }
-            ]
-            
+            # Use mock data
+            return {company.name: company.logo_key for company in MOCK_COMPANY_RECORDS if company.name in names and company.logo_key}
+        
+        def load():
+            response = self.client.table("companies").select("name,logo_key").in_("name", list(names)).execute()
+            return {row["name"]: row["logo_key"] for row in response.data or [] if row.get("logo_key")}
+        
         try:
-            query = self.client.table("companies").select("*").limit(limit)
+            return self.query_cache.get_or_load("companies", ("logos", names), load)
+        except Exception as e:
+            logging.error(f"Error fetching company logos: {str(e)}")
+            return {}
+    
+    def get_companies_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        fields: str = COMPANY_CARD_FIELDS
+    ) -> Tuple[List[Company], Optional[str]]:
+        """
+        Get one page of companies using keyset pagination on (name, id).
+        
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of companies per page
+            cursor: Cursor returned with the previous page, or None for the first page
+            fields: Columns to fetch, card columns by default
             
-            if filters:
-                # Apply filters
-                if "search" in filters and filters["search"]:
-                    query = query.ilike("name", f"%{filters['search']}%")
-                
-                if "industry" in filters and filters["industry"] and filters["industry"] != "All Industries":
-                    query = query.eq("industry", filters["industry"])
-                
-                if "size" in filters and filters["size"] and filters["size"] != "Any Size":
-                    query = query.eq("company_size", filters["size"])
+        Returns:
+            The companies on the page and the cursor of the next page (None on the last page)
+        """
+        if not self.is_connected():
+            # Paginate mock data
+            return paginate_rows(MOCK_COMPANY_RECORDS, COMPANY_SORT_KEY, cursor, page_size, descending=False)
             
-            response = query.execute()
-            return response.data if response.data else []
+        try:
+            key = (normalize_filters(filters), page_size, cursor, fields)
+            return self.query_cache.get_or_load(
+                "companies", key, lambda: self._query_page("companies", filters, page_size, cursor, fields)
+            )
         except Exception as e:
             logging.error(f"Error fetching companies: {str(e)}")
-            return []
+            return [], None
+    
+    def iter_companies(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        fields: str = COMPANY_CARD_FIELDS
+    ) -> Iterator[Company]:
+        """
+        Stream all matching companies, fetching one page at a time.
+        
+        Args:
+            filters: Optional dictionary of filters
+            page_size: Number of companies fetched per round trip
+            fields: Columns to fetch, card columns by default
+            
+        Yields:
+            Companies, ordered by name
+        """
+        yield from self._iter_pages("companies", filters, page_size, fields)
+    
+    # Pagination helpers
+    def _query_page(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]],
+        page_size: int,
+        cursor: Optional[str],
+        fields: str,
+        raw: bool = False
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Run one keyset page query against Supabase, raising on errors."""
+        query = self._page_query(self.client, table, filters, page_size, cursor, fields)
+        if query is None:
+            return [], None
+        response = query.execute()
+        return self._page_result(table, response.data if response.data else [], page_size, fields, raw)
+    
+    def _page_query(
+        self,
+        client: Any,
+        table: str,
+        filters: Optional[Dict[str, Any]],
+        page_size: int,
+        cursor: Optional[str],
+        fields: str
+    ):
+        """Build one keyset page query on a sync or async client, or None if no row can match."""
+        sort_key, descending, _ = _PAGED_TABLES[table]
+        after = decode_cursor(cursor, sort_key) if cursor else None
+        
+        # The sort key must be projected to build the next cursor
+        query = client.table(table).select(with_columns(fields, sort_key))
+        if table == "jobs":
+            job_ids, resolved = self._filter_job_ids(filters)
+            if job_ids == []:
+                return None
+            query = apply_job_filters(query, filters, job_ids, resolved)
+        elif table == "profiles":
+            query = apply_profile_filters(query, filters)
+        else:
+            query = apply_company_filters(query, filters)
+        query = apply_keyset(query, sort_key, after, descending)
+        
+        # Fetch one extra row to learn whether another page exists
+        return query.limit(page_size + 1)
+    
+    def _page_result(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        page_size: int,
+        fields: str,
+        raw: bool = False
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Turn the rows of a page query into records and the cursor of the next page."""
+        sort_key, _, record_type = _PAGED_TABLES[table]
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = cursor_for(rows[-1], sort_key)
+        if not raw:
+            rows = [record_type.from_row(row) for row in rows]
+            if table == "jobs" and fields == JOB_CARD_FIELDS:
+                # Listing pages warm the shared cache used to resolve application jobs
+                self.job_cache.put_many({job.id: job for job in rows})
+        return rows, next_cursor
+    
+    def _iter_pages(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]],
+        page_size: int,
+        fields: str,
+        raw: bool = False
+    ) -> Iterator[Any]:
+        """Yield records (or raw rows) page by page; pages bypass the query cache to keep memory bounded."""
+        cursor = None
+        while True:
+            if not self.is_connected():
+                if table == "jobs":
+                    rows, cursor = self.get_jobs_page(filters, page_size, cursor, fields)
+                elif table == "profiles":
+                    rows, cursor = paginate_rows(MOCK_CANDIDATE_RECORDS, PROFILE_SORT_KEY, cursor, page_size, descending=False)
+                else:
+                    rows, cursor = self.get_companies_page(filters, page_size, cursor, fields)
+            else:
+                try:
+                    rows, cursor = self._query_page(table, filters, page_size, cursor, fields, raw)
+                except Exception as e:
+                    logging.error(f"Error streaming {table}: {str(e)}")
+                    return
+            
+            yield from rows
+            if cursor is None:
+                return
@@ -0,0 +1,392 @@
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from job_import import is_retryable
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOURNAL_PATH = os.path.join(_BASE_DIR, ".cache", "write_journal.jsonl")
+
+# The journal is rewritten with only the pending writes once it grows past this
+JOURNAL_COMPACT_BYTES = 1 << 20
+
+
+class WriteTicket:
+    """Handle on a queued write that resolves once the write is durable in the database."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.error: Optional[str] = None
+
+    @classmethod
+    def completed(cls, error: Optional[str] = None) -> "WriteTicket":
+        """Create a ticket that is already resolved, e.g. for writes simulated in demo mode."""
+        ticket = cls()
+        ticket._resolve(error)
+        return ticket
+
+    def done(self) -> bool:
+        """Tell whether the write was flushed or gave up."""
+        return self._event.is_set()
+
+    @property
+    def succeeded(self) -> bool:
+        """True once the write is stored in the database."""
+        return self._event.is_set() and self.error is None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the write is resolved.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the write is stored in the database
+        """
+        self._event.wait(timeout)
+        return self.succeeded
+
+    def _resolve(self, error: Optional[str] = None) -> None:
+        self.error = error
+        self._event.set()
+
+
+class _PendingWrite:
+    """Merged changes to one record, with the journal entries and tickets they cover."""
+
+    __slots__ = ("table", "key_column", "key", "values", "seqs", "tickets", "attempts")
+
+    def __init__(self, table: str, key_column: str, key: Any):
+        self.table = table
+        self.key_column = key_column
+        self.key = key
+        self.values: Dict[str, Any] = {}
+        self.seqs: List[int] = []
+        self.tickets: List[WriteTicket] = []
+        self.attempts = 0
+
+    def row(self) -> Dict[str, Any]:
+        return {**self.values, self.key_column: self.key}
+
+
+class WriteBehindQueue:
+    """
+    Write-behind queue for record updates such as profile and preference saves.
+
+    enqueue() appends the change to a local journal and returns right away;
+    a background worker merges repeated saves of the same record, groups
+    them into batched upserts per table and resolves each caller's
+    WriteTicket once the batch is stored. Entries are acknowledged in the
+    journal after they are flushed, so writes still queued when the process
+    stops are replayed by the next one.
+
+    The journal is per process; give each replica its own path.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[str, str, List[Dict[str, Any]]], None],
+        journal_path: Optional[str] = DEFAULT_JOURNAL_PATH,
+        on_flushed: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+        flush_interval: float = 0.5,
+        max_batch: int = 100,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        fsync: bool = True
+    ):
+        """
+        Initialize the queue, replay the journal and start the worker.
+
+        Args:
+            flush: Upserts rows of one table on a key column, raising on errors
+            journal_path: Path of the append-only journal, or None to keep writes in memory only
+            on_flushed: Called with the table and rows after every successful batch
+            flush_interval: Seconds a write waits for more saves of the same record
+            max_batch: Records per flush
+            max_retries: Retries before a write is dropped and its tickets fail
+            base_delay: Backoff ceiling in seconds for the first retry
+            fsync: Sync the journal to disk before enqueue() returns
+        """
+        self.flush = flush
+        self.journal_path = journal_path
+        self.on_flushed = on_flushed
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.fsync = fsync
+
+        self._pending: "OrderedDict[Tuple[str, str], _PendingWrite]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], _PendingWrite] = {}
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._closed = False
+        self._draining = 0
+        self._journal = None
+        self._stats = {"enqueued": 0, "coalesced": 0, "flushed": 0, "batches": 0, "retries": 0, "failed": 0, "replayed": 0}
+
+        if journal_path:
+            self._replay()
+        self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._worker.start()
+
+    def enqueue(self, table: str, key_column: str, key: Any, values: Dict[str, Any]) -> WriteTicket:
+        """
+        Queue changes to one record.
+
+        Args:
+            table: The table to write
+            key_column: The record's unique key column, used as the upsert conflict target
+            key: The record's key
+            values: Column values to set; later saves of the same record override earlier ones
+
+        Returns:
+            A ticket that resolves once the change is stored
+        """
+        with self._cond:
+            if self._closed:
+                return WriteTicket.completed("Write queue is closed")
+            ticket = WriteTicket()
+            self._seq += 1
+            self._append({"op": "put", "seq": self._seq, "table": table, "key_column": key_column, "key": key, "values": values})
+            self._merge(table, key_column, key, values, [self._seq], [ticket])
+            self._stats["enqueued"] += 1
+            self._cond.notify()
+        return ticket
+
+    def pending_values(self, table: str, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get changes to a record that aren't stored yet, so reads can overlay them.
+
+        Args:
+            table: The table
+            key: The record's key
+
+        Returns:
+            The merged column values, or None if nothing is queued
+        """
+        record = (table, str(key))
+        with self._cond:
+            values = {}
+            for writes in (self._in_flight, self._pending):
+                if record in writes:
+                    values.update(writes[record].values)
+            return values or None
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued write was flushed or gave up.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the queue is empty
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            # Skip the coalescing window while someone is waiting
+            self._draining += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._draining -= 1
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush what can be flushed within the timeout and stop the worker; the rest stays journaled."""
+        self.drain(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue counters and the number of records waiting to be written."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending) + len(self._in_flight)
+            return stats
+
+    def _merge(
+        self, table: str, key_column: str, key: Any, values: Dict[str, Any],
+        seqs: List[int], tickets: List[WriteTicket], attempts: int = 0
+    ) -> None:
+        record = (table, str(key))
+        write = self._pending.get(record)
+        if write is None:
+            write = self._pending[record] = _PendingWrite(table, key_column, key)
+        else:
+            self._stats["coalesced"] += 1
+        write.values.update(values)
+        write.seqs.extend(seqs)
+        write.tickets.extend(tickets)
+        write.attempts = max(write.attempts, attempts)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Give repeated saves of the same record a moment to coalesce
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.max_batch and not self._closed and not self._draining:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = []
+                while self._pending and len(batch) < self.max_batch:
+                    record, write = self._pending.popitem(last=False)
+                    self._in_flight[record] = write
+                    batch.append(write)
+
+            failed = self._flush_batch(batch)
+
+            with self._cond:
+                for write in failed:
+                    self._in_flight.pop((write.table, str(write.key)), None)
+                    # Newer saves queued meanwhile go on top of the failed ones
+                    newer = self._pending.pop((write.table, str(write.key)), None)
+                    self._merge(write.table, write.key_column, write.key, write.values, write.seqs, write.tickets, write.attempts)
+                    if newer is not None:
+                        self._merge(newer.table, newer.key_column, newer.key, newer.values, newer.seqs, newer.tickets)
+                        self._stats["coalesced"] -= 1
+                self._cond.notify_all()
+            if failed:
+                attempt = max(write.attempts for write in failed)
+                time.sleep(random.uniform(0, min(30.0, self.base_delay * 2 ** attempt)))
+
+    def _flush_batch(self, batch: List[_PendingWrite]) -> List[_PendingWrite]:
+        """Write a batch grouped by table and column set; return the writes to retry."""
+        groups: Dict[Tuple[str, str, Tuple[str, ...]], List[_PendingWrite]] = {}
+        for write in batch:
+            # PostgREST needs every row of a bulk upsert to have the same keys
+            groups.setdefault((write.table, write.key_column, tuple(sorted(write.values))), []).append(write)
+
+        retry: List[_PendingWrite] = []
+        for (table, key_column, _), writes in groups.items():
+            rows = [write.row() for write in writes]
+            try:
+                self.flush(table, key_column, rows)
+            except Exception as e:
+                give_up = not is_retryable(e)
+                for write in writes:
+                    write.attempts += 1
+                    if give_up or write.attempts > self.max_retries:
+                        logging.error(f"Error writing {table} record {write.key}: {str(e)}")
+                        self._finish(write, str(e))
+                    else:
+                        retry.append(write)
+                        with self._cond:
+                            self._stats["retries"] += 1
+                continue
+
+            with self._cond:
+                self._stats["batches"] += 1
+            for write in writes:
+                self._finish(write)
+            if self.on_flushed is not None:
+                try:
+                    self.on_flushed(table, rows)
+                except Exception as e:
+                    logging.error(f"Error handling flushed {table} writes: {str(e)}")
+        return retry
+
+    def _finish(self, write: _PendingWrite, error: Optional[str] = None) -> None:
+        with self._cond:
+            self._in_flight.pop((write.table, str(write.key)), None)
+            self._append({"op": "ack", "seqs": write.seqs})
+            self._stats["flushed" if error is None else "failed"] += 1
+            # Once nothing is outstanding the journal can start over empty
+            self._compact(force=not self._pending and not self._in_flight)
+        for ticket in write.tickets:
+            ticket._resolve(error)
+
+    # Journal
+    def _open_journal(self) -> None:
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Append a journal entry; called with the lock held."""
+        if not self.journal_path:
+            return
+        try:
+            if self._journal is None:
+                self._open_journal()
+            self._journal.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+            self._journal.flush()
+            if self.fsync and entry["op"] == "put":
+                os.fsync(self._journal.fileno())
+        except OSError as e:
+            logging.error(f"Error writing write-behind journal: {str(e)}")
+
+    def _compact(self, force: bool = False) -> None:
+        """Rewrite the journal with only the unacknowledged writes; called with the lock held."""
+        if self._journal is None or (not force and self._journal.tell() < JOURNAL_COMPACT_BYTES):
+            return
+        try:
+            directory = os.path.dirname(self.journal_path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for write in list(self._in_flight.values()) + list(self._pending.values()):
+                    f.write(json.dumps({
+                        "op": "put", "seq": max(write.seqs), "table": write.table,
+                        "key_column": write.key_column, "key": write.key, "values": write.values
+                    }, separators=(",", ":"), default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal.close()
+            os.replace(tmp_path, self.journal_path)
+            self._open_journal()
+        except OSError as e:
+            logging.error(f"Error compacting write-behind journal: {str(e)}")
+
+    def _replay(self) -> None:
+        """Queue the writes a previous process journaled but never flushed."""
+        puts: Dict[int, Dict[str, Any]] = {}
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-append
+                        continue
+                    if entry.get("op") == "put":
+                        puts[entry["seq"]] = entry
+                    elif entry.get("op") == "ack":
+                        for seq in entry.get("seqs", ()):
+                            puts.pop(seq, None)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error reading write-behind journal: {str(e)}")
+
+        with self._cond:
+            for seq in sorted(puts):
+                entry = puts[seq]
+                self._merge(entry["table"], entry["key_column"], entry["key"], entry["values"], [seq], [])
+            self._seq = max(puts, default=0)
+            self._stats["replayed"] = len(puts)
+            self._stats["coalesced"] = 0
+            if self.journal_path and os.path.exists(self.journal_path):
+                self._open_journal()
+                self._compact(force=True)